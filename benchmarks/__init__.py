@@ -0,0 +1,6 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Standalone performance benchmarks. Each module is runnable with ``python3 -m benchmarks.<module>``.
+"""
@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark ``InstructionCatalog`` construction and ``filter()`` against a linear scan of ``ALL_INSTRS``.
+
+Run with
+python3 -m benchmarks.catalog_index
+
+"""
+
+import argparse
+import timeit
+
+from coretp.isa import InstructionCatalog, RvArch
+from coretp.isa.catalog import expand_implied_extensions
+from coretp.isa.instruction import InstructionDef
+from coretp.isa.instructions import ALL_INSTRS
+from coretp.isa.operands import operand_is_register
+from coretp.rv_enums import Extension, Category, OperandType
+
+DEFAULT_ISA = "rv64gcv_zk_zba_zbb_zbc_zbs_zfh_zicond_zicbom_zicboz_zicbop_zvbb_zvbc_zvkg_zvkned_zvknha_zvksed_zvksh"
+
+# filter() calls representative of a random instruction fill loop
+FILTER_QUERIES = [
+    dict(category=Category.ARITHMETIC),
+    dict(category=Category.ARITHMETIC | Category.LOGIC, has_destination=True, source_reg_count=2),
+    dict(has_immediate=True, destination_type=OperandType.GPR),
+    dict(source_type=OperandType.FPR),
+    dict(extension=Extension.I | Extension.M, exclude_extensions=Extension.C),
+    dict(extension=Extension.V, category=Category.LOAD),
+]
+
+
+def linear_catalog(isa: str) -> list[InstructionDef]:
+    "Catalog construction as a linear scan of every instruction"
+    arch = RvArch.from_str(isa)
+    arch.extensions = expand_implied_extensions(arch.extensions)
+    return [i for i in ALL_INSTRS if i.xlen.compatible_with(arch.xlen) and (i.extension & ~arch.extensions) == Extension(0)]
+
+
+def linear_filter(instructions: list[InstructionDef], **kwargs) -> list[InstructionDef]:
+    "filter() as stacked predicates over every instruction in the catalog"
+    predicates = []
+    if "extension" in kwargs:
+        predicates.append(lambda i: i.extension in kwargs["extension"])
+    if "category" in kwargs:
+        predicates.append(lambda i: i.category & kwargs["category"] == i.category)
+    if "has_destination" in kwargs:
+        predicates.append(lambda i: (i.destination is not None) == kwargs["has_destination"])
+    if "source_reg_count" in kwargs:
+        predicates.append(lambda i: kwargs["source_reg_count"] <= len([s for s in i.source if operand_is_register(s)]))
+    if "has_immediate" in kwargs:
+        predicates.append(lambda i: kwargs["has_immediate"] == any(s.type == OperandType.IMM for s in i.source))
+    if "destination_type" in kwargs:
+        predicates.append(lambda i: i.destination is not None and i.destination.type == kwargs["destination_type"])
+    if "source_type" in kwargs:
+        predicates.append(lambda i: any(s.type == kwargs["source_type"] for s in i.source))
+    if "exclude_extensions" in kwargs:
+        predicates.append(lambda i: not (i.extension & kwargs["exclude_extensions"]))
+    return [i for i in instructions if all(p(i) for p in predicates)]
+
+
+def report(label: str, baseline: float, new: float, unit: str = "ms"):
+    print(f"{label:<56} linear {baseline * 1e3:9.3f} {unit}   indexed {new * 1e3:9.3f} {unit}   speedup {baseline / new:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--isa", default=DEFAULT_ISA, help="ISA string to build the catalog for")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed iterations")
+    args = parser.parse_args()
+
+    catalog = InstructionCatalog(args.isa)  # builds the process-wide index once
+    linear = linear_catalog(args.isa)
+    if [i.name for i in catalog] != [i.name for i in linear]:
+        raise RuntimeError("Indexed catalog differs from linear scan")
+    print(f"{args.isa}: {len(catalog)} of {len(ALL_INSTRS)} instructions")
+
+    build_linear = timeit.timeit(lambda: linear_catalog(args.isa), number=args.repeat) / args.repeat
+    build_indexed = timeit.timeit(lambda: InstructionCatalog(args.isa), number=args.repeat) / args.repeat
+    report("catalog construction", build_linear, build_indexed)
+
+    for query in FILTER_QUERIES:
+        if [i.name for i in linear_filter(linear, **query)] != [i.name for i in catalog.filter(**query)]:
+            raise RuntimeError(f"Indexed filter differs from linear scan for {query}")
+        filter_linear = timeit.timeit(lambda: [i.build() for i in linear_filter(linear, **query)], number=args.repeat) / args.repeat
+        filter_indexed = timeit.timeit(lambda: catalog.filter(**query), number=args.repeat) / args.repeat
+        report(f"filter({', '.join(query)})", filter_linear, filter_indexed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark ``eliminate_common_subexpressions`` on synthetic scenarios.
+
+Scenarios are the chained arithmetic steps of ``benchmarks.step_ir_build``, with every chain step duplicated so half of them are removed.
+Before timing, checks that duplicated pure steps are merged and that PC relative and implicit ``sp`` steps (``auipc``, ``c.addi4spn``) aren't.
+
+Run with
+python3 -m benchmarks.cse --steps 100000
+
+"""
+
+import argparse
+import statistics
+import time
+
+from coretp.passes import eliminate_common_subexpressions
+from coretp.step import TestStep, Arithmetic
+from coretp.step_ir import StepIRTable
+from benchmarks.step_ir_build import chain
+
+
+def duplicated(count: int) -> list[TestStep]:
+    "``count`` chained steps followed by a copy of each arithmetic step, reading the same inputs"
+    steps = chain(count)
+    return steps + [Arithmetic(op=step.op, src1=step.src1, src2=step.src2) for step in steps if type(step) is Arithmetic]
+
+
+def check_merges():
+    "Duplicates of pure ops are merged, ops reading the PC or sp aren't"
+    for step, merged in ((Arithmetic(op="addi", src1=0x10, src2=4), True), (Arithmetic(op="auipc", src1=0x10), False), (Arithmetic(op="c.addi4spn", src1=0x10), False)):
+        steps = [step, Arithmetic(op=step.op, src1=step.src1, src2=step.src2)]
+        removed = eliminate_common_subexpressions(StepIRTable.from_steps(steps)).removed
+        if removed != int(merged):
+            raise RuntimeError(f"Expected {int(merged)} duplicate '{step.op}' steps removed, got {removed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=100000, help="Number of chained steps, before duplication")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of passes, the median is reported")
+    args = parser.parse_args()
+
+    check_merges()
+    table = StepIRTable.from_steps(duplicated(args.steps))
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = eliminate_common_subexpressions(table)
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    print(f"{len(table):>8} steps  {median * 1e3:8.1f} ms  {median / len(table) * 1e9:6.0f} ns/step  {result.removed} removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Microbenchmark ``Extension`` set algebra on ``Flag`` objects against integer bit masks.
+
+Compares implied extension expansion (fixed-point iteration vs the precomputed closure table), the per-instruction extension subset test, ``RvArch.__str__``, and full catalog construction.
+
+Run with
+python3 -m benchmarks.extension_mask
+
+"""
+
+import argparse
+import timeit
+
+from coretp.isa import InstructionCatalog, RvArch
+from coretp.isa.catalog import IMPLIED_EXTENSIONS, expand_implied_mask
+from coretp.isa.instructions import ALL_INSTRS
+from coretp.rv_enums import Extension
+
+from .catalog_index import DEFAULT_ISA
+
+
+def flag_expand(mask: Extension) -> Extension:
+    "Implied extension expansion on Flag objects, iterating the rules to a fixed point"
+    changed = True
+    while changed:
+        changed = False
+        for k, v in IMPLIED_EXTENSIONS.items():
+            if mask & k and (mask & v) != v:
+                mask |= v
+                changed = True
+    return mask
+
+
+def flag_str(arch: RvArch) -> str:
+    "RvArch.__str__ iterating every Extension member"
+    ext = [e.name.lower() for e in Extension if arch.extensions & e and e.name is not None]
+    single = "".join(e for e in ext if len(e) == 1)
+    multi = [e for e in ext if len(e) > 1]
+    return f"{arch.base_arch.value}{single}" + ("_" + "_".join(multi) if multi else "")
+
+
+def flag_catalog(isa: str) -> list:
+    "Catalog construction with Flag expansion and a Flag subset test per instruction"
+    arch = RvArch.from_str(isa)
+    extensions = flag_expand(arch.extensions)
+    return [i for i in ALL_INSTRS if i.xlen.compatible_with(arch.xlen) and (i.extension & ~extensions) == Extension(0)]
+
+
+def report(label: str, flag_time: float, mask_time: float):
+    print(f"{label:<32} Flag {flag_time * 1e6:10.2f} us   int mask {mask_time * 1e6:10.2f} us   speedup {flag_time / mask_time:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--isa", default=DEFAULT_ISA, help="ISA string to build the catalog for")
+    parser.add_argument("--repeat", type=int, default=50, help="Number of timed iterations")
+    args = parser.parse_args()
+
+    arch = RvArch.from_str(args.isa)
+    extensions = flag_expand(arch.extensions)
+    if extensions.value != expand_implied_mask(arch.extensions.value):
+        raise RuntimeError("Integer mask expansion differs from Flag expansion")
+    for isa in (args.isa, "rv64gc", "rv32e"):
+        if RvArch.from_str(str(RvArch.from_str(isa))) != RvArch.from_str(isa):
+            raise RuntimeError(f"RvArch.__str__ doesn't round-trip {isa}, got {RvArch.from_str(isa)}")
+
+    def timed(func) -> float:
+        return timeit.timeit(func, number=args.repeat) / args.repeat
+
+    report("expand implied extensions", timed(lambda: flag_expand(arch.extensions)), timed(lambda: expand_implied_mask(arch.extensions.value)))
+
+    inverse = ~extensions
+    inverse_mask = ~extensions.value
+    report(
+        "extension subset test (all)",
+        timed(lambda: [(i.extension & inverse) == Extension(0) for i in ALL_INSTRS]),
+        timed(lambda: [not (i.extension_mask & inverse_mask) for i in ALL_INSTRS]),
+    )
+
+    expanded_arch = RvArch(arch.base_arch, extensions)
+    report("RvArch.__str__", timed(lambda: flag_str(expanded_arch)), timed(lambda: str(expanded_arch)))
+
+    InstructionCatalog(args.isa)  # build the process-wide index outside the timed region
+    report("catalog construction", timed(lambda: flag_catalog(args.isa)), timed(lambda: InstructionCatalog(args.isa)))
+
+
+if __name__ == "__main__":
+    main()
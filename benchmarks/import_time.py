@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measure ``coretp`` startup latency with ``python -X importtime`` in a fresh interpreter.
+
+Reports the cumulative import time of each statement, the slowest modules it imported, and whether instruction definition modules were loaded.
+Exits non-zero if any statement exceeds ``--max-ms``, so it can guard startup latency in CI.
+
+Run with
+python3 -m benchmarks.import_time --max-ms 250
+
+"""
+
+import argparse
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import coretp",
+    "import coretp; coretp.InstructionCatalog('rv64imc')",
+    "import coretp; coretp.InstructionCatalog('rv64gcv_zk')",
+]
+
+
+def import_times(statement: str) -> tuple[dict[str, int], float, list[str]]:
+    """
+    Run ``statement`` with ``-X importtime``.
+
+    :return: cumulative import time per module in microseconds, wall time of the statement in milliseconds, and the instruction definition modules loaded.
+        Instruction modules are read from ``sys.modules`` since ``-X importtime`` doesn't report modules loaded through ``importlib.import_module``
+    """
+    code = (
+        f"import time, sys; t = time.perf_counter(); {statement}; print((time.perf_counter() - t) * 1e3); "
+        "print(' '.join(sorted(m.split('.', 3)[-1] for m in sys.modules if m.startswith('coretp.isa.instructions.'))))"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+    wall_ms, instruction_modules = result.stdout.splitlines()[-2:]
+    return times, float(wall_ms), instruction_modules.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a statement takes longer than this many milliseconds")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest coretp modules to list")
+    args = parser.parse_args()
+
+    failed = False
+    for statement in STATEMENTS:
+        times, wall_ms, instruction_modules = import_times(statement)
+        coretp_modules = {m: t for m, t in times.items() if m.startswith("coretp")}
+        print(f"{statement}: {wall_ms:.1f} ms")
+        print(f"    instruction modules loaded: {', '.join(instruction_modules) or 'none'}")
+        for module, cumulative in sorted(coretp_modules.items(), key=lambda x: -x[1])[: args.top]:
+            print(f"    {cumulative / 1e3:8.1f} ms  {module}")
+        if args.max_ms is not None and wall_ms > args.max_ms:
+            print(f"    exceeds --max-ms {args.max_ms}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
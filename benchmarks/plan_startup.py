@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measure test plan startup latency in a fresh interpreter.
+
+Times listing plans, retrieving single plans and building every plan, and reports which scenario modules each statement imported.
+Scenario modules are only imported for the plans that are built.
+
+Run with
+python3 -m benchmarks.plan_startup
+
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import coretp.plans; coretp.plans.list_plans()",
+    "import coretp.plans; coretp.plans.query_plans(tags=['memory'])",
+    "import coretp.plans; coretp.plans.get_plan('zifencei')",
+    "import coretp.plans; coretp.plans.get_plan('zkt')",
+    "import coretp.plans; [coretp.plans.get_plan(p) for p in coretp.plans.list_plans()]",
+]
+
+
+def run_statement(statement: str) -> tuple[float, list[str]]:
+    """
+    Run ``statement`` in a new interpreter.
+
+    :return: wall time of the statement in milliseconds, including imports, and the plan modules it imported below the plan packages
+    """
+    code = (
+        f"import time, sys; t = time.perf_counter(); {statement}; print((time.perf_counter() - t) * 1e3); "
+        "print(' '.join(sorted(m.split('.')[-1] for m in sys.modules if m.startswith('coretp.plans.') and m.count('.') == 3)))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    wall_ms, modules = result.stdout.splitlines()[-2:]
+    return float(wall_ms), modules.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters per statement, the median is reported")
+    args = parser.parse_args()
+
+    for statement in STATEMENTS:
+        runs = [run_statement(statement) for _ in range(args.repeat)]
+        wall_ms = statistics.median(r[0] for r in runs)
+        modules = runs[0][1]
+        print(f"{wall_ms:8.1f} ms  {statement}")
+        print(f"             scenario modules imported: {', '.join(modules) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark ``RegisterAllocator`` on synthetic scenarios.
+
+Scenarios are the chained arithmetic steps of ``benchmarks.step_ir_build``, split across code pages,
+or calling a code page every ``--call-every`` steps so values live across calls avoid the clobbered temporaries.
+
+Run with
+python3 -m benchmarks.regalloc --steps 100000
+
+"""
+
+import argparse
+import statistics
+import time
+
+from coretp.passes import RegisterAllocator
+from coretp.step import TestStep, Call, CodePage, LoadImmediateStep
+from coretp.step_ir import StepIRTable
+from benchmarks.step_ir_build import chain, code_pages
+
+
+def with_calls(count: int, call_every: int) -> list[TestStep]:
+    "``count`` chained steps with a call to a code page every ``call_every`` steps"
+    page = CodePage(code=[LoadImmediateStep(imm=0)])
+    steps: list[TestStep] = []
+    for i, step in enumerate(chain(count)):
+        steps.append(step)
+        if i % call_every == 0:
+            steps.append(Call(target=page))
+    steps.append(page)
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=100000, help="Number of steps per synthetic scenario")
+    parser.add_argument("--call-every", type=int, default=50, help="Steps between calls in the scenario with calls")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of allocations per scenario, the median is reported")
+    args = parser.parse_args()
+
+    scenarios = {
+        "code pages": code_pages(args.steps),
+        "with calls": with_calls(args.steps, args.call_every),
+    }
+    allocator = RegisterAllocator()
+    for name, steps in scenarios.items():
+        table = StepIRTable.from_steps(steps)
+        allocator.allocate(table)  # Loads instruction definitions
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            allocation = allocator.allocate(table)
+            times.append(time.perf_counter() - start)
+        median = statistics.median(times)
+        print(f"{name:<12} {len(table):>8} steps  {median * 1e3:8.1f} ms  {median / len(table) * 1e9:6.0f} ns/step  {allocation.summary()}")
+
+
+if __name__ == "__main__":
+    main()
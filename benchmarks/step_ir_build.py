@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark ``build_step_ir`` on synthetic scenarios.
+
+Scenarios are chains of dependent arithmetic steps like the zkt plans, either flat or split across code pages,
+plus a deeply nested ``AssertException`` scenario that a recursive builder can't handle.
+
+Run with
+python3 -m benchmarks.step_ir_build --steps 100000
+
+"""
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+
+from coretp.step import TestStep, Arithmetic, LoadImmediateStep, CodePage, AssertException
+from coretp.step_ir import build_step_ir
+
+
+def chain(count: int) -> list[TestStep]:
+    "Dependent arithmetic chain, each step reading the previous one and a load immediate every 8 steps"
+    steps: list[TestStep] = [LoadImmediateStep(imm=1)]
+    for i in range(1, count):
+        if i % 8 == 0:
+            steps.append(LoadImmediateStep(imm=i))
+        else:
+            steps.append(Arithmetic(op="add", src1=steps[-1], src2=steps[i - 1 - (i % 8)]))
+    return steps
+
+
+def code_pages(count: int, page_size: int = 1000) -> list[TestStep]:
+    "``count`` chained steps split across code pages of ``page_size`` steps"
+    steps = chain(count)
+    return [CodePage(code=steps[i : i + page_size]) for i in range(0, count, page_size)]
+
+
+def nested_asserts(depth: int) -> list[TestStep]:
+    "``depth`` nested ``AssertException`` steps around a single arithmetic step"
+    step: TestStep = Arithmetic(op="add", src1=1, src2=2)
+    for _ in range(depth):
+        step = AssertException(code=[step])
+    return [step]
+
+
+def count_steps(steps: list[TestStep]) -> int:
+    total = 0
+    stack = list(steps)
+    while stack:
+        step = stack.pop()
+        total += 1
+        stack.extend(getattr(step, "code", ()))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=100000, help="Number of steps per synthetic scenario")
+    parser.add_argument("--depth", type=int, default=2 * sys.getrecursionlimit(), help="Nesting depth of the nested assert scenario")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of builds per scenario, the median is reported")
+    parser.add_argument("--no-gc", action="store_true", help="Disable the cyclic garbage collector while building")
+    args = parser.parse_args()
+    if args.no_gc:
+        gc.disable()
+
+    scenarios = {
+        "flat chain": chain(args.steps),
+        "code pages": code_pages(args.steps),
+        "nested asserts": nested_asserts(args.depth),
+    }
+    for name, steps in scenarios.items():
+        total = count_steps(steps)
+        times = []
+        try:
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                build_step_ir(steps)
+                times.append(time.perf_counter() - start)
+        except RecursionError:
+            print(f"{name:<15} {total:>8} steps  RecursionError")
+            continue
+        median = statistics.median(times)
+        print(f"{name:<15} {total:>8} steps  {median * 1e3:8.1f} ms  {median / total * 1e9:6.0f} ns/step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare ``StepIR`` object graphs with ``StepIRTable`` storage on synthetic scenarios.
+
+Reports memory retained by the IR (the ``TestStep`` objects both reference are excluded), build time,
+and the time of a graph pass counting the users of every step.
+
+Run with
+python3 -m benchmarks.step_ir_table --steps 100000
+
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+
+from coretp.step_ir import INPUT_REF, StepIR, StepIRTable, build_step_ir
+from benchmarks.step_ir_build import code_pages
+
+
+def count_users_step_ir(steps: list[StepIR]) -> Counter:
+    users: Counter = Counter()
+    stack = list(steps)
+    while stack:
+        step_ir = stack.pop()
+        stack.extend(step_ir.code)
+        users.update(i for i in step_ir.inputs if isinstance(i, str))
+    return users
+
+
+def count_users_table(table: StepIRTable) -> Counter:
+    return Counter(value for kind, value in zip(table.input_kinds, table.input_values) if kind == INPUT_REF)
+
+
+def measure(build):
+    "Retained bytes and build time of ``build()``"
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=100000, help="Number of steps in the synthetic scenario")
+    args = parser.parse_args()
+
+    steps = code_pages(args.steps)
+    step_ir, step_ir_bytes, _ = measure(lambda: build_step_ir(steps))
+    table, table_bytes, _ = measure(lambda: StepIRTable.from_steps(steps))
+    rows = len(table)
+
+    # Build times without tracemalloc overhead
+    start = time.perf_counter()
+    build_step_ir(steps)
+    step_ir_build = time.perf_counter() - start
+    start = time.perf_counter()
+    StepIRTable.from_steps(steps)
+    table_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    step_ir_users = count_users_step_ir(step_ir)
+    step_ir_pass = time.perf_counter() - start
+    start = time.perf_counter()
+    table_users = count_users_table(table)
+    table_pass = time.perf_counter() - start
+    assert sum(step_ir_users.values()) == sum(table_users.values())
+
+    print(f"{rows} StepIR rows")
+    print(f"{'StepIR objects':<15} {step_ir_bytes / rows:6.0f} B/step  build {step_ir_build * 1e3:7.1f} ms  users pass {step_ir_pass * 1e3:6.1f} ms")
+    print(f"{'StepIRTable':<15} {table_bytes / rows:6.0f} B/step  build {table_build * 1e3:7.1f} ms  users pass {table_pass * 1e3:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark ``XlsFormatter`` on a synthetic registry, comparing the regular workbook with ``--write-only`` streaming.
+
+Each mode runs in a fresh interpreter so peak memory is measured independently. With ``--jobs`` write-only mode is also timed rendering
+plan sheets in worker processes, whose memory isn't included in the peak RSS.
+
+Run with
+python3 -m benchmarks.xls_export --scenarios 50000
+
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from coretp import TestPlan, TestScenario, TestEnvCfg, StepIR
+from coretp.export import XlsFormatter
+from coretp.rv_enums import PagingMode, PrivilegeMode
+
+
+def synthetic_plans(scenario_count: int, plan_count: int, steps_per_scenario: int = 8) -> list[TestPlan]:
+    """
+    Test plans with ``scenario_count`` scenarios spread over ``plan_count`` plans. Scenarios share their env and steps, only names differ
+    """
+    env = TestEnvCfg(paging_modes=[PagingMode.SV39, PagingMode.SV48], priv_modes=[PrivilegeMode.S, PrivilegeMode.U])
+    steps = [StepIR(id=f"v{i}", inputs=[]) for i in range(steps_per_scenario)]
+    per_plan = scenario_count // plan_count
+    return [
+        TestPlan(
+            name=f"plan_{p}",
+            description=f"Synthetic test plan {p}",
+            scenarios=[TestScenario(name=f"SID_SYNTH_{p}_{s:06d}", description=f"Synthetic scenario {s} of plan {p} " * 3, env=env, id=f"SID_{p}_{s}", steps=steps) for s in range(per_plan)],
+        )
+        for p in range(plan_count)
+    ]
+
+
+def run_export(scenario_count: int, plan_count: int, write_only: bool, single_sheet: bool, jobs: int, output: Path):
+    "Export the synthetic registry, printing wall time and peak RSS"
+    import resource
+    import time
+
+    formatter = XlsFormatter(output_directory=output, write_only=write_only, single_sheet=single_sheet, jobs=jobs)
+    for plan in synthetic_plans(scenario_count, plan_count):
+        formatter.add_test_plan(plan)
+    start = time.perf_counter()
+    formatter.build()
+    print(f"{time.perf_counter() - start} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=int, default=50000, help="Total number of synthetic scenarios")
+    parser.add_argument("--plans", type=int, default=10, help="Number of synthetic test plans")
+    parser.add_argument("--single-sheet", action="store_true", help="Put every scenario in one worksheet")
+    parser.add_argument("--jobs", type=int, default=1, help="Also time write-only mode rendering plan sheets in this many worker processes")
+    parser.add_argument("--mode", choices=["regular", "write-only"], default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--output", type=Path, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        run_export(args.scenarios, args.plans, args.mode == "write-only", args.single_sheet, args.jobs, args.output)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [("regular", 1), ("write-only", 1)] + ([("write-only", args.jobs)] if args.jobs > 1 else [])
+        for mode, jobs in runs:
+            label = mode if jobs == 1 else f"{mode} -j{jobs}"
+            output = Path(tmp) / f"{mode}-{jobs}"
+            output.mkdir()
+            cmd = [sys.executable, "-m", "benchmarks.xls_export", "--scenarios", str(args.scenarios), "--plans", str(args.plans), "--mode", mode, "--jobs", str(jobs), "--output", str(output)]
+            if args.single_sheet:
+                cmd.append("--single-sheet")
+            seconds, peak_mb = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout.split()
+            size_mb = sum(f.stat().st_size for f in output.iterdir()) / 1e6
+            print(f"{label:<14}  {float(seconds):7.2f} s   peak RSS {float(peak_mb):7.1f} MB   output {size_mb:5.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
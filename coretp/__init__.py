@@ -11,7 +11,7 @@ and process RISC-V architectural compliance test plans.
 
 from .env import TestEnv, TestEnvCfg, TestEnvSolver
 from .step import TestStep
-from .step_ir import StepIR
+from .step_ir import StepIR, StepIRTable
 from .models import TestPlan, TestScenario
 from .isa import InstructionCatalog, Instruction, Label
 
@@ -23,6 +23,7 @@ __all__ = [
     "TestEnvSolver",
     "TestStep",
     "StepIR",
+    "StepIRTable",
     "TestScenario",
     "InstructionCatalog",
     "Instruction",
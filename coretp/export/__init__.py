@@ -4,10 +4,15 @@
 from .base import ExportContext, Formatter
 from .pdf import PdfFormatter
 from .excel import XlsFormatter
+from .jsonl import JsonlFormatter
+from .columnar import ColumnarFormatter, read_columns
 
 __all__ = [
     "ExportContext",
     "Formatter",
     "PdfFormatter",
     "XlsFormatter",
+    "JsonlFormatter",
+    "ColumnarFormatter",
+    "read_columns",
 ]
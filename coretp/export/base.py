@@ -5,8 +5,11 @@ import argparse
 from pathlib import Path
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from typing import Any
 
 from coretp.models import TestPlan
+from .formatters import SummaryCache
+from .manifest import export_code_key
 
 
 class ExportContext:
@@ -44,6 +47,9 @@ class Formatter(ABC):
     help_message = "Required help message explaining the formatter. Throws error if not defined"
     suffix = "Required suffix for the formatter. Throws error if not defined"
 
+    # Formatters that write one scenario at a time set this, and are given plans that build scenarios on access instead of fully built plans
+    streaming = False
+
     def __init_subclass__(cls, **kwargs) -> None:
         """
         `NotImplementedError` if any required attribute is not defined. Ensures that the required attributes are a string for subparsers
@@ -55,10 +61,12 @@ class Formatter(ABC):
             if not isinstance(cls.description, str):
                 raise TypeError(f"{cls.__name__} must define a '{attr}' attribute of type str (got {type(cls.description)})")
 
-    def __init__(self, output_directory: Path):
+    def __init__(self, output_directory: Path, jobs: int = 1):
         self.output_directory = output_directory
+        self.jobs = jobs  # Worker processes the formatter may render its output with. Formatters that render serially ignore it
         self.test_plans: list[TestPlan] = []
         self.metadata = {}
+        self.summaries = SummaryCache()  # Scenario summaries shared by every table of the export
 
     def add_test_plan(self, test_plan: TestPlan):
         """Add a test plan to be included in the export."""
@@ -74,6 +82,7 @@ class Formatter(ABC):
         """Clear all test plans and metadata."""
         self.test_plans.clear()
         self.metadata.clear()
+        self.summaries.clear()
         return self
 
     @staticmethod
@@ -97,3 +106,17 @@ class Formatter(ABC):
         Returns the path to the generated file.
         """
         pass
+
+    def export_options(self) -> dict[str, Any]:
+        """
+        Options that change the output for the same test plans. Recorded in export manifests, a change rewrites the whole output
+        """
+        return {"formatter": type(self).__name__, "code": export_code_key(), "suffix": self.suffix}
+
+    def update(self, changed: list[int]) -> Path:
+        """
+        Rewrite the parts of the existing output file for the test plans at the ``changed`` indices, keeping the rest.
+        Used by incremental exports when the same plans are exported as before. Formatters that can't update their output in place rebuild it.
+        Returns the path to the generated file.
+        """
+        return self.build()
@@ -0,0 +1,336 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import json
+from array import array
+from collections import Counter
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+from .base import Formatter, ExportContext
+from .formatters import TestPlanFormatter
+from coretp.models import TestScenario
+from coretp.step_ir import StepIR
+
+"""
+Columnar scenario catalog for coverage analytics.
+
+Two tables are written, ``scenarios`` with one row per scenario and ``steps`` with one row per ``StepIR`` (nested ``code`` included).
+Repeated values (plan names, step types, ops, CSRs, env values) are dictionary-encoded: each distinct value is stored once and
+rows hold integer indices into it, so histograms are counts over an integer array instead of loops over ``TestPlan`` objects.
+
+.. list-table:: Columns
+   :header-rows: 1
+
+   * - Table
+     - Column
+     - Encoding
+   * - scenarios
+     - ``plan``
+     - dictionary
+   * - scenarios
+     - ``name``, ``id``, ``description``, ``step_count``, ``ir_count``, ``min_num_harts``
+     - plain
+   * - scenarios
+     - ``priv_modes``, ``paging_modes``, ``page_sizes``, ``reg_widths``, ``hypervisor``, ``virtualized``, ``deleg_excp_to``
+     - list of dictionary values
+   * - steps
+     - ``scenario`` (row in ``scenarios``), ``parent`` (row of the enclosing step, -1 at top level), ``id``, ``input_count``
+     - plain
+   * - steps
+     - ``type`` (``TestStep`` class), ``op``, ``csr``
+     - dictionary, ``""`` when not set
+
+Enums are stored by name, flags as the list of their member names. By default both tables go to a single ``core_test_plan.columns.json``. With ``--parquet`` they are written as
+``scenarios.parquet`` and ``steps.parquet`` in a ``core_test_plan.parquet`` directory, which requires pyarrow.
+
+.. code-block:: python
+
+    from coretp.export.columnar import read_columns
+
+    tables = read_columns("core_test_plan.columns.json")
+    tables["steps"]["type"].value_counts()  # step type histogram
+    tables["scenarios"]["paging_modes"].value_counts()  # scenarios per allowed paging mode
+"""
+
+COLUMNAR_FORMAT_VERSION = 1
+
+
+class PlainColumn:
+    """Column of values stored as is"""
+
+    def __init__(self, values: Optional[Iterable[Any]] = None):
+        self.values = list(values) if values is not None else []
+
+    def append(self, value: Any):
+        self.values.append(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[row]
+
+    def value_counts(self) -> dict[Any, int]:
+        "Number of rows with each value, most common first"
+        return dict(Counter(self.values).most_common())
+
+    def to_json(self) -> dict[str, Any]:
+        return {"encoding": "plain", "values": self.values}
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.array(self.values)
+
+
+class DictionaryColumn:
+    """Dictionary-encoded column. Distinct values are kept in ``dictionary``, rows are ``indices`` into it"""
+
+    def __init__(self, dictionary: Optional[Iterable[Any]] = None, indices: Optional[Iterable[int]] = None):
+        self.dictionary = list(dictionary) if dictionary is not None else []
+        self.indices = array("i", indices if indices is not None else [])
+        self._lookup = {value: i for i, value in enumerate(self.dictionary)}
+
+    def encode(self, value: Any) -> int:
+        "Dictionary index of ``value``, adding it if it's new"
+        index = self._lookup.get(value)
+        if index is None:
+            index = self._lookup[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        return index
+
+    def append(self, value: Any):
+        self.indices.append(self.encode(value))
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.dictionary[self.indices[row]]
+
+    def value_counts(self) -> dict[Any, int]:
+        "Number of rows with each value, most common first. Counts the index array, values are only looked up once each"
+        return {self.dictionary[index]: count for index, count in Counter(self.indices).most_common()}
+
+    def rows(self, value: Any) -> list[int]:
+        "Rows holding ``value``"
+        index = self._lookup.get(value)
+        return [] if index is None else [row for row, i in enumerate(self.indices) if i == index]
+
+    def to_json(self) -> dict[str, Any]:
+        return {"encoding": "dictionary", "dictionary": self.dictionary, "indices": self.indices.tolist()}
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.DictionaryArray.from_arrays(pa.array(self.indices.tolist(), type=pa.int32()), pa.array(self.dictionary))
+
+
+class ListColumn:
+    """Column of lists of dictionary-encoded values. Row ``i`` holds ``values[offsets[i]:offsets[i + 1]]``"""
+
+    def __init__(self, offsets: Optional[Iterable[int]] = None, values: Optional[DictionaryColumn] = None):
+        self.offsets = array("i", offsets if offsets is not None else [0])
+        self.values = values if values is not None else DictionaryColumn()
+
+    def append(self, values: Iterable[Any]):
+        for value in values:
+            self.values.append(value)
+        self.offsets.append(len(self.values))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> list[Any]:
+        return [self.values[i] for i in range(self.offsets[row], self.offsets[row + 1])]
+
+    def value_counts(self) -> dict[Any, int]:
+        "Number of rows containing each value, most common first. Values aren't repeated within a row"
+        return self.values.value_counts()
+
+    def to_json(self) -> dict[str, Any]:
+        return {"encoding": "list", "offsets": self.offsets.tolist(), "values": self.values.to_json()}
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.ListArray.from_arrays(pa.array(self.offsets.tolist(), type=pa.int32()), self.values.to_arrow())
+
+
+Column = Union[PlainColumn, DictionaryColumn, ListColumn]
+
+
+def _column_from_json(data: dict[str, Any]) -> Column:
+    encoding = data["encoding"]
+    if encoding == "plain":
+        return PlainColumn(data["values"])
+    if encoding == "dictionary":
+        # JSON turns the tuples of flag values into lists, make them hashable again
+        return DictionaryColumn([tuple(value) if isinstance(value, list) else value for value in data["dictionary"]], data["indices"])
+    if encoding == "list":
+        return ListColumn(data["offsets"], _column_from_json(data["values"]))
+    raise ValueError(f"Unknown column encoding '{encoding}'")
+
+
+class ColumnTable:
+    """
+    Named columns of equal length
+    """
+
+    def __init__(self, columns: dict[str, Column]):
+        self.columns = columns
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def to_json(self) -> dict[str, Any]:
+        return {"rows": len(self), "columns": {name: column.to_json() for name, column in self.columns.items()}}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "ColumnTable":
+        return cls({name: _column_from_json(column) for name, column in data["columns"].items()})
+
+    def to_arrow(self):
+        "Convert to a ``pyarrow.Table``, keeping dictionary encoding"
+        import pyarrow as pa
+
+        return pa.table({name: column.to_arrow() for name, column in self.columns.items()})
+
+
+def read_columns(path: Path) -> dict[str, ColumnTable]:
+    """
+    Read the tables of a columnar export written without ``--parquet``
+
+    :param path: path of the ``.columns.json`` file
+    :return: ``scenarios`` and ``steps`` tables
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != COLUMNAR_FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar export version {data.get('version')} in {path}")
+    return {name: ColumnTable.from_json(table) for name, table in data["tables"].items()}
+
+
+def _encode(value: Any) -> Any:
+    "Enums as ``TestPlanFormatter.enum_value``, the same as JSON lines exports. Flags are tuples, so they can be dictionary-encoded"
+    return TestPlanFormatter.enum_value(value) if isinstance(value, Enum) else value
+
+
+class ColumnarFormatter(Formatter):
+    """
+    Streaming formatter writing a columnar scenario and step catalog.
+    """
+
+    description = "Export a columnar catalog of scenarios and StepIRs for analytics"
+    help_message = "Export dictionary-encoded scenario and step tables, as JSON or Parquet (requires pyarrow)"
+    suffix = "columns.json"
+    streaming = True
+
+    ENV_LIST_FIELDS = ("priv_modes", "paging_modes", "page_sizes", "reg_widths", "hypervisor", "virtualized", "deleg_excp_to")
+
+    def __init__(self, parquet: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.parquet = parquet
+        if parquet:
+            self.suffix = "parquet"
+
+    @staticmethod
+    def add_arguments(parser: argparse.ArgumentParser):
+        """Add columnar export specific arguments."""
+        parser.add_argument("--parquet", action="store_true", help="Write the tables as Parquet files instead of a single JSON file. Requires pyarrow")
+
+    def build(self) -> Path:
+        """Collect the tables one scenario at a time, then write them."""
+        if not self.test_plans:
+            raise ValueError("No test plans added. Use add_test_plan() first.")
+
+        tables = self.tables()
+        if self.parquet:
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Parquet export requires pyarrow. Install it with 'pip install pyarrow'") from e
+            output_path = self.output_file
+            output_path.mkdir(parents=True, exist_ok=True)
+            for name, table in tables.items():
+                pq.write_table(table.to_arrow(), output_path / f"{name}.parquet")
+            return output_path
+
+        context = ExportContext(self.output_file.with_suffix(""), total_plans=len(self.test_plans), **self.metadata)
+        with context.text_file(f".{self.suffix}") as (f, output_path):
+            json.dump(
+                {
+                    "version": COLUMNAR_FORMAT_VERSION,
+                    "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    **self.metadata,
+                    "tables": {name: table.to_json() for name, table in tables.items()},
+                },
+                f,
+                separators=(",", ":"),
+            )
+        return output_path
+
+    def tables(self) -> dict[str, ColumnTable]:
+        """Scenario and step tables of the added test plans. Scenarios are read once, in plan order"""
+        scenarios: dict[str, Column] = {
+            "plan": DictionaryColumn(),
+            "name": PlainColumn(),
+            "id": PlainColumn(),
+            "description": PlainColumn(),
+            "step_count": PlainColumn(),
+            "ir_count": PlainColumn(),
+            "min_num_harts": PlainColumn(),
+            **{f: ListColumn() for f in self.ENV_LIST_FIELDS},
+        }
+        steps: dict[str, Column] = {
+            "scenario": PlainColumn(),
+            "parent": PlainColumn(),
+            "id": PlainColumn(),
+            "type": DictionaryColumn(),
+            "op": DictionaryColumn(),
+            "csr": DictionaryColumn(),
+            "input_count": PlainColumn(),
+        }
+
+        for test_plan in self.test_plans:
+            for scenario in test_plan.scenarios:
+                ir_count = self._add_steps(steps, len(scenarios["name"]), scenario)
+                self._add_scenario(scenarios, test_plan.name, scenario, ir_count)
+        return {"scenarios": ColumnTable(scenarios), "steps": ColumnTable(steps)}
+
+    def _add_scenario(self, columns: dict[str, Column], plan_name: str, scenario: TestScenario, ir_count: int):
+        columns["plan"].append(plan_name)
+        columns["name"].append(scenario.name)
+        columns["id"].append(scenario.id)
+        columns["description"].append(scenario.description)
+        columns["step_count"].append(len(scenario.steps))
+        columns["ir_count"].append(ir_count)
+        columns["min_num_harts"].append(scenario.env.min_num_harts)
+        for env_field in self.ENV_LIST_FIELDS:
+            columns[env_field].append(_encode(value) for value in dict.fromkeys(getattr(scenario.env, env_field)))
+
+    @staticmethod
+    def _add_steps(columns: dict[str, Column], scenario_row: int, scenario: TestScenario) -> int:
+        "Append a row per StepIR in pre-order, nested code after the step containing it. Returns the number of rows added"
+        first_row = len(columns["id"])
+        stack: list[tuple[StepIR, int]] = [(step_ir, -1) for step_ir in reversed(scenario.steps)]
+        while stack:
+            step_ir, parent = stack.pop()
+            row = len(columns["id"])
+            step = step_ir.step
+            columns["scenario"].append(scenario_row)
+            columns["parent"].append(parent)
+            columns["id"].append(step_ir.id)
+            columns["type"].append(type(step).__name__ if step is not None else "")
+            columns["op"].append(getattr(step, "op", None) or "")
+            columns["csr"].append(getattr(step, "csr_name", None) or "")
+            columns["input_count"].append(len(step_ir.inputs))
+            stack.extend((code, row) for code in reversed(step_ir.code))
+        return len(columns["id"]) - first_row
@@ -2,12 +2,21 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from functools import partial
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Optional
+from zipfile import ZipFile
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.cell_style import StyleArray
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
 
@@ -15,6 +24,9 @@ from .base import Formatter, ExportContext
 from .formatters import TestPlanFormatter, ExportTableBuilder
 from coretp.models import TestPlan
 
+# Row of (value, named style) cells for write-only sheets. Style is None for unstyled cells
+StyledRow = list[tuple[Any, Optional[str]]]
+
 
 class XlsFormatter(Formatter):
     """
@@ -25,10 +37,11 @@ class XlsFormatter(Formatter):
     help_message = "Export test plans to Excel format with multiple worksheets and formatting"
     suffix = "xlsx"
 
-    def __init__(self, no_summary: bool = False, single_sheet: bool = False, **kwargs):
+    def __init__(self, no_summary: bool = False, single_sheet: bool = False, write_only: bool = False, **kwargs):
         super().__init__(**kwargs)
         self.no_summary = no_summary
         self.single_sheet = single_sheet
+        self.write_only = write_only
 
         # Define styles
         self.header_font = Font(bold=True, color="FFFFFF")
@@ -39,11 +52,27 @@ class XlsFormatter(Formatter):
         self.center_align = Alignment(horizontal="center", vertical="center")
         self.wrap_text = Alignment(wrap_text=True, vertical="top")
 
+        # Named styles for write-only mode. Registered once per workbook and referenced by name from every cell
+        self.named_styles = [
+            NamedStyle(name="coretp_title", font=Font(size=16, bold=True, color="366092")),
+            NamedStyle(name="coretp_plan_title", font=Font(size=14, bold=True, color="366092")),
+            NamedStyle(name="coretp_wrap", alignment=self.wrap_text),
+            NamedStyle(name="coretp_header", font=self.header_font, fill=self.header_fill, border=self.border, alignment=self.center_align),
+            NamedStyle(name="coretp_subheader", font=self.subheader_font, fill=self.subheader_fill, border=self.border, alignment=self.center_align),
+            NamedStyle(name="coretp_cell", border=self.border),
+            NamedStyle(name="coretp_wrap_cell", border=self.border, alignment=self.wrap_text),
+        ]
+
     @staticmethod
     def add_arguments(parser: argparse.ArgumentParser):
         """Add Excel-specific arguments."""
         parser.add_argument("--no-summary", action="store_true", help="Skip summary worksheet")
         parser.add_argument("--single-sheet", action="store_true", help="Put all test plans in single worksheet")
+        parser.add_argument(
+            "--write-only",
+            action="store_true",
+            help="Stream rows with a write-only workbook. Faster and uses less memory for large exports, but title cells aren't merged. With --jobs, test plan sheets are rendered in parallel",
+        )
 
     def build(self) -> Path:
         """Generate Excel file containing all test plans."""
@@ -52,6 +81,11 @@ class XlsFormatter(Formatter):
 
         context = ExportContext(self.output_file.with_suffix(""), total_plans=len(self.test_plans), **self.metadata)
 
+        if self.write_only:
+            with context.binary_file(f".{self.suffix}") as (f, output_path):
+                self._build_write_only(output_path)
+            return output_path
+
         with context.binary_file(f".{self.suffix}") as (f, output_path):
             wb = Workbook()
 
@@ -74,6 +108,39 @@ class XlsFormatter(Formatter):
 
         return output_path
 
+    def export_options(self) -> dict[str, Any]:
+        return {**super().export_options(), "no_summary": self.no_summary, "single_sheet": self.single_sheet, "write_only": self.write_only}
+
+    def update(self, changed: list[int]) -> Path:
+        """
+        Replace the sheets of the changed test plans and the summary sheet in the existing workbook, keeping every other sheet as is.
+        Single sheet and write-only workbooks are rebuilt.
+        """
+        output_path = self.output_file
+        if self.single_sheet or self.write_only or not output_path.exists():
+            return self.build()
+
+        wb = load_workbook(output_path)
+        for i in changed:
+            sheet_name = self._sanitize_sheet_name(self.test_plans[i].name, i)
+            if sheet_name not in wb.sheetnames:
+                return self.build()
+            position = wb.sheetnames.index(sheet_name)
+            wb.remove(wb[sheet_name])
+            ws = wb.create_sheet(title=sheet_name, index=position)
+            self._populate_test_plan_sheet(ws, self.test_plans[i])
+        if "Summary" in wb.sheetnames:
+            wb.remove(wb["Summary"])
+        if not self.no_summary:
+            self._create_summary_sheet(wb)
+        wb.active = 0
+
+        # Save next to the output first, so a failed save leaves the previous export intact
+        tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+        wb.save(str(tmp_path))
+        os.replace(tmp_path, output_path)
+        return output_path
+
     def _create_summary_sheet(self, wb: Workbook):
         """Create overview summary sheet."""
         ws = wb.create_sheet(title="Summary", index=0)
@@ -99,7 +166,7 @@ class XlsFormatter(Formatter):
         row += 2
 
         # Test plans table using reusable builder
-        table_data = ExportTableBuilder.build_summary_table(self.test_plans)
+        table_data = ExportTableBuilder.build_summary_table(self.test_plans, self.summaries)
 
         # Add sheet reference column
         table_data[0].append("Sheet")  # Add header
@@ -136,7 +203,7 @@ class XlsFormatter(Formatter):
         row += 2
 
         # Scenarios table using reusable builder
-        table_data = ExportTableBuilder.build_scenario_table(test_plan)
+        table_data = ExportTableBuilder.build_scenario_table(test_plan, self.summaries)
 
         # Write table
         for row_idx, row_data in enumerate(table_data):
@@ -173,7 +240,7 @@ class XlsFormatter(Formatter):
             cell.border = self.border
 
         # Combined table using reusable builder
-        table_data = ExportTableBuilder.build_combined_table(self.test_plans)
+        table_data = ExportTableBuilder.build_combined_table(self.test_plans, self.summaries)
 
         # Write table (skip headers since they're already written)
         for row_idx, row_data in enumerate(table_data[1:], 1):  # Skip header row
@@ -185,6 +252,147 @@ class XlsFormatter(Formatter):
 
         self._auto_adjust_columns(ws)
 
+    def _build_write_only(self, output_path: Path):
+        """
+        Write the workbook in write-only mode. Sheets have the same rows as the regular workbook.
+
+        Rows are generated one at a time and streamed to the file instead of being kept as cell objects, and every cell references a shared named style.
+        Write-only sheets can't be resized afterwards, so each sheet's rows are generated twice: once to compute column widths, then to write them.
+        Only the cached scenario summaries are kept in memory, not the rows.
+
+        With ``jobs`` > 1 the test plan sheets are rendered in worker processes, see ``_render_plan_sheets``.
+        """
+        wb = self._write_only_workbook()
+        sheets: list[tuple[Worksheet, Callable[[], Iterable[StyledRow]]]] = []
+        if not self.no_summary:
+            generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            sheets.append((wb.create_sheet(title="Summary"), partial(self._summary_rows, generated)))
+        plan_sheets = []
+        if not self.single_sheet:
+            for i, test_plan in enumerate(self.test_plans):
+                plan_sheets.append(wb.create_sheet(title=self._sanitize_sheet_name(test_plan.name, i)))
+        else:
+            sheets.append((wb.create_sheet(title="All Test Plans"), self._combined_rows))
+
+        parallel = self.jobs > 1 and len(plan_sheets) > 1 and "fork" in multiprocessing.get_all_start_methods()
+        if not parallel:
+            sheets.extend((ws, partial(self._test_plan_rows, test_plan)) for ws, test_plan in zip(plan_sheets, self.test_plans))
+        styles = self._style_arrays(plan_sheets[0] if plan_sheets else sheets[0][0])
+        for ws, rows in sheets:
+            self._write_rows(ws, rows, styles)
+        wb.save(str(output_path))
+
+        if parallel:
+            # Plan sheets were saved empty, swap in the rendered worksheets. Sheet paths are only known once the workbook is saved
+            rendered = self._render_plan_sheets()
+            _replace_archive_parts(output_path, {ws.path[1:]: xml for ws, xml in zip(plan_sheets, rendered)})
+
+    def _write_only_workbook(self) -> Workbook:
+        """Write-only workbook with the named styles registered"""
+        wb = Workbook(write_only=True)
+        for style in self.named_styles:
+            wb.add_named_style(style)
+        return wb
+
+    def _style_arrays(self, ws: Worksheet) -> dict[str, StyleArray]:
+        """
+        Resolve every named style of ``ws``'s workbook once, in ``named_styles`` order, and register its cell format.
+        Workbooks set up the same way give every style the same ids, whatever order sheets use them in, so worksheets rendered in
+        separate workbooks can be moved between them.
+        """
+        styles = {}
+        for style in self.named_styles:
+            cell = WriteOnlyCell(ws)
+            cell.style = style.name
+            cell.style_id  # Adds the cell format to the workbook
+            styles[style.name] = cell._style
+        return styles
+
+    def _render_plan_sheets(self) -> list[bytes]:
+        """
+        Render the worksheet of every test plan in ``jobs`` worker processes, see ``render_plan_sheet``.
+        Workers are forked so they share the already built test plans instead of receiving pickled copies.
+        """
+        global _rendering_formatter
+        _rendering_formatter = self
+        try:
+            with ProcessPoolExecutor(max_workers=self.jobs, mp_context=multiprocessing.get_context("fork")) as executor:
+                return list(executor.map(_render_plan_sheet, range(len(self.test_plans))))
+        finally:
+            _rendering_formatter = None
+
+    def render_plan_sheet(self, index: int) -> bytes:
+        """
+        Worksheet XML of ``test_plans[index]``'s sheet, written to a write-only workbook of its own.
+        Cells hold inline strings and the same style ids as the export workbook, so the XML can replace the sheet in it as is.
+        """
+        wb = self._write_only_workbook()
+        ws = wb.create_sheet(title=self._sanitize_sheet_name(self.test_plans[index].name, index))
+        self._write_rows(ws, partial(self._test_plan_rows, self.test_plans[index]), self._style_arrays(ws))
+        buffer = BytesIO()
+        wb.save(buffer)
+        with ZipFile(buffer) as archive:
+            return archive.read(ws.path[1:])
+
+    def _summary_rows(self, generated: str) -> Iterator[StyledRow]:
+        """Rows of the summary sheet"""
+        yield [("Test Plan Documentation Summary", "coretp_title")]
+        yield []
+        yield [("Generated:", None), (generated, None)]
+        yield [("Total Test Plans:", None), (len(self.test_plans), None)]
+        yield [("Total Scenarios:", None), (sum(len(tp.scenarios) for tp in self.test_plans), None)]
+        yield []
+        yield [(value, "coretp_header") for value in [*ExportTableBuilder.SUMMARY_HEADERS, "Sheet"]]
+        table_data = ExportTableBuilder.build_summary_table(self.test_plans, self.summaries)
+        for i, row_data in enumerate(table_data[1:]):
+            sheet_ref = self._sanitize_sheet_name(self.test_plans[i].name, i) if not self.single_sheet else "All Test Plans"
+            yield [(value, "coretp_cell") for value in [*row_data, sheet_ref]]
+
+    def _test_plan_rows(self, test_plan: TestPlan) -> Iterator[StyledRow]:
+        """Rows of a single test plan sheet"""
+        yield [(test_plan.name, "coretp_plan_title")]
+        yield [(test_plan.description, "coretp_wrap")]
+        yield []
+        yield [(value, "coretp_subheader") for value in ExportTableBuilder.SCENARIO_HEADERS]
+        for row_data in ExportTableBuilder.iter_scenario_rows(test_plan, self.summaries):
+            yield [(value, "coretp_wrap_cell" if col_idx == 1 else "coretp_cell") for col_idx, value in enumerate(row_data)]
+
+    def _combined_rows(self) -> Iterator[StyledRow]:
+        """Rows of the single sheet containing all test plans"""
+        headers = ["Test Plan", "Scenario", "Description", "Environment", "Steps", "Paging Modes", "Privilege Mode"]
+        yield [("All Test Plans", "coretp_title")]
+        yield []
+        yield [(header, "coretp_header") for header in headers]
+        for row_data in ExportTableBuilder.iter_combined_rows(self.test_plans, self.summaries):
+            yield [(value, "coretp_wrap_cell" if col_idx == 2 else "coretp_cell") for col_idx, value in enumerate(row_data)]
+
+    def _write_rows(self, ws: Worksheet, rows: Callable[[], Iterable[StyledRow]], styles: dict[str, StyleArray]):
+        """
+        Size columns from a first pass over ``rows()``, then stream a second pass into a write-only sheet
+
+        :param rows: called once per pass, returns the sheet's rows
+        :param styles: resolved named styles, from ``_style_arrays``
+        """
+        widths: dict[int, int] = {}
+        for row in rows():
+            for col_idx, (value, _) in enumerate(row):
+                if value is not None:
+                    widths[col_idx] = max(widths.get(col_idx, 0), len(str(value)))
+        for col_idx, max_length in widths.items():
+            ws.column_dimensions[get_column_letter(col_idx + 1)].width = min(max_length + 2, 50)  # Cap at 50 chars
+
+        # Resolving a named style per cell is slow, so cells copy the style ids resolved once per workbook
+        for row in rows():
+            cells = []
+            for value, style in row:
+                if style is None:
+                    cells.append(value)
+                    continue
+                cell = WriteOnlyCell(ws, value=value)
+                cell._style = copy(styles[style])
+                cells.append(cell)
+            ws.append(cells)
+
     def _sanitize_sheet_name(self, name: str, index: int) -> str:
         """Sanitize sheet name for Excel compatibility."""
         # Excel sheet names can't exceed 31 chars and can't contain certain chars
@@ -213,3 +421,20 @@ class XlsFormatter(Formatter):
 
             adjusted_width = min(max_length + 2, 50)  # Cap at 50 chars
             ws.column_dimensions[column_letter].width = adjusted_width
+
+
+def _replace_archive_parts(path: Path, parts: dict[str, bytes]):
+    """Rewrite the zip archive at ``path`` with the data of some members replaced. Member order, timestamps and compression are kept"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with ZipFile(path) as source, ZipFile(tmp_path, "w") as target:
+        for info in source.infolist():
+            target.writestr(info, parts[info.filename] if info.filename in parts else source.read(info))
+    os.replace(tmp_path, path)
+
+
+# Formatter rendering plan sheets in forked workers. Set in the parent before forking, so workers inherit it along with the test plans
+_rendering_formatter: Optional[XlsFormatter] = None
+
+
+def _render_plan_sheet(index: int) -> bytes:
+    return _rendering_formatter.render_plan_sheet(index)
@@ -7,10 +7,12 @@ Eliminates the need for hasattr/getattr by using proper type information.
 """
 
 from dataclasses import dataclass
-from typing import Any
+from enum import Enum, Flag
+from typing import Any, Iterator, Optional, Union
 from coretp.models import TestPlan, TestScenario
 from coretp.env.cfg import TestEnvCfg
 from coretp.step_ir import StepIR
+from coretp.rv_enums.arch import mask_bits
 
 
 @dataclass(frozen=True)
@@ -43,6 +45,17 @@ class TestPlanSummary:
 class TestPlanFormatter:
     """Utility class for formatting test plan data consistently across exporters."""
 
+    @staticmethod
+    def enum_value(value: Enum) -> Union[str, tuple[str, ...]]:
+        """
+        Canonical machine-readable form of an enum member, its name. ``Flag`` values are the names of their set members, lowest bit first,
+        even with a single member set. Combined flags have no name before Python 3.11, and their name order differs between versions.
+        """
+        if isinstance(value, Flag):
+            flag_type = type(value)
+            return tuple(flag_type(bit).name for bit in mask_bits(value.value))
+        return value.name
+
     @staticmethod
     def format_paging_modes(env_cfg: TestEnvCfg) -> str:
         """Format paging modes list as readable string."""
@@ -106,42 +119,85 @@ class TestPlanFormatter:
         )
 
 
+class SummaryCache:
+    """
+    Scenario and test plan summaries memoized by object identity, so every table of an export summarizes each scenario once.
+    Holds a reference to each summarized object so ids aren't reused while the cache is alive.
+    """
+
+    def __init__(self):
+        self._scenarios: dict[int, tuple[TestScenario, ScenarioSummary]] = {}
+        self._test_plans: dict[int, tuple[TestPlan, TestPlanSummary]] = {}
+
+    def scenario(self, scenario: TestScenario) -> ScenarioSummary:
+        """Summary of ``scenario``, computed on first use"""
+        entry = self._scenarios.get(id(scenario))
+        if entry is None:
+            entry = self._scenarios[id(scenario)] = (scenario, TestPlanFormatter.get_scenario_summary(scenario))
+        return entry[1]
+
+    def test_plan(self, test_plan: TestPlan) -> TestPlanSummary:
+        """Summary of ``test_plan``, reusing cached scenario summaries"""
+        entry = self._test_plans.get(id(test_plan))
+        if entry is None:
+            scenarios = [self.scenario(scenario) for scenario in test_plan.scenarios]
+            summary = TestPlanSummary(
+                name=test_plan.name,
+                description=test_plan.description,
+                scenario_count=len(scenarios),
+                total_steps=sum(s.step_count for s in scenarios),
+                scenarios=scenarios,
+            )
+            entry = self._test_plans[id(test_plan)] = (test_plan, summary)
+        return entry[1]
+
+    def clear(self):
+        self._scenarios.clear()
+        self._test_plans.clear()
+
+
 class ExportTableBuilder:
     """Helper class for building consistent table data across formats."""
 
+    SUMMARY_HEADERS = ["Test Plan", "Description", "Scenarios", "Total Steps"]
+    SCENARIO_HEADERS = ["Scenario", "Description", "Steps", "Paging Modes", "Privilege Modes", "Page Sizes"]
+    COMBINED_HEADERS = ["Test Plan", "Scenario", "Description", "Steps", "Paging Modes", "Privilege Modes"]
+
     @staticmethod
-    def build_summary_table(test_plans: list[TestPlan]) -> list[list[str]]:
+    def build_summary_table(test_plans: list[TestPlan], summaries: Optional[SummaryCache] = None) -> list[list[str]]:
         """Build summary table data for multiple test plans."""
-        headers = ["Test Plan", "Description", "Scenarios", "Total Steps"]
-        rows = [headers]
+        summaries = summaries or SummaryCache()
+        rows = [list(ExportTableBuilder.SUMMARY_HEADERS)]
 
         for test_plan in test_plans:
-            summary = TestPlanFormatter.get_test_plan_summary(test_plan)
+            summary = summaries.test_plan(test_plan)
             rows.append([summary.name, summary.description, str(summary.scenario_count), str(summary.total_steps)])
 
         return rows
 
     @staticmethod
-    def build_scenario_table(test_plan: TestPlan) -> list[list[str]]:
+    def build_scenario_table(test_plan: TestPlan, summaries: Optional[SummaryCache] = None) -> list[list[str]]:
         """Build scenario table data for a single test plan."""
-        headers = ["Scenario", "Description", "Steps", "Paging Modes", "Privilege Modes", "Page Sizes"]
-        rows = [headers]
+        return [list(ExportTableBuilder.SCENARIO_HEADERS), *ExportTableBuilder.iter_scenario_rows(test_plan, summaries)]
 
+    @staticmethod
+    def iter_scenario_rows(test_plan: TestPlan, summaries: Optional[SummaryCache] = None) -> Iterator[list[str]]:
+        """Yield the scenario table rows of a single test plan one at a time, without the header."""
+        summaries = summaries or SummaryCache()
         for scenario in test_plan.scenarios:
-            summary = TestPlanFormatter.get_scenario_summary(scenario)
-            rows.append([summary.name, summary.description, str(summary.step_count), summary.paging_modes, summary.privilege_modes, summary.page_sizes])
-
-        return rows
+            summary = summaries.scenario(scenario)
+            yield [summary.name, summary.description, str(summary.step_count), summary.paging_modes, summary.privilege_modes, summary.page_sizes]
 
     @staticmethod
-    def build_combined_table(test_plans: list[TestPlan]) -> list[list[str]]:
+    def build_combined_table(test_plans: list[TestPlan], summaries: Optional[SummaryCache] = None) -> list[list[str]]:
         """Build combined table data for all test plans and scenarios."""
-        headers = ["Test Plan", "Scenario", "Description", "Steps", "Paging Modes", "Privilege Modes"]
-        rows = [headers]
+        return [list(ExportTableBuilder.COMBINED_HEADERS), *ExportTableBuilder.iter_combined_rows(test_plans, summaries)]
 
+    @staticmethod
+    def iter_combined_rows(test_plans: list[TestPlan], summaries: Optional[SummaryCache] = None) -> Iterator[list[str]]:
+        """Yield the combined table rows of all test plans and scenarios one at a time, without the header."""
+        summaries = summaries or SummaryCache()
         for test_plan in test_plans:
             for scenario in test_plan.scenarios:
-                summary = TestPlanFormatter.get_scenario_summary(scenario)
-                rows.append([test_plan.name, summary.name, summary.description, str(summary.step_count), summary.paging_modes, summary.privilege_modes])
-
-        return rows
+                summary = summaries.scenario(scenario)
+                yield [test_plan.name, summary.name, summary.description, str(summary.step_count), summary.paging_modes, summary.privilege_modes]
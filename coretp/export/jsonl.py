@@ -0,0 +1,156 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import json
+from dataclasses import fields
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterator
+
+from .base import Formatter, ExportContext
+from .formatters import TestPlanFormatter
+from coretp.models import TestPlan, TestScenario
+from coretp.env.cfg import TestEnvCfg
+from coretp.step import TestStep
+from coretp.step_ir import StepIR
+
+"""
+Machine-readable export of scenarios and their full ``StepIR`` graphs.
+
+Every record is a JSON object on its own line (or a msgpack object with ``--msgpack``). The stream is one ``export`` record,
+then for each test plan a ``plan`` record followed by one ``scenario`` record per scenario:
+
+.. code-block:: text
+
+    {"record": "export", "version": 3, "generated": "...", "plans": 10}
+    {"record": "plan", "name": "paging", "description": "...", "scenarios": 12}
+    {"record": "scenario", "plan": "paging", "name": "...", "id": "...", "description": "...", "env": {...}, "steps": [...]}
+
+Each step is ``{"id": ..., "inputs": [...], "code": [<nested steps>], "type": <TestStep class>, "fields": {...}}``.
+Inputs and ``TestStep`` field values that refer to other steps are written as ``{"ref": <step id>}``, enums as their name and flags as the list of
+their member names (see ``TestPlanFormatter.enum_value``).
+
+Scenarios are written as they're read from the plan, so with plans from ``stream_plan`` only one scenario is held in memory at a time.
+"""
+
+JSONL_FORMAT_VERSION = 3
+
+
+class JsonlFormatter(Formatter):
+    """
+    Streaming formatter writing one JSON (or msgpack) record per scenario.
+    """
+
+    description = "Export scenarios and their StepIR graphs as JSON lines"
+    help_message = "Export machine-readable scenarios with full StepIR graphs, one record per line. Optionally msgpack, requires msgpack"
+    suffix = "jsonl"
+    streaming = True
+
+    def __init__(self, msgpack: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.msgpack = msgpack
+        if msgpack:
+            self.suffix = "msgpack"
+
+    @staticmethod
+    def add_arguments(parser: argparse.ArgumentParser):
+        """Add JSON lines specific arguments."""
+        parser.add_argument("--msgpack", action="store_true", help="Write a stream of msgpack objects instead of JSON lines")
+
+    def build(self) -> Path:
+        """Write every scenario of the added test plans, one record at a time."""
+        if not self.test_plans:
+            raise ValueError("No test plans added. Use add_test_plan() first.")
+
+        context = ExportContext(self.output_file.with_suffix(""), total_plans=len(self.test_plans), **self.metadata)
+
+        if self.msgpack:
+            try:
+                import msgpack
+            except ImportError as e:
+                raise ImportError("msgpack export requires the msgpack package. Install it with 'pip install msgpack'") from e
+            packer = msgpack.Packer()
+            with context.binary_file(f".{self.suffix}") as (f, output_path):
+                for record in self.records():
+                    f.write(packer.pack(record))
+        else:
+            with context.text_file(f".{self.suffix}") as (f, output_path):
+                for record in self.records():
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return output_path
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        """Export records in output order. Scenario records are created as the plan's scenarios are iterated"""
+        yield {"record": "export", "version": JSONL_FORMAT_VERSION, "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "plans": len(self.test_plans), **self.metadata}
+        for test_plan in self.test_plans:
+            yield self.plan_record(test_plan)
+            for scenario in test_plan.scenarios:
+                yield self.scenario_record(test_plan.name, scenario)
+
+    @staticmethod
+    def plan_record(test_plan: TestPlan) -> dict[str, Any]:
+        return {"record": "plan", "name": test_plan.name, "description": test_plan.description, "scenarios": len(test_plan.scenarios)}
+
+    @classmethod
+    def scenario_record(cls, plan_name: str, scenario: TestScenario) -> dict[str, Any]:
+        """Serialize a scenario with its env config and StepIR graph"""
+        step_ids: dict[int, str] = {}
+        ir_ids: set[str] = set()
+        stack = list(scenario.steps)
+        while stack:
+            step_ir = stack.pop()
+            stack.extend(step_ir.code)
+            ir_ids.add(step_ir.id)
+            if step_ir.step is not None:
+                step_ids[id(step_ir.step)] = step_ir.id
+
+        return {
+            "record": "scenario",
+            "plan": plan_name,
+            "name": scenario.name,
+            "id": scenario.id,
+            "description": scenario.description,
+            "env": cls.env_record(scenario.env),
+            "steps": [cls.step_ir_record(step_ir, step_ids, ir_ids) for step_ir in scenario.steps],
+        }
+
+    @classmethod
+    def env_record(cls, env: TestEnvCfg) -> dict[str, Any]:
+        return {f.name: cls.value_record(getattr(env, f.name), {}) for f in fields(env)}
+
+    @classmethod
+    def step_ir_record(cls, step_ir: StepIR, step_ids: dict[int, str], ir_ids: set[str]) -> dict[str, Any]:
+        "Serialize a StepIR and its nested code. Inputs naming a StepIR of the scenario (``ir_ids``) become references"
+        record: dict[str, Any] = {
+            "id": step_ir.id,
+            "inputs": [{"ref": i} if isinstance(i, str) and i in ir_ids else cls.value_record(i, step_ids) for i in step_ir.inputs],
+            "code": [cls.step_ir_record(c, step_ids, ir_ids) for c in step_ir.code],
+        }
+        if step_ir.step is not None:
+            record.update(cls.step_record(step_ir.step, step_ids))
+        return record
+
+    @classmethod
+    def step_record(cls, step: TestStep, step_ids: dict[int, str]) -> dict[str, Any]:
+        return {
+            "type": type(step).__name__,
+            "fields": {f.name: cls.value_record(getattr(step, f.name), step_ids) for f in fields(step) if f.name != "code"},
+        }
+
+    @classmethod
+    def value_record(cls, value: Any, step_ids: dict[int, str]) -> Any:
+        "JSON-compatible form of a field value. Steps with an IR id become references, other steps are written inline"
+        if isinstance(value, TestStep):
+            step_id = step_ids.get(id(value))
+            return {"ref": step_id} if step_id is not None else cls.step_record(value, step_ids)
+        if isinstance(value, Enum):
+            return TestPlanFormatter.enum_value(value)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return [cls.value_record(v, step_ids) for v in value]
+        if isinstance(value, dict):
+            return {str(k): cls.value_record(v, step_ids) for k, v in value.items()}
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return str(value)
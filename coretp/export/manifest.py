@@ -0,0 +1,145 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from .formatters import ScenarioSummary, SummaryCache
+from coretp.models import TestPlan
+from coretp.plans.plan_cache import coretp_version
+
+"""
+Export manifest for incremental exports.
+
+Written next to the exported file as ``<output file>.manifest.json``. It records the formatter options, a hash of the exported file,
+including a hash of the exporter code (``export_code_key``), and for each test plan the key of its sources (``plan_source_key``), a hash of its exported content and a hash per scenario.
+
+.. code-block:: json
+
+    {
+        "version": 1,
+        "options": {"formatter": "XlsFormatter", "code": "...", "single_sheet": false, ...},
+        "output_hash": "...",
+        "plans": [{"name": "paging", "source_key": "...", "hash": "...", "scenarios": [["SID_PAGING_...", "..."], ...]}, ...]
+    }
+
+Content hashes are taken from the scenario summaries the formatters export, so changes that don't show up in the output don't cause rewrites.
+"""
+
+MANIFEST_VERSION = 1
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1)
+def export_code_key() -> str:
+    """
+    Hash of the coretp version and the exporter sources (``coretp/export`` and ``coretp/exporter.py``), so a code change rewrites the output
+    """
+    root = Path(__file__).parent.parent
+    digest = hashlib.sha256(coretp_version().encode())
+    for file in [*sorted((root / "export").rglob("*.py")), root / "exporter.py"]:
+        digest.update(str(file.relative_to(root)).encode())
+        digest.update(file.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def scenario_hash(summary: ScenarioSummary) -> str:
+    "Hash of the exported content of a scenario"
+    return _digest(asdict(summary))
+
+
+def file_hash(path: Path) -> str:
+    "Hash of an exported file, so edited or replaced outputs are rewritten"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class PlanEntry:
+    """
+    Manifest record of an exported test plan
+
+    :param name: test plan name
+    :param source_key: ``plan_source_key`` of the plan when it was exported
+    :param hash: hash of the plan's exported content, including its scenarios
+    :param scenarios: ``[name, hash]`` of each scenario, in plan order
+    """
+
+    name: str
+    source_key: str
+    hash: str
+    scenarios: list[list[str]] = field(default_factory=list)
+
+    @classmethod
+    def from_plan(cls, test_plan: TestPlan, source_key: str, summaries: SummaryCache) -> "PlanEntry":
+        scenarios = [[scenario.name, scenario_hash(summaries.scenario(scenario))] for scenario in test_plan.scenarios]
+        return cls(name=test_plan.name, source_key=source_key, hash=_digest([test_plan.name, test_plan.description, scenarios]), scenarios=scenarios)
+
+    def describe_changes(self, previous: Optional["PlanEntry"]) -> str:
+        """
+        Short description of the scenario changes since ``previous``, e.g. ``2 changed, 1 added``
+        """
+        if previous is None:
+            return "new plan"
+        old, new = dict(map(tuple, previous.scenarios)), dict(map(tuple, self.scenarios))
+        counts = {
+            "changed": sum(1 for name, h in new.items() if name in old and old[name] != h),
+            "added": sum(1 for name in new if name not in old),
+            "removed": sum(1 for name in old if name not in new),
+        }
+        return ", ".join(f"{count} {kind}" for kind, count in counts.items() if count) or "plan description or scenario order changed"
+
+
+@dataclass
+class ExportManifest:
+    """
+    Contents of an export manifest, see module docs
+    """
+
+    options: dict[str, Any]
+    output_hash: str
+    plans: list[PlanEntry]
+
+    @staticmethod
+    def path_for(output_path: Path) -> Path:
+        "Manifest path of an exported file"
+        return output_path.with_name(f"{output_path.name}.manifest.json")
+
+    @classmethod
+    def read(cls, path: Path) -> Optional["ExportManifest"]:
+        """
+        Read a manifest, None if it doesn't exist, can't be parsed or was written by another manifest version
+        """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return None
+            return cls(options=data["options"], output_hash=data["output_hash"], plans=[PlanEntry(**plan) for plan in data["plans"]])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def write(self, path: Path):
+        """Write the manifest, replacing the previous one atomically"""
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, **asdict(self)}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def plan(self, name: str) -> Optional[PlanEntry]:
+        return next((plan for plan in self.plans if plan.name == name), None)
+
+    def source_keys(self) -> list[tuple[str, str]]:
+        "``(name, source_key)`` of every exported plan, in export order"
+        return [(plan.name, plan.source_key) for plan in self.plans]
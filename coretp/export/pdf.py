@@ -67,6 +67,9 @@ class PdfFormatter(Formatter):
             )
         )
 
+    def export_options(self) -> dict:
+        return {**super().export_options(), "page_size": list(self.page_size), "include_toc": self.include_toc}
+
     def build(self):
         """Generate PDF containing all test plans."""
         if not self.test_plans:
@@ -103,11 +106,12 @@ class PdfFormatter(Formatter):
                     story.append(Paragraph(scenario.description, self.styles["Normal"]))
 
                     # Environment info as simple text
+                    summary = self.summaries.scenario(scenario)
                     env_info = []
-                    if hasattr(scenario.env, "paging_modes") and scenario.env.paging_modes:
-                        env_info.append(f"Paging: {', '.join([mode.name for mode in scenario.env.paging_modes])}")
-                    if hasattr(scenario.env, "priv_modes") and scenario.env.priv_modes:
-                        env_info.append(f"Privilege: {', '.join([mode.name for mode in scenario.env.priv_modes])}")
+                    if scenario.env.paging_modes:
+                        env_info.append(f"Paging: {summary.paging_modes}")
+                    if scenario.env.priv_modes:
+                        env_info.append(f"Privilege: {summary.privilege_modes}")
 
                     if env_info:
                         story.append(Paragraph(f"<i>{' | '.join(env_info)}</i>", self.styles["Normal"]))
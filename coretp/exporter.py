@@ -4,15 +4,19 @@
 import argparse
 from pathlib import Path
 from enum import Enum
-from typing import Type, Any
+from typing import Type, Any, Optional
 
-from coretp.export import Formatter, PdfFormatter, XlsFormatter
-from coretp.plans.test_plan_registry import get_plan, list_plans, query_plans
+from coretp import TestPlan
+from coretp.export import Formatter, PdfFormatter, XlsFormatter, JsonlFormatter, ColumnarFormatter
+from coretp.export.manifest import ExportManifest, PlanEntry, file_hash
+from coretp.plans.test_plan_registry import get_plan, stream_plan, list_plans, query_plans, build_plans, set_plan_cache, plan_source_key
 
 
 class ExportFormat(Enum):
     PDF = "pdf"
     XLS = "xls"
+    JSONL = "jsonl"
+    COLUMNS = "columns"
 
 
 class Exporter:
@@ -23,23 +27,41 @@ class Exporter:
     FORMATTERS: dict[ExportFormat, Type[Formatter]] = {
         ExportFormat.PDF: PdfFormatter,
         ExportFormat.XLS: XlsFormatter,
+        ExportFormat.JSONL: JsonlFormatter,
+        ExportFormat.COLUMNS: ColumnarFormatter,
     }
 
     def __init__(
         self,
         output: Path,
         format: ExportFormat,
+        jobs: int = 1,
+        cache_dir: Optional[Path] = None,
+        incremental: bool = False,
         **subtool_args: dict[str, Any],
     ):
         self.output = output
         self.format = format
+        self.jobs = jobs
+        self.incremental = incremental
+        if cache_dir is not None:
+            set_plan_cache(cache_dir)
 
-        self.formatter: Formatter = self.FORMATTERS[format](output_directory=output, **subtool_args)
+        self.formatter: Formatter = self.FORMATTERS[format](output_directory=output, jobs=jobs, **subtool_args)
 
     # CLI methods
     @classmethod
     def add_arguments(cls, parser: argparse.ArgumentParser):
         parser.add_argument("--output", "-o", type=Path, default=Path("."), help="Output directory. Defaults to current directory")
+        parser.add_argument("--cache-dir", type=Path, default=None, help="Directory to cache built test plans in. Defaults to $CORETP_PLAN_CACHE, if set")
+        parser.add_argument(
+            "--jobs", "-j", type=int, default=1, help="Number of processes used to build test plans, and to render the sheets of xls --write-only exports. Defaults to 1 (serial build)"
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Keep a manifest of exported content next to the output. Skip the export if no plan sources changed, and only rewrite changed plans otherwise",
+        )
         subparser = parser.add_subparsers(dest="format", required=True)
 
         for formatter, formatter_class in cls.FORMATTERS.items():
@@ -68,18 +90,96 @@ class Exporter:
         print(f"Output directory: {self.output}")
         print(f"Format: {self.format}")
 
-        test_plans = [get_plan(plan_name) for plan_name in list_plans()]
+        if self.incremental and self.formatter.streaming:
+            print(f"Incremental export isn't supported for {self.format.value}, exporting everything")
+            self.incremental = False
+        manifest_path = ExportManifest.path_for(self.formatter.output_file)
+        previous = ExportManifest.read(manifest_path) if self.incremental else None
+        source_keys = {plan_name: plan_source_key(plan_name) for plan_name in list_plans()} if self.incremental else {}
+        if previous is not None and self.up_to_date(previous, source_keys):
+            print(f"Export up to date: {self.formatter.output_file}")
+            return
+
+        if self.formatter.streaming:
+            # Scenarios are built as the formatter writes them
+            test_plans = [stream_plan(plan_name) for plan_name in list_plans()]
+        elif self.jobs > 1:
+            test_plans = self.build_parallel()
+        else:
+            test_plans = [get_plan(plan_name) for plan_name in list_plans()]
 
         for test_plan in test_plans:
             self.formatter.add_test_plan(test_plan)
         print(f"Exporting {len(test_plans)} test plans...")
         # Generate the output
         if self.formatter.test_plans:
-            output_path = self.formatter.build()
+            if self.incremental:
+                output_path = self.export_incremental(previous, source_keys, manifest_path)
+            else:
+                output_path = self.formatter.build()
             print(f"Export completed: {output_path}")
         else:
             print("No test plans were successfully loaded.")
 
+    def up_to_date(self, previous: ExportManifest, source_keys: dict[str, str]) -> bool:
+        """
+        Whether the output of ``previous`` is current, without building any plan: same options, same plan sources and an unmodified output file
+        """
+        output_path = self.formatter.output_file
+        return previous.options == self.formatter.export_options() and previous.source_keys() == list(source_keys.items()) and output_path.exists() and file_hash(output_path) == previous.output_hash
+
+    def export_incremental(self, previous: Optional[ExportManifest], source_keys: dict[str, str], manifest_path: Path) -> Path:
+        """
+        Compare the content of the built plans with the previous export, and only rewrite the output of plans that changed.
+        The whole output is rebuilt if there is no usable previous export, or plans were added, removed or reordered.
+        """
+        output_path = self.formatter.output_file
+        plans = [PlanEntry.from_plan(test_plan, source_keys[test_plan.name], self.formatter.summaries) for test_plan in self.formatter.test_plans]
+        options = self.formatter.export_options()
+
+        if previous is None or previous.options != options or not output_path.exists() or file_hash(output_path) != previous.output_hash:
+            print("No previous export with the same options to update, exporting everything")
+            output_path = self.formatter.build()
+        else:
+            changed = []
+            for i, plan in enumerate(plans):
+                previous_plan = previous.plan(plan.name)
+                if previous_plan is None or previous_plan.hash != plan.hash:
+                    changed.append(i)
+                    print(f"  changed: {plan.name} ({plan.describe_changes(previous_plan)})")
+            exported = {plan.name for plan in plans}
+            removed = [plan.name for plan in previous.plans if plan.name not in exported]
+            for name in removed:
+                print(f"  removed: {name}")
+
+            if not changed and not removed:
+                print("Exported content is unchanged, keeping the previous output")
+            elif [plan.name for plan in previous.plans] == [plan.name for plan in plans]:
+                print(f"Updating {len(changed)} of {len(plans)} test plans")
+                output_path = self.formatter.update(changed)
+            else:
+                print("Test plans were added, removed or reordered, exporting everything")
+                output_path = self.formatter.build()
+
+        ExportManifest(options=options, output_hash=file_hash(output_path), plans=plans).write(manifest_path)
+        return output_path
+
+    def build_parallel(self) -> list[TestPlan]:
+        """
+        Build all test plans across ``jobs`` processes. Scenarios that fail to build are reported and left out of the export.
+        """
+        print(f"Building test plans with {self.jobs} processes")
+        test_plans = []
+        for name, report in build_plans(list_plans(), jobs=self.jobs).items():
+            slowest = max(report.results, key=lambda r: r.duration, default=None)
+            slowest_str = f", slowest {slowest.function} {slowest.duration:.2f}s" if slowest is not None else ""
+            print(f"  {name}: {len(report.results)} scenarios in {report.duration:.2f}s{slowest_str}")
+            for failure in report.failures:
+                print(f"  {name}: failed to build {failure.function}\n{failure.error}")
+            if report.plan is not None:
+                test_plans.append(report.plan)
+        return test_plans
+
 
 if __name__ == "__main__":
     Exporter.run_cli()
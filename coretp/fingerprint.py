@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Any, Sequence
+
+from .env import TestEnvCfg
+from .step_ir import StepIR, StepIRTable, StepIRList, INPUT_REF, INPUT_INT, value_fields
+
+"""
+Content-addressed scenario fingerprints.
+
+A fingerprint is a 128-bit BLAKE2b digest, as 32 hex digits, of a canonical encoding of a scenario's ``StepIR`` graph and ``TestEnvCfg``.
+Scenarios with the same steps and environment have the same fingerprint, whatever their name, id and description.
+
+Each ``StepIR`` row is encoded as its parent row, step class name, non-dependency field values (``op``, ``imm``, ...) and inputs,
+with references to other steps as row numbers. Rows are in pre-order, so step ids don't matter.
+``TestEnvCfg`` list fields are sets of allowed values and are encoded sorted.
+"""
+
+FINGERPRINT_BITS = 128
+
+# Types whose repr is already canonical
+_PRIMITIVE_TYPES = frozenset((type(None), bool, int, float, str, bytes))
+
+
+def canonical_value(value: Any) -> Any:
+    """
+    Value as nested tuples of primitives whose ``repr`` is stable across runs. Enums are encoded by class and member name,
+    dataclasses (steps the graph doesn't reference, e.g. a ``Memory`` missing from the steps list) by class name and fields
+    """
+    if type(value) in _PRIMITIVE_TYPES:
+        return value
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if isinstance(value, (list, tuple)):
+        return tuple(canonical_value(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return ("set", *sorted((canonical_value(v) for v in value), key=repr))
+    if isinstance(value, dict):
+        return ("dict", *sorted(((canonical_value(k), canonical_value(v)) for k, v in value.items()), key=repr))
+    if is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__name__, *(canonical_value(getattr(value, f.name)) for f in fields(value)))
+    return repr(value)
+
+
+def env_canonical(env: TestEnvCfg) -> tuple:
+    "Canonical encoding of a ``TestEnvCfg``, list fields sorted"
+    encoded = []
+    for f in fields(env):
+        value = getattr(env, f.name)
+        encoded.append((f.name, tuple(sorted(canonical_value(value), key=repr)) if isinstance(value, list) else canonical_value(value)))
+    return tuple(encoded)
+
+
+def scenario_fingerprint(steps: Sequence[StepIR], env: TestEnvCfg) -> str:
+    """
+    Fingerprint of a scenario's steps and environment, see module docs
+
+    :param steps: ``StepIR`` of the scenario, a ``StepIRList`` is read from its table
+    """
+    table = steps.table if isinstance(steps, StepIRList) else StepIRTable.from_step_ir(list(steps))
+    offsets, kinds, values = table.input_offsets, table.input_kinds, table.input_values
+    digest = hashlib.blake2b(digest_size=FINGERPRINT_BITS // 8)
+    digest.update(repr(env_canonical(env)).encode())
+    encoded_types = {i: step_type.__name__ for i, step_type in enumerate(table.types)}
+    for row in range(len(table)):
+        step = table.steps[row]
+        inputs = []
+        for i in range(offsets[row], offsets[row + 1]):
+            kind = kinds[i]
+            if kind == INPUT_REF or kind == INPUT_INT:
+                inputs.append((kind, values[i]))
+            else:
+                inputs.append((kind, canonical_value(table.input_objects[values[i]])))
+        fields_value = value_fields(type(step))(step) if step is not None else ()
+        if not _PRIMITIVE_TYPES.issuperset(map(type, fields_value)):
+            fields_value = canonical_value(fields_value)
+        record = (table.parent[row], encoded_types[table.type_index[row]], fields_value, tuple(inputs))
+        digest.update(b"\n")
+        digest.update(repr(record).encode())
+    return digest.hexdigest()
@@ -2,8 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from .arch import RvArch, BaseArch, Extension
-from .instruction import Instruction, Label
-from .catalog import InstructionCatalog
+from .instruction import Instruction, InstructionView, Label
+from .catalog import InstructionCatalog, ImpliedExtension, explain_implied_extensions
 from .registers import Register, RISCV_REGISTERS, get_register
 from .operands import Operand, OperandSlot
 
@@ -12,8 +12,11 @@ __all__ = [
     "BaseArch",
     "Extension",
     "Instruction",
+    "InstructionView",
     "Label",
     "InstructionCatalog",
+    "ImpliedExtension",
+    "explain_implied_extensions",
     "Register",
     "RISCV_REGISTERS",
     "get_register",
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from coretp.rv_enums import BaseArch, Extension, Xlen
+from coretp.rv_enums.arch import mask_bits
 
 """
 This Module to provide an enumerated list of valid ISA extensions supported by GCC.
@@ -9,6 +10,19 @@ This Module to provide an enumerated list of valid ISA extensions supported by G
 This file contains a list of march string names for GCC, taken from: https://gcc.gnu.org/onlinedocs/gcc/RISC-V-Options.html
 """
 
+# Lowercase extension names by bit, in ``Extension`` declaration order
+_EXTENSION_NAMES = {e.value: e.name.lower() for e in Extension}
+
+# Extensions the G shorthand stands for
+G_EXTENSIONS = Extension.I | Extension.M | Extension.A | Extension.F | Extension.D | Extension.ZICSR | Extension.ZIFENCEI
+
+
+def _expand_g(mask: int) -> int:
+    "Replace the G bit of an extension mask with the extensions it stands for"
+    if mask & Extension.G.value:
+        mask = (mask & ~Extension.G.value) | G_EXTENSIONS.value
+    return mask
+
 
 class RvArch:
     """
@@ -29,16 +43,21 @@ class RvArch:
         return self.base_arch == other.base_arch and self.extensions == other.extensions
 
     def __str__(self) -> str:
-        ext = [e.name.lower() for e in Extension if self.extensions & e and e.name is not None]
+        """
+        ISA string that ``from_str`` parses back to the same extensions. G is written out as ``imafd_zicsr_zifencei``
+        """
+        base_arch = self.base_arch.value
+        ext = [_EXTENSION_NAMES[bit] for bit in mask_bits(_expand_g(self.extensions.value))]
         single_letter_extensions = ""
         multi_letter_extensions = []
         for e in ext:
             if len(e) == 1:
-                single_letter_extensions += e
+                if e != base_arch[-1]:  # base extension is already part of base_arch
+                    single_letter_extensions += e
             else:
                 multi_letter_extensions.append(e)
 
-        isa_str = f"{self.base_arch}{single_letter_extensions}"
+        isa_str = f"{base_arch}{single_letter_extensions}"
         if multi_letter_extensions:
             isa_str += "_" + "_".join(multi_letter_extensions)
         return isa_str
@@ -67,6 +86,8 @@ class RvArch:
         - Single-letter extensions can appear consecutively, but multi-letter extensions must be separated by underscores.
 
         An underscore can appear anywhere after the base ISA. It has no specific effect but is used to improve readability and can act as a separator.
+
+        G is expanded to the extensions it stands for (``G_EXTENSIONS``), so ``rv64gc`` and ``rv64imafdc_zicsr_zifencei`` parse to the same ``RvArch``.
         """
 
         base_arch_str = ""
@@ -82,7 +103,11 @@ class RvArch:
 
         base_extension_str = base_arch_str + extension_strings[0]
         extra_extensions = extension_strings[0:]
-        base_arch = BaseArch(base_extension_str)
+        if extension_strings[0] == "g":
+            # G is shorthand for IMAFD_Zicsr_Zifencei, base ISA is still I
+            base_arch = BaseArch(base_arch_str + "i")
+        else:
+            base_arch = BaseArch(base_extension_str)
         if extra_extensions:
             if "_" in extra_extensions:
                 extra_extensions_strs = extra_extensions.split("_")
@@ -101,7 +126,7 @@ class RvArch:
 
             else:
                 all_extensions = list(extra_extensions)
-            extensions = Extension.from_list(all_extensions)
+            extensions = Extension.from_mask(_expand_g(Extension.from_list(all_extensions).value))
         else:
             if base_extension_str.endswith("e"):
                 extensions = Extension.E
@@ -1,17 +1,20 @@
 # SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
 # SPDX-License-Identifier: Apache-2.0
 
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Union
 
-from coretp.rv_enums import Extension, Category, OperandType, Xlen
-from coretp.isa.arch import RvArch
+from coretp.rv_enums import BaseArch, Extension, Category, OperandType, Xlen
+from coretp.rv_enums.arch import mask_bits
+from coretp.isa.arch import RvArch, G_EXTENSIONS
 from coretp.isa.operands import Operand, operand_is_register
-from .instruction import Instruction, InstructionDef
-from .instructions import ALL_INSTRS
+from .instruction import Instruction, InstructionDef, InstructionView
+from .index import InstructionIndex, default_index
 
-# extensions implied by other extension.
+# extensions implied by other extension. Transitive implications are resolved once at import, see ``expand_implied_extensions``
 IMPLIED_EXTENSIONS = {
-    Extension.G: Extension.I | Extension.M | Extension.A | Extension.F | Extension.D | Extension.ZICSR | Extension.ZIFENCEI,
+    Extension.G: G_EXTENSIONS,
     Extension.ZKT: Extension.ZKR | Extension.ZKN | Extension.ZKS,
     Extension.ZK: Extension.ZKR | Extension.ZKN | Extension.ZKS,
     Extension.ZKN: Extension.ZBKB | Extension.ZBKC | Extension.ZBKX | Extension.ZKNE | Extension.ZKND | Extension.ZKNH,
@@ -23,42 +26,169 @@ IMPLIED_EXTENSIONS = {
 }
 
 
+def _implied_paths(implied: dict[Extension, Extension]) -> dict[int, dict[int, tuple[int, ...]]]:
+    """
+    Transitive closure of ``implied``. For every extension bit that implies others, maps each reachable bit to the shortest chain of bits
+    that implies it, starting from the implying bit and ending with the implied bit.
+    """
+    direct = {k.value: mask_bits(v.value) for k, v in implied.items()}
+    paths: dict[int, dict[int, tuple[int, ...]]] = {}
+    for root in direct:
+        reached = {root: (root,)}
+        frontier = [root]
+        while frontier:
+            next_frontier = []
+            for bit in frontier:
+                for implied_bit in direct.get(bit, []):
+                    if implied_bit not in reached:
+                        reached[implied_bit] = reached[bit] + (implied_bit,)
+                        next_frontier.append(implied_bit)
+            frontier = next_frontier
+        del reached[root]
+        paths[root] = reached
+    return paths
+
+
+# Precomputed at import time: closure paths, and per-bit closure masks so expansion is a single pass of ORs
+_IMPLIED_PATHS = _implied_paths(IMPLIED_EXTENSIONS)
+_IMPLIED_CLOSURE = {root: sum(reached) for root, reached in _IMPLIED_PATHS.items()}
+
+
+def expand_implied_mask(mask: int) -> int:
+    """
+    ``expand_implied_extensions`` on an integer extension mask
+    """
+    expanded = mask
+    for bit in mask_bits(mask):
+        expanded |= _IMPLIED_CLOSURE.get(bit, 0)
+    return expanded
+
+
 def expand_implied_extensions(mask: Extension) -> Extension:
-    changed = True
-    while changed:
-        changed = False
-        for k, v in IMPLIED_EXTENSIONS.items():
-            if mask & k and not mask & v:
-                mask |= v
-                changed = True
-    return mask
+    """
+    Add every extension transitively implied by ``mask`` (see ``IMPLIED_EXTENSIONS``), e.g. ``ZK`` adds ``ZKN``, which adds ``ZBKB``.
+    """
+    return Extension.from_mask(expand_implied_mask(mask.value))
+
+
+@dataclass(frozen=True)
+class ImpliedExtension:
+    """
+    Extension added by ``expand_implied_extensions``, and the chain of implications that added it.
+
+    :param extension: implied extension that was added
+    :param chain: extensions from the requested extension to ``extension``, e.g. ``(ZK, ZKN, ZBKB)``
+    """
+
+    extension: Extension
+    chain: tuple[Extension, ...]
+
+    @property
+    def implied_by(self) -> Extension:
+        """Requested extension that started the chain"""
+        return self.chain[0]
+
+    def __str__(self) -> str:
+        return " -> ".join(e.name.lower() for e in self.chain)
+
+
+def explain_implied_extensions(isa: Union[str, RvArch]) -> list[ImpliedExtension]:
+    """
+    List the extensions that ``expand_implied_extensions`` adds to an ISA, and why.
+
+    Extensions already present in ``isa`` are not listed. Each added extension is reported once, with the shortest chain that implies it.
+    Ties go to the requested extension declared first in ``Extension``.
+
+    .. code-block:: python
+
+        for implied in explain_implied_extensions("rv64i_zk"):
+            print(implied)  # e.g. "zk -> zkn -> zbkb"
+
+    :param isa: ISA string (e.g. ``rv64gc_zk``) or ``RvArch``
+    """
+    requested = (RvArch.from_str(isa) if isinstance(isa, str) else isa).extensions.value
+    added: dict[int, tuple[int, ...]] = {}
+    for root in mask_bits(requested):
+        for bit, chain in _IMPLIED_PATHS.get(root, {}).items():
+            if not bit & requested and (bit not in added or len(chain) < len(added[bit])):
+                added[bit] = chain
+    return [ImpliedExtension(extension=Extension.from_mask(bit), chain=tuple(Extension.from_mask(b) for b in chain)) for bit, chain in sorted(added.items())]
+
+
+# Number of distinct (base arch, extensions) catalogs kept by ``InstructionCatalog.for_isa``
+CATALOG_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=256)
+def _canonical_isa(isa_str: str) -> tuple[BaseArch, Extension]:
+    "Parse an ISA string once. Spellings that expand to the same extensions (e.g. rv64imac and rv64iamc) map to the same key"
+    arch = RvArch.from_str(isa_str)
+    return arch.base_arch, expand_implied_extensions(arch.extensions)
 
 
 class InstructionCatalog:
     """
     A queryable catalog of all supported RISC-V instructions.
+
+    Queries are answered from an ``InstructionIndex``, so construction and ``filter()`` are set operations over instruction positions.
+
+    :param isa: ISA string (e.g. ``rv64imafdc_zicsr``) or ``RvArch``
+    :param index: Optional index to query. Defaults to the process-wide index over all supported instructions
     """
 
-    def __init__(self, isa: Union[str, RvArch]):
-        self._instructions: list[InstructionDef] = ALL_INSTRS
+    def __init__(self, isa: Union[str, RvArch], index: Optional[InstructionIndex] = None):
+        self._index = index if index is not None else default_index()
         if isinstance(isa, str):
-            self.isa = RvArch.from_str(isa)
-        else:
-            self.isa = isa
-        self.isa.extensions = expand_implied_extensions(self.isa.extensions)
-
-        def matching_instr(i: InstructionDef) -> bool:
-            # Both 'i.extension' and 'self.isa.extensions' are flag masks of the flag enum 'Extension'
-            # The '&' operator works like a bitwise AND for flags, used since we want to keep any
-            # instruction where these masks intersect, which denotes at least one extension the
-            # instruction belongs to is in the isa's used extensions (using 'in' would require all
-            # extensions the instruction belongs to)
-            # 'Extension(0)' is the empty mask for this flag enum, NOT the same as 0 or None
-            return i.xlen.compatible_with(self.isa.xlen) and (i.extension & ~self.isa.extensions) == Extension(0)  # every bit in required is present in provided
-
-        self._instructions = [i for i in self._instructions if matching_instr(i)]
+            isa = RvArch.from_str(isa)
+        # Copy rather than expand the caller's RvArch in place
+        self._base_arch = isa.base_arch
+        self._extensions = expand_implied_extensions(isa.extensions)
+        self._index.require(self._extensions)
+
+        # Keep every instruction where each extension it belongs to is in the isa's used extensions
+        # and the instruction's xlen is compatible with the isa's xlen
+        self._positions = self._index.extensions_within(self._extensions) & self._index.xlen_compatible(RvArch.base_arch_to_xlen(self._base_arch))
+        self._instructions: tuple[InstructionDef, ...] = tuple(self._index.lookup(self._positions))
         self._instruction_lookup = {i.name: i for i in self._instructions}
 
+    @property
+    def isa(self) -> RvArch:
+        """
+        ISA of the catalog, with implied extensions expanded. Returns a new ``RvArch`` each time, so changing it doesn't change the catalog
+        """
+        return RvArch(base_arch=self._base_arch, extensions=self._extensions)
+
+    @classmethod
+    def for_isa(cls, isa: Union[str, RvArch]) -> "InstructionCatalog":
+        """
+        Get a shared catalog for ``isa`` from a process-wide LRU cache.
+
+        Catalogs are keyed by base arch plus the expanded extension mask, so equivalent ISA strings share one catalog.
+        The returned catalog is shared between callers. Its ``isa`` is a copy, and ``filter()`` and ``get_instruction()`` return new ``Instruction`` objects, so callers can't change it for each other.
+
+        :param isa: ISA string or ``RvArch``
+        """
+        if isinstance(isa, str):
+            base_arch, extensions = _canonical_isa(isa)
+        else:
+            base_arch, extensions = isa.base_arch, expand_implied_extensions(isa.extensions)
+        return _cached_catalog(base_arch, extensions)
+
+    @staticmethod
+    def cache_info():
+        """
+        Hit / miss statistics for catalogs handed out by ``for_isa``. Returns a ``functools`` ``CacheInfo`` named tuple (hits, misses, maxsize, currsize)
+        """
+        return _cached_catalog.cache_info()
+
+    @staticmethod
+    def cache_clear():
+        """
+        Drop all catalogs cached by ``for_isa`` and reset statistics
+        """
+        _cached_catalog.cache_clear()
+        _canonical_isa.cache_clear()
+
     def __iter__(self):
         return iter(self._instructions)
 
@@ -76,7 +206,8 @@ class InstructionCatalog:
         source_type: Optional[OperandType] = None,
         exclude_extensions: Optional[Extension] = None,
         xlen: Optional[Xlen] = None,
-    ) -> list[Instruction]:
+        lazy: bool = False,
+    ) -> Union[list[Instruction], list[InstructionView]]:
         """
         filter list of instructions by extension, category,
 
@@ -88,31 +219,36 @@ class InstructionCatalog:
         :param destination_type: Type of destination operand supported. E.g. OperandType.FPR
         :param source_type: Type of source operand supported. E.g. OperandType.FPR
         :param exclude_extensions: Extensions to exclude
+        :param xlen: Only include instructions defined for exactly this xlen
+        :param lazy: Return read-only ``InstructionView`` objects instead of ``Instruction``. ``Instruction`` objects are only built when a view's operands are accessed.
         """
-        predicates = []
+        positions = self._positions
 
         if extension is not None:
-            predicates.append(lambda i: i.extension in extension)
+            positions = positions & self._index.extensions_within(extension)
         if category is not None:
-            predicates.append(lambda i: i.category & category == i.category)
+            positions = positions & self._index.categories_within(category)
         if has_destination is not None:
-            predicates.append(lambda i: (i.destination is not None) == has_destination)
+            positions = positions & self._index.has_destination(has_destination)
         if source_reg_count is not None:
-            predicates.append(lambda i: source_reg_count <= len([s for s in i.source if operand_is_register(s)]))
+            positions = positions & self._index.min_source_reg_count(source_reg_count)
         if has_immediate is not None:
-            predicates.append(lambda i: has_immediate == (any(s.type == OperandType.IMM for s in i.source)))
+            positions = positions & self._index.has_immediate(has_immediate)
         if destination_type is not None:
-            predicates.append(lambda i: i.destination is not None and i.destination.type == destination_type)
+            positions = positions & self._index.destination_type(destination_type)
         if source_type is not None:
-            predicates.append(lambda i: any(s.type == source_type for s in i.source))
+            positions = positions & self._index.source_type(source_type)
         if exclude_extensions is not None:
-            predicates.append(lambda i: not (i.extension & exclude_extensions))
+            positions = positions - self._index.extensions_any(exclude_extensions)
         if xlen is not None:
-            predicates.append(lambda i: i.xlen == xlen)
-        if not predicates:
+            positions = positions & self._index.xlen_equal(xlen)
+
+        if positions is self._positions:
             instruction_defintions = self._instructions
         else:
-            instruction_defintions = [i for i in self._instructions if all(p(i) for p in predicates)]
+            instruction_defintions = self._index.lookup(positions)
+        if lazy:
+            return [InstructionView(i) for i in instruction_defintions]
         return [InstructionDef.build(i) for i in instruction_defintions]
 
     def get_instruction(self, name: str) -> Instruction:
@@ -122,3 +258,8 @@ class InstructionCatalog:
         if name not in self._instruction_lookup:
             raise KeyError(f"Instruction {name} not found in catalog")
         return self._instruction_lookup[name].build()
+
+
+@lru_cache(maxsize=CATALOG_CACHE_SIZE)
+def _cached_catalog(base_arch: BaseArch, extensions: Extension) -> InstructionCatalog:
+    return InstructionCatalog(RvArch(base_arch=base_arch, extensions=extensions))
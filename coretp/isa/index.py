@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+
+from coretp.rv_enums import Extension, Category, OperandType, Xlen
+from coretp.rv_enums.arch import mask_bits
+from coretp.isa.operands import operand_is_register
+from .instruction import InstructionDef
+from .instructions import instruction_group_names, instruction_groups_for, load_instruction_group
+
+"""
+Inverted index over ``InstructionDef`` objects.
+
+Instructions are referred to by their position in the indexed list. Every lookup returns a set of positions, so catalog
+construction and ``InstructionCatalog.filter()`` reduce to set unions and intersections instead of rescanning the full instruction list.
+"""
+
+# Position stride between instruction groups in the default index. Keeps positions, and so catalog order, independent of group load order
+_GROUP_STRIDE = 1 << 16
+
+
+class InstructionIndex:
+    """
+    Index of instruction positions keyed by extension bit, category bit, xlen and operand shape.
+
+    Extension and category keys are integer bits (see ``InstructionDef.extension_mask``), so lookups never build ``Flag`` objects.
+
+    :param instructions: instruction definitions to index. Positions are indices into this list and preserve its order. More can be added with ``extend``
+    """
+
+    def __init__(self, instructions: Iterable[InstructionDef] = ()):
+        self.instructions: dict[int, InstructionDef] = {}
+        self.all: frozenset[int] = frozenset()
+
+        self.by_extension: dict[int, set[int]] = defaultdict(set)
+        self.by_category: dict[int, set[int]] = defaultdict(set)
+        self.by_xlen: dict[Xlen, set[int]] = defaultdict(set)
+        self.by_destination_type: dict[Optional[OperandType], set[int]] = defaultdict(set)  # None key holds instructions without a destination
+        self.by_source_type: dict[OperandType, set[int]] = defaultdict(set)
+        self.by_source_reg_count: dict[int, set[int]] = defaultdict(set)
+        self.with_immediate: set[int] = set()
+        self.extend(instructions)
+
+    def extend(self, instructions: Iterable[InstructionDef], start: Optional[int] = None):
+        """
+        Add instructions to the index.
+
+        :param instructions: instruction definitions to add, in order
+        :param start: position of the first instruction. Defaults to after the last indexed position
+        """
+        if start is None:
+            start = max(self.instructions, default=-1) + 1
+        added = dict(enumerate(instructions, start))
+        if added.keys() & self.instructions.keys():
+            raise ValueError(f"Positions starting at {start} are already indexed")
+        self.instructions.update(added)
+        self.all = self.all.union(added)
+
+        for pos, instr in added.items():
+            for bit in mask_bits(instr.extension_mask):
+                self.by_extension[bit].add(pos)
+            for bit in mask_bits(instr.category_mask):
+                self.by_category[bit].add(pos)
+            self.by_xlen[instr.xlen].add(pos)
+            self.by_destination_type[instr.destination.type if instr.destination is not None else None].add(pos)
+            for src_type in {s.type for s in instr.source}:
+                self.by_source_type[src_type].add(pos)
+            self.by_source_reg_count[sum(1 for s in instr.source if operand_is_register(s))].add(pos)
+            if any(s.type == OperandType.IMM for s in instr.source):
+                self.with_immediate.add(pos)
+
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+    @staticmethod
+    def _subset_of(mask: int, table: dict[int, set[int]], universe: frozenset[int]) -> frozenset[int]:
+        "Positions whose flags are all contained in ``mask``, i.e. not indexed under any bit missing from ``mask``"
+        excluded: set[int] = set()
+        for bit, positions in table.items():
+            if not bit & mask:
+                excluded |= positions
+        return universe - excluded
+
+    def extensions_within(self, extensions: Union[Extension, int]) -> frozenset[int]:
+        """
+        Positions of instructions whose extensions are all contained in ``extensions``
+        """
+        return self._subset_of(Extension.to_mask(extensions), self.by_extension, self.all)
+
+    def extensions_any(self, extensions: Union[Extension, int]) -> frozenset[int]:
+        """
+        Positions of instructions that belong to at least one of ``extensions``
+        """
+        matched: set[int] = set()
+        for bit in mask_bits(Extension.to_mask(extensions)):
+            matched |= self.by_extension.get(bit, set())
+        return frozenset(matched)
+
+    def categories_within(self, category: Union[Category, int]) -> frozenset[int]:
+        """
+        Positions of instructions whose categories are all contained in ``category``
+        """
+        return self._subset_of(category if isinstance(category, int) else category.value, self.by_category, self.all)
+
+    def xlen_compatible(self, isa_xlen: Xlen) -> frozenset[int]:
+        """
+        Positions of instructions that can run on an ISA with ``isa_xlen``
+        """
+        matched: set[int] = set()
+        for xlen, positions in self.by_xlen.items():
+            if xlen.compatible_with(isa_xlen):
+                matched |= positions
+        return frozenset(matched)
+
+    def xlen_equal(self, xlen: Xlen) -> frozenset[int]:
+        """
+        Positions of instructions defined for exactly ``xlen``
+        """
+        return frozenset(self.by_xlen.get(xlen, set()))
+
+    def has_destination(self, has_destination: bool) -> frozenset[int]:
+        """
+        Positions of instructions with (or without) a destination operand
+        """
+        without = frozenset(self.by_destination_type.get(None, set()))
+        return self.all - without if has_destination else without
+
+    def destination_type(self, operand_type: OperandType) -> frozenset[int]:
+        """
+        Positions of instructions whose destination is of ``operand_type``
+        """
+        return frozenset(self.by_destination_type.get(operand_type, set()))
+
+    def source_type(self, operand_type: OperandType) -> frozenset[int]:
+        """
+        Positions of instructions with at least one source of ``operand_type``
+        """
+        return frozenset(self.by_source_type.get(operand_type, set()))
+
+    def min_source_reg_count(self, count: int) -> frozenset[int]:
+        """
+        Positions of instructions with at least ``count`` register source operands
+        """
+        matched: set[int] = set()
+        for reg_count, positions in self.by_source_reg_count.items():
+            if reg_count >= count:
+                matched |= positions
+        return frozenset(matched)
+
+    def has_immediate(self, has_immediate: bool) -> frozenset[int]:
+        """
+        Positions of instructions with (or without) an immediate source operand
+        """
+        with_immediate = frozenset(self.with_immediate)
+        return with_immediate if has_immediate else self.all - with_immediate
+
+    def lookup(self, positions: Iterable[int]) -> list[InstructionDef]:
+        """
+        Get instruction definitions for ``positions``, in indexed order
+        """
+        return [self.instructions[pos] for pos in sorted(positions)]
+
+    def require(self, extensions: Union[Extension, int]):
+        """
+        Hook to make sure instructions for ``extensions`` are indexed before querying them. All instructions are indexed up front by default.
+        """
+
+
+class GroupedInstructionIndex(InstructionIndex):
+    """
+    Index that loads instruction groups on demand (see ``INSTRUCTION_GROUPS`` and ``instruction_database``).
+
+    Groups are indexed at fixed position offsets, so results are always in ``ALL_INSTRS`` order regardless of which groups were loaded first.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.loaded_groups: set[str] = set()
+
+    def require(self, extensions: Union[Extension, int]):
+        for name in instruction_groups_for(extensions):
+            self.load_group(name)
+
+    def load_group(self, name: str):
+        """
+        Import and index a single instruction group
+        """
+        if name not in self.loaded_groups:
+            offset = instruction_group_names().index(name) * _GROUP_STRIDE
+            self.extend(load_instruction_group(name), start=offset)
+            self.loaded_groups.add(name)
+
+
+@lru_cache(maxsize=1)
+def default_index() -> GroupedInstructionIndex:
+    """
+    Process-wide index over supported instructions. Instruction groups are loaded as catalogs request their extensions.
+    """
+    return GroupedInstructionIndex()
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from dataclasses import dataclass, field
-from typing import Optional, Any
+from typing import Optional, Any, Sequence, Union
 
 from coretp.rv_enums import Extension, Xlen, Category, OperandType
 from coretp.isa.operands import Operand, OperandSlot
@@ -159,6 +159,13 @@ class InstructionDef:
     source: list[OperandSlot]
     formatter: str = ""
     clobbers: list[str] = field(default_factory=list)
+    # Integer bit masks of ``extension`` and ``category``, precomputed for set algebra in hot paths
+    extension_mask: int = field(init=False, repr=False, compare=False)
+    category_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "extension_mask", self.extension.value)
+        object.__setattr__(self, "category_mask", self.category.value)
 
     def build(self) -> Instruction:
         """
@@ -176,3 +183,96 @@ class InstructionDef:
             formatter=self.formatter,
             clobbers=self.clobbers,
         )
+
+
+class InstructionView:
+    """
+    Lightweight read-only view over an ``InstructionDef``.
+
+    Reading ``name``, ``extension``, ``category`` etc. doesn't allocate. The mutable ``Instruction`` is only built (copy-on-write) when operands are accessed
+    through ``instruction`` or one of the operand getters, e.g. to assign operand values. Until then ``destination`` and ``source`` are the frozen ``OperandSlot`` templates,
+    with ``source`` and ``clobbers`` as tuples so the shared definition can't be changed through a view.
+
+    :param definition: ``InstructionDef`` this view reads from
+    """
+
+    __slots__ = ("definition", "_instruction")
+
+    def __init__(self, definition: InstructionDef):
+        self.definition = definition
+        self._instruction: Optional[Instruction] = None
+
+    def __repr__(self) -> str:
+        if self._instruction is not None:
+            return repr(self._instruction)
+        return f"{self.name} (view), (dest=({self.destination}), src={self.source})"
+
+    @property
+    def is_materialized(self) -> bool:
+        """True if the backing ``Instruction`` has been built"""
+        return self._instruction is not None
+
+    @property
+    def instruction(self) -> Instruction:
+        """
+        Mutable ``Instruction`` for this view. Built on first access and reused afterwards
+        """
+        if self._instruction is None:
+            self._instruction = self.definition.build()
+        return self._instruction
+
+    # Read-only attributes, served from the materialized Instruction once it exists
+    @property
+    def name(self) -> str:
+        return self._instruction.name if self._instruction is not None else self.definition.name
+
+    @property
+    def extension(self) -> Extension:
+        return self._instruction.extension if self._instruction is not None else self.definition.extension
+
+    @property
+    def xlen(self) -> Xlen:
+        return self._instruction.xlen if self._instruction is not None else self.definition.xlen
+
+    @property
+    def category(self) -> Category:
+        return self._instruction.category if self._instruction is not None else self.definition.category
+
+    @property
+    def formatter(self) -> str:
+        return self._instruction.formatter if self._instruction is not None else self.definition.formatter
+
+    @property
+    def clobbers(self) -> Sequence[str]:
+        return self._instruction.clobbers if self._instruction is not None else tuple(self.definition.clobbers)
+
+    @property
+    def destination(self) -> Optional[Union[Operand, OperandSlot]]:
+        return self._instruction.destination if self._instruction is not None else self.definition.destination
+
+    @property
+    def source(self) -> Sequence[Union[Operand, OperandSlot]]:
+        # The definition's list is shared by every view and catalog, hand out a tuple until the Instruction has its own list
+        return self._instruction.source if self._instruction is not None else tuple(self.definition.source)
+
+    # Operand getters hand out mutable operands, so they materialize the Instruction
+    def rs1(self) -> Optional[Operand]:
+        return self.instruction.rs1()
+
+    def rs2(self) -> Optional[Operand]:
+        return self.instruction.rs2()
+
+    def get_source(self, name: str) -> Optional[Operand]:
+        return self.instruction.get_source(name)
+
+    def immediate_operand(self) -> Optional[Operand]:
+        return self.instruction.immediate_operand()
+
+    def csr_operand(self) -> Optional[Operand]:
+        return self.instruction.csr_operand()
+
+    def symbol_operand(self) -> Optional[Operand]:
+        return self.instruction.symbol_operand()
+
+    def format(self) -> str:
+        return self.instruction.format()
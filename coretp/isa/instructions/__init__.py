@@ -1,24 +1,219 @@
 # SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
 # SPDX-License-Identifier: Apache-2.0
 
-from .integer import integer_instrs
-from .misc import misc_instrs
-from .atomic import atomic_instrs
-from .crypto import crypto_instrs
-from .bitmanip import bitmanip_instrs
-from .compressed import compressed_instrs
-from .float import float_instrs
-from .hypervisor import hypervisor_instrs
-from .vector import vector_instrs
+import importlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union, TYPE_CHECKING
+
+from coretp.rv_enums import Extension
+from coretp.isa.instruction import InstructionDef
 from .pseudo import LoadImmediate, LoadAddress, pseudo_instrs
 
+if TYPE_CHECKING:
+    from .database import InstructionDatabase
+
 """
 Contains definitions for all supported RISC-V Instructions.
 
 Instructions are frozen dataclass objects used to categorize instructions and their operands.
+
+Definition modules are grouped by extension and imported on demand, so only the groups a catalog's ISA needs are loaded.
+Accessing ``ALL_INSTRS`` loads every group, ``find_instruction`` loads groups in order until one defines the requested name.
+
+Set ``CORETP_INSTRUCTION_DB`` to a database written by ``coretp.isa.instructions.database`` (or ``generate_instructions --database``) to load
+instructions from a single JSON-lines file instead of executing the definition modules.
 """
 
-ALL_INSTRS = integer_instrs + misc_instrs + atomic_instrs + crypto_instrs + bitmanip_instrs + compressed_instrs + float_instrs + hypervisor_instrs + vector_instrs + pseudo_instrs
+
+@dataclass(frozen=True)
+class InstructionGroup:
+    """
+    Instruction definition module that can be loaded on demand.
+
+    :param module: module containing the definitions, relative to this package
+    :param attribute: name of the list of ``InstructionDef`` in ``module``
+    :param extensions: every extension used by instructions in the module. Group is loaded when any of them is requested.
+    """
+
+    module: str
+    attribute: str
+    extensions: Extension
+
+
+# Groups in ALL_INSTRS order. ``extensions`` must cover every extension used in the module, checked when the group is loaded
+INSTRUCTION_GROUPS: dict[str, InstructionGroup] = {
+    "integer": InstructionGroup(".integer", "integer_instrs", Extension.I | Extension.M),
+    "misc": InstructionGroup(
+        ".misc",
+        "misc_instrs",
+        Extension.C
+        | Extension.D
+        | Extension.F
+        | Extension.H
+        | Extension.SMRNMI
+        | Extension.SVINVAL
+        | Extension.ZABHA
+        | Extension.ZACAS
+        | Extension.ZAWRS
+        | Extension.ZCMOP
+        | Extension.ZCMP
+        | Extension.ZCMT
+        | Extension.ZFA
+        | Extension.ZFBFMIN
+        | Extension.ZFH
+        | Extension.ZICBOM
+        | Extension.ZICBOP
+        | Extension.ZICBOZ
+        | Extension.ZICFISS
+        | Extension.ZICOND
+        | Extension.ZICSR
+        | Extension.ZIFENCEI
+        | Extension.ZIMOP
+        | Extension.ZVFBFMIN
+        | Extension.ZVFBFWMA,
+    ),
+    "atomic": InstructionGroup(".atomic", "atomic_instrs", Extension.A),
+    "crypto": InstructionGroup(
+        ".crypto",
+        "crypto_instrs",
+        Extension.ZBB
+        | Extension.ZBKB
+        | Extension.ZBKC
+        | Extension.ZBKX
+        | Extension.ZK
+        | Extension.ZKN
+        | Extension.ZKND
+        | Extension.ZKNE
+        | Extension.ZKNH
+        | Extension.ZKS
+        | Extension.ZKSED
+        | Extension.ZKSH
+        | Extension.ZVBB
+        | Extension.ZVBC
+        | Extension.ZVKN
+        | Extension.ZVKNED
+        | Extension.ZVKNHA
+        | Extension.ZVKNHB
+        | Extension.ZVKS
+        | Extension.ZVKSED
+        | Extension.ZVKSH,
+    ),
+    "bitmanip": InstructionGroup(".bitmanip", "bitmanip_instrs", Extension.ZBA | Extension.ZBB | Extension.ZBC | Extension.ZBS),
+    "compressed": InstructionGroup(".compressed", "compressed_instrs", Extension.C | Extension.ZCB),
+    "float": InstructionGroup(".float", "float_instrs", Extension.D | Extension.F | Extension.ZFH),
+    "hypervisor": InstructionGroup(".hypervisor", "hypervisor_instrs", Extension.H),
+    "vector": InstructionGroup(".vector", "vector_instrs", Extension.V | Extension.ZVKG),
+    "pseudo": InstructionGroup(".pseudo", "pseudo_instrs", Extension.I | Extension.ZICSR),
+}
+
+
+# Environment variable pointing to a database written by ``coretp.isa.instructions.database``. When set, instructions are loaded from it instead of the python modules
+INSTRUCTION_DB_ENV = "CORETP_INSTRUCTION_DB"
+
+_loaded_groups: dict[str, list[InstructionDef]] = {}
+_instructions_by_name: dict[str, InstructionDef] = {}
+_indexed_groups = 0  # number of groups, in ALL_INSTRS order, added to _instructions_by_name
+_database: Optional["InstructionDatabase"] = None
+
+
+def instruction_database() -> Optional["InstructionDatabase"]:
+    """
+    Instruction database named by ``CORETP_INSTRUCTION_DB``, read once on first use. None if the variable isn't set.
+    """
+    global _database
+    path = os.environ.get(INSTRUCTION_DB_ENV)
+    if _database is None and path:
+        from .database import InstructionDatabase
+
+        _database = InstructionDatabase.read(Path(path))
+    return _database
+
+
+def instruction_group_names() -> list[str]:
+    """
+    Names of all instruction groups, in ``ALL_INSTRS`` order
+    """
+    database = instruction_database()
+    if database is not None:
+        return list(database.groups)
+    return list(INSTRUCTION_GROUPS)
+
+
+def load_instruction_group(name: str) -> list[InstructionDef]:
+    """
+    Get the instructions of a group, from the instruction database if one is configured, otherwise by importing the group's definition module.
+    Groups are only loaded once.
+
+    :param name: instruction group name, see ``instruction_group_names``
+    :raises RuntimeError: if the module uses extensions missing from the group's declared ``extensions``
+    """
+    if name not in _loaded_groups:
+        database = instruction_database()
+        if database is not None:
+            _loaded_groups[name] = database.groups[name]
+            return _loaded_groups[name]
+
+        group = INSTRUCTION_GROUPS[name]
+        instrs: list[InstructionDef] = getattr(importlib.import_module(group.module, __name__), group.attribute)
+        undeclared = [i.name for i in instrs if i.extension_mask & ~group.extensions.value]
+        if undeclared:
+            raise RuntimeError(f"Instruction group '{name}' is missing extensions used by {undeclared}. Update INSTRUCTION_GROUPS")
+        _loaded_groups[name] = instrs
+    return _loaded_groups[name]
+
+
+def instruction_groups_for(extensions: Union[Extension, int]) -> list[str]:
+    """
+    Names of instruction groups that can contain instructions for ``extensions``, in ``ALL_INSTRS`` order
+    """
+    mask = Extension.to_mask(extensions)
+    database = instruction_database()
+    if database is not None:
+        return [name for name, group_extensions in database.group_extensions.items() if group_extensions.value & mask]
+    return [name for name, group in INSTRUCTION_GROUPS.items() if group.extensions.value & mask]
+
+
+def find_instruction(name: str) -> Optional[InstructionDef]:
+    """
+    Get the definition of an instruction by name, the first definition in ``ALL_INSTRS`` order. None if no group defines it.
+
+    Groups are loaded in ``ALL_INSTRS`` order only until one defines ``name``, so looking up integer instructions loads a single group.
+    Unknown names load every group.
+    """
+    global _indexed_groups
+    instr = _instructions_by_name.get(name)
+    if instr is not None:
+        return instr
+    group_names = instruction_group_names()
+    while _indexed_groups < len(group_names):
+        for i in load_instruction_group(group_names[_indexed_groups]):
+            _instructions_by_name.setdefault(i.name, i)
+        _indexed_groups += 1
+        if name in _instructions_by_name:
+            return _instructions_by_name[name]
+    return None
+
+
+def __getattr__(name: str):
+    # ALL_INSTRS is built lazily, importing every group on first access
+    if name == "ALL_INSTRS":
+        all_instrs = [i for group in instruction_group_names() for i in load_instruction_group(group)]
+        globals()["ALL_INSTRS"] = all_instrs
+        return all_instrs
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ["LoadImmediate", "LoadAddress", "ALL_INSTRS"]
+__all__ = [
+    "LoadImmediate",
+    "LoadAddress",
+    "ALL_INSTRS",
+    "INSTRUCTION_GROUPS",
+    "InstructionGroup",
+    "instruction_database",
+    "instruction_group_names",
+    "load_instruction_group",
+    "instruction_groups_for",
+    "find_instruction",
+]
@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compact JSON-lines instruction database.
+
+Alternative to importing the generated python definition modules. The first line is a header with the interned lookup tables,
+every other line is one instruction as a flat JSON array:
+
+.. code-block:: text
+
+    {"format": "coretp-instructions", "version": 1, "extensions": [...], "categories": [...], "operands": [["rd", "GPR"], ...], "groups": [["integer", 3], ...]}
+    [group, name, extension_mask, xlen, category_mask, destination, [source, ...], formatter, [clobbers, ...]]
+
+``extension_mask`` and ``category_mask`` are bit masks over the header's ``extensions`` / ``categories`` name lists, so a database stays readable if
+``Extension`` members are added or reordered. ``group`` is an index into ``groups``, ``destination`` and ``source`` index into ``operands`` (``-1`` for no destination).
+
+Write the database for the current definitions with
+python3 -m coretp.isa.instructions.database --output instructions.jsonl
+
+Point ``CORETP_INSTRUCTION_DB`` at the file to load instructions from it instead of the python modules.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Iterable, Optional, Type, TypeVar
+
+from coretp.rv_enums import Extension, Xlen, Category, OperandType
+from coretp.rv_enums.arch import mask_bits
+from coretp.isa.instruction import InstructionDef
+from coretp.isa.operands import OperandSlot
+
+DATABASE_FORMAT = "coretp-instructions"
+DATABASE_VERSION = 1
+
+FlagT = TypeVar("FlagT", Extension, Category)
+
+
+class InstructionDatabase:
+    """
+    Instructions loaded from a database file, grouped like ``INSTRUCTION_GROUPS``.
+
+    :param groups: instructions per group name, in database order
+    :param group_extensions: mask of every extension used by each group
+    """
+
+    def __init__(self, groups: dict[str, list[InstructionDef]], group_extensions: dict[str, Extension]):
+        self.groups = groups
+        self.group_extensions = group_extensions
+
+    @classmethod
+    def read(cls, path: Path) -> "InstructionDatabase":
+        """
+        Read a database file written by ``write_database``
+        """
+        with open(path, "r") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != DATABASE_FORMAT or header.get("version") != DATABASE_VERSION:
+                raise ValueError(f"{path} is not a version {DATABASE_VERSION} {DATABASE_FORMAT} database")
+            rows = [json.loads(line) for line in f if line.strip()]
+
+        extension_bits = _bit_table(Extension, header["extensions"])
+        category_bits = _bit_table(Category, header["categories"])
+        # Interned operand slots, shared by every instruction that uses them
+        operands = [OperandSlot(name, OperandType[type_name]) for name, type_name in header["operands"]]
+
+        group_names = [name for name, _ in header["groups"]]
+        groups: dict[str, list[InstructionDef]] = {name: [] for name in group_names}
+        group_extensions = {name: Extension.from_mask(_remap(mask, extension_bits)) for name, mask in header["groups"]}
+        for group, name, extension_mask, xlen, category_mask, destination, source, formatter, clobbers in rows:
+            groups[group_names[group]].append(
+                InstructionDef(
+                    name=name,
+                    extension=Extension.from_mask(_remap(extension_mask, extension_bits)),
+                    xlen=Xlen(xlen),
+                    category=Category(_remap(category_mask, category_bits)),
+                    destination=operands[destination] if destination >= 0 else None,
+                    source=[operands[i] for i in source],
+                    formatter=formatter,
+                    clobbers=clobbers,
+                )
+            )
+        return cls(groups, group_extensions)
+
+
+def write_database(groups: dict[str, Iterable[InstructionDef]], path: Path) -> Path:
+    """
+    Write instruction groups to a JSON-lines database.
+
+    :param groups: instructions per group name. Group order is preserved and sets the order instructions are indexed in
+    :param path: output file
+    """
+    operand_ids: dict[tuple[str, str], int] = {}
+
+    def operand_id(slot: OperandSlot) -> int:
+        return operand_ids.setdefault((slot.name, slot.type.name), len(operand_ids))
+
+    rows = []
+    group_masks = []
+    for group_idx, (group, instructions) in enumerate(groups.items()):
+        group_mask = 0
+        for i in instructions:
+            group_mask |= i.extension.value
+            rows.append(
+                [
+                    group_idx,
+                    i.name,
+                    i.extension.value,
+                    i.xlen.value,
+                    i.category.value,
+                    operand_id(i.destination) if i.destination is not None else -1,
+                    [operand_id(s) for s in i.source],
+                    i.formatter,
+                    list(i.clobbers),
+                ]
+            )
+        group_masks.append([group, group_mask])
+
+    header = {
+        "format": DATABASE_FORMAT,
+        "version": DATABASE_VERSION,
+        "extensions": [e.name for e in Extension],
+        "categories": [c.name for c in Category],
+        "operands": [list(k) for k in operand_ids],
+        "groups": group_masks,
+    }
+    with open(path, "w") as f:
+        f.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for row in rows:
+            f.write(json.dumps(row, separators=(",", ":")) + "\n")
+    return path
+
+
+def _bit_table(flag_type: Type[FlagT], names: list[str]) -> Optional[dict[int, int]]:
+    "Map database bit positions to current flag values by name. None if the database uses the current bit layout"
+    current = [m.name for m in flag_type]
+    if names == current:
+        return None
+    return {1 << pos: flag_type[name].value for pos, name in enumerate(names)}
+
+
+def _remap(mask: int, table: Optional[dict[int, int]]) -> int:
+    if table is None:
+        return mask
+    remapped = 0
+    for bit in mask_bits(mask):
+        remapped |= table[bit]
+    return remapped
+
+
+if __name__ == "__main__":
+    from coretp.isa.instructions import INSTRUCTION_GROUPS, load_instruction_group
+
+    parser = argparse.ArgumentParser(description="Write the instruction database for the python instruction definitions")
+    parser.add_argument("--output", "-o", type=Path, required=True, help="Output .jsonl path")
+    args = parser.parse_args()
+    output = write_database({name: load_instruction_group(name) for name in INSTRUCTION_GROUPS}, args.output)
+    print(f"Wrote {output}")
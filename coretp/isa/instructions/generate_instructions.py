@@ -7,9 +7,20 @@ Helper script to copy riscv-opcodes.yaml and generate a bunch of instruction cla
 Run with
 python3 -m coretp.isa.instructions.generate_instructions
 
+After riscv-opcodes is updated, regenerate only the extension files whose instructions changed with
+python3 -m coretp.isa.instructions.generate_instructions --incremental
+
+Each run records a hash of every instruction's riscv-opcodes record in ``manifest.json`` next to the generated files.
+``--incremental`` compares against it, prints the added / removed / changed instructions and rewrites only the affected files.
+Changes to this script itself aren't tracked, run without ``--incremental`` after editing it.
+
+Also write a JSON-lines instruction database (see ``coretp.isa.instructions.database``) with
+python3 -m coretp.isa.instructions.generate_instructions --database instructions.jsonl
+
 """
 
 import argparse
+import hashlib
 from pathlib import Path
 from typing import Optional
 
@@ -17,7 +28,10 @@ import json
 from dataclasses import dataclass
 
 from coretp.rv_enums import Xlen, BaseArch, Extension, Category, OperandType
+from coretp.isa.instruction import InstructionDef
 from coretp.isa.operands import Operand, OperandSlot
+from coretp.isa.instructions.pseudo import pseudo_instrs
+from coretp.isa.instructions.database import write_database
 
 
 @dataclass
@@ -28,29 +42,49 @@ class InstructionTemplate:
 
     name: str
     extension: Extension
-    xlen: str
+    xlen: Xlen
     category: Category
-    destination: Optional[Operand]
-    source: str
+    destination: Optional[OperandSlot]
+    source: list[OperandSlot]
     formatter: str
 
+    @staticmethod
+    def slot_template(slot: OperandSlot) -> str:
+        return f'OperandSlot(name="{slot.name}", type=OperandType.{slot.type.name})'
+
     def class_template(self, name: str) -> str:
         """
         Generate the class template for the instructions.
         """
+        destination = self.slot_template(self.destination) if self.destination is not None else None
+        source = "[" + "".join(f"{self.slot_template(s)}, " for s in self.source) + "]"
         return f"""
 
 {name} = InstructionDef(
     name="{self.name.replace('_', '.')}",
     extension={self.extension},
-    xlen={self.xlen},
+    xlen=Xlen.{self.xlen.name},
     category={self.category},
-    destination={self.destination},
-    source={self.source},
+    destination={destination},
+    source={source},
     formatter="{self.formatter}",
 )
 """
 
+    def definition(self) -> InstructionDef:
+        """
+        ``InstructionDef`` equivalent to the generated class template
+        """
+        return InstructionDef(
+            name=self.name.replace("_", "."),
+            extension=self.extension,
+            xlen=self.xlen,
+            category=self.category,
+            destination=self.destination,
+            source=self.source,
+            formatter=self.formatter,
+        )
+
 
 class GenerateInstructions:
     """
@@ -60,9 +94,37 @@ class GenerateInstructions:
 
     instruction_dir = Path(__file__).parent
     unsupported_extensions = ["sdext", "q"]  # Extensions not in GCC at the moment
-
-    def __init__(self, instr_dict: Path):
+    manifest_name = "manifest.json"  # Per-instruction record hashes from the last run, written next to the generated modules
+    ext_names = {
+        "i": "integer",
+        "f": "float",
+        "v": "vector",
+        "zvkg": "vector",
+        "c": "compressed",
+        "m": "integer",
+        "zbb": "bitmanip",
+        "zbc": "bitmanip",
+        "zbs": "bitmanip",
+        "zbp": "bitmanip",
+        "zbt": "bitmanip",
+        "zba": "bitmanip",
+        "a": "atomic",
+        "h": "hypervisor",
+        "d": "float",
+        "zfh": "float",
+        "zfhmin": "float",
+        "zfinx": "float",
+        "zdinx": "float",
+        "zfa": "float",
+        "zcb": "compressed",
+        "zcd": "compressed",
+        "crypto": "crypto",
+    }
+
+    def __init__(self, instr_dict: Path, database: Optional[Path] = None, incremental: bool = False):
         self.instr_dict = instr_dict
+        self.database = database
+        self.incremental = incremental
 
         if not self.instr_dict.exists():
             raise FileNotFoundError(f"RISC-V opcode dictionary not found at {self.instr_dict}")
@@ -71,8 +133,10 @@ class GenerateInstructions:
     def from_args(cls):
         parser = argparse.ArgumentParser(description="Generate instructions from riscv-opcodes yaml / json")
         parser.add_argument("--path", type=Path, default=cls.instruction_dir / "instr_dict.json", help="Path to riscv-opcodes.yaml")
+        parser.add_argument("--database", type=Path, default=None, help="Also write a JSON-lines instruction database to this path")
+        parser.add_argument("--incremental", action="store_true", help="Only regenerate extensions whose instructions changed since the last run, and summarize the changes")
         args = parser.parse_args()
-        return cls(args.path)
+        return cls(args.path, database=args.database, incremental=args.incremental)
 
     def run(self):
         print(f"Generating instructions from {self.instr_dict}")
@@ -80,10 +144,53 @@ class GenerateInstructions:
             # data = load(f, Loader=Loader)
             data = json.load(f)
 
-        updated_data = {}
-        instructions = []
-        instruction_templates = {}
-        all_extensions = set()
+        binned_ext, record_hashes = self.bin_templates(data)
+
+        output_dir = self.instruction_dir
+        output_dir = output_dir.parent / "instructions2"
+        if not output_dir.exists():
+            output_dir.mkdir()
+
+        manifest = {
+            "instructions": {name: {"bin": ext_name, "hash": digest} for name, (ext_name, digest) in record_hashes.items()},
+            "bins": {ext_name: self.bin_digest(templates, record_hashes) for ext_name, templates in binned_ext.items()},
+        }
+        if self.incremental:
+            previous = self.read_manifest(output_dir)
+            self.print_changes(previous, manifest)
+            stale_bins = set(previous["bins"]) - set(manifest["bins"])
+            bins_to_write = [ext_name for ext_name, digest in manifest["bins"].items() if previous["bins"].get(ext_name) != digest or not (output_dir / f"{ext_name}.py").exists()]
+        else:
+            stale_bins = set()
+            bins_to_write = list(binned_ext)
+
+        for ext_name in bins_to_write:
+            print(f"extension: {ext_name}. {len(binned_ext[ext_name])}")
+            self.write_bin(output_dir / f"{ext_name}.py", ext_name, binned_ext[ext_name])
+        for ext_name in sorted(stale_bins):
+            print(f"extension: {ext_name}. removed")
+            (output_dir / f"{ext_name}.py").unlink(missing_ok=True)
+        with open(output_dir / self.manifest_name, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+
+        if not self.incremental:
+            for ext_name in binned_ext:
+                print(f"from .{ext_name} import {ext_name}_instrs")
+
+        if self.database is not None:
+            # pseudoinstructions aren't in riscv-opcodes, carry the hand-written ones over
+            groups = {ext_name: [t.definition() for t in templates] for ext_name, templates in binned_ext.items()}
+            groups["pseudo"] = pseudo_instrs
+            print(f"Wrote instruction database {write_database(groups, self.database)}")
+
+    def bin_templates(self, data: dict) -> tuple[dict[str, list[InstructionTemplate]], dict[str, tuple[str, str]]]:
+        """
+        Build instruction templates from the riscv-opcodes dictionary and bin them into output files.
+
+        :return: templates per bin name, and the bin and encoding record hash of every generated instruction
+        """
+        instruction_templates: dict[Extension, list[InstructionTemplate]] = {}
+        template_hashes: dict[str, str] = {}
 
         for instr_name, instr_info in data.items():
             # encoding : contains a 32-bit string defining the encoding of the instruction. Here - is used to represent instruction argument fields
@@ -94,100 +201,95 @@ class GenerateInstructions:
 
             mapped_ext = self.map_extension(instr_name, instr_info)
             if mapped_ext is None:
-                print(f"No extension found for {instr_name}")
+                if not self.incremental:
+                    print(f"No extension found for {instr_name}")
                 continue
             extension, xlen = mapped_ext
 
-            print(f"instruction {instr_name}")
+            if not self.incremental:
+                print(f"instruction {instr_name}")
 
             category = Category.from_string(self.classify(instr_name))
             dest, src, formatter = self.annotate_registers(instr_name, extension, instr_info["variable_fields"], category)
-            updated_data[instr_name] = {
-                "name": instr_name,
-                "extension": extension,
-                "xlen": xlen,
-                "category": category,
-                "destination": dest,
-                "source": src,
-                "formatter": formatter,
-            }
-            all_extensions.add(extension)
+            template_hashes[instr_name] = self.record_hash(instr_name, instr_info)
             if extension not in instruction_templates:
                 instruction_templates[extension] = []
-            instruction_templates[extension].append(InstructionTemplate(**updated_data[instr_name]))
-
-        ext_names = {
-            "i": "integer",
-            "f": "float",
-            "v": "vector",
-            "zvkg": "vector",
-            "c": "compressed",
-            "m": "integer",
-            "zbb": "bitmanip",
-            "zbc": "bitmanip",
-            "zbs": "bitmanip",
-            "zbp": "bitmanip",
-            "zbt": "bitmanip",
-            "zba": "bitmanip",
-            "a": "atomic",
-            "h": "hypervisor",
-            "d": "float",
-            "zfh": "float",
-            "zfhmin": "float",
-            "zfinx": "float",
-            "zdinx": "float",
-            "zfa": "float",
-            "zcb": "compressed",
-            "zcd": "compressed",
-            "crypto": "crypto",
-        }
-
-        binned_ext = {}
+            instruction_templates[extension].append(InstructionTemplate(name=instr_name, extension=extension, xlen=xlen, category=category, destination=dest, source=src, formatter=formatter))
 
+        binned_ext: dict[str, list[InstructionTemplate]] = {}
+        record_hashes: dict[str, tuple[str, str]] = {}
         for extension, templates in instruction_templates.items():
             ext_name = str(extension).replace("Extension.", "").lower()
             if "|" in ext_name:
                 if any(x in ext_name for x in ("zkn", "zks", "zvks", "zvkn")):
                     ext_name = "crypto"
-            if ext_name in ext_names:
-                ext_name = ext_names[ext_name]
+            if ext_name in self.ext_names:
+                ext_name = self.ext_names[ext_name]
             else:
                 ext_name = "misc"
             if ext_name not in binned_ext:
                 binned_ext[ext_name] = []
             binned_ext[ext_name].extend(templates)
+            for t in templates:
+                record_hashes[t.name] = (ext_name, template_hashes[t.name])
+        return binned_ext, record_hashes
 
-        ext_instrs = []
-        output_dir = self.instruction_dir
-        output_dir = output_dir.parent / "instructions2"
-        if not output_dir.exists():
-            output_dir.mkdir()
-        for ext_name, templates in binned_ext.items():
-            print(f"extension: {ext_name}. {len(templates)}")
-            instr_file = output_dir / f"{ext_name}.py"
-            with open(instr_file, "w") as f:
-                template_names = []
-                f.write("from coretp.rv_enums import Extension, Xlen, Category\n")
-                f.write("from coretp.isa.instruction import Instruction\n")
-                f.write("from coretp.isa.operands import IntReg, FpReg, VecReg, CsrReg, Immediate2, Immediate5, Immediate6, Immediate7, Immediate12, Immediate20\n\n")
-
-                template_strs = []
-                for t in templates:
+    def write_bin(self, instr_file: Path, ext_name: str, templates: list[InstructionTemplate]):
+        """
+        Write the definition module for one bin of instructions
+        """
+        with open(instr_file, "w") as f:
+            template_names = []
+            f.write("from coretp.rv_enums import Extension, Xlen, Category\n")
+            f.write("from coretp.isa.instruction import Instruction\n")
+            f.write("from coretp.isa.operands import IntReg, FpReg, VecReg, CsrReg, Immediate2, Immediate5, Immediate6, Immediate7, Immediate12, Immediate20\n\n")
+
+            template_strs = []
+            for t in templates:
+                name = t.name
+                if t.name in ["and", "or"]:
+                    name = f"{t.name}_"
+                else:
                     name = t.name
-                    if t.name in ["and", "or"]:
-                        name = f"{t.name}_"
-                    else:
-                        name = t.name
-                    template_names.append(name)
-                    template_strs.append(t.class_template(name))
-                    # template_names.append(t.name)
-                f.write("\n".join(template_strs))
-                ext_instr = f"{ext_name}_instrs"
-                f.write(f"{ext_instr} = [{', '.join(template_names)}]")
-                ext_instrs.append(ext_instr)
-
-        for e in ext_instrs:
-            print(f"from .{e.replace('_instrs', '')} import {e}")
+                template_names.append(name)
+                template_strs.append(t.class_template(name))
+                # template_names.append(t.name)
+            f.write("\n".join(template_strs))
+            f.write(f"{ext_name}_instrs = [{', '.join(template_names)}]")
+
+    @staticmethod
+    def record_hash(instr_name: str, instr_info: dict) -> str:
+        "Stable hash of an instruction's riscv-opcodes record"
+        return hashlib.sha256(json.dumps([instr_name, instr_info], sort_keys=True).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def bin_digest(templates: list[InstructionTemplate], record_hashes: dict[str, tuple[str, str]]) -> str:
+        "Hash of a bin's instructions, in file order. Changes when an instruction is added, removed, reordered or its record changes"
+        return hashlib.sha256(" ".join(f"{t.name}:{record_hashes[t.name][1]}" for t in templates).encode()).hexdigest()[:16]
+
+    def read_manifest(self, output_dir: Path) -> dict:
+        """
+        Manifest written by the previous run. Empty if there's none, so every bin is regenerated
+        """
+        manifest_path = output_dir / self.manifest_name
+        if not manifest_path.exists():
+            print(f"No manifest at {manifest_path}, regenerating all extensions")
+            return {"instructions": {}, "bins": {}}
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def print_changes(previous: dict, current: dict):
+        "Print a compact summary of instructions added, removed and changed since ``previous``"
+        old, new = previous["instructions"], current["instructions"]
+        added = sorted(new.keys() - old.keys())
+        removed = sorted(old.keys() - new.keys())
+        changed = sorted(name for name in new.keys() & old.keys() if new[name] != old[name])
+        for label, names in (("added", added), ("removed", removed), ("changed", changed)):
+            if names:
+                print(f"{label} ({len(names)}): {' '.join(names)}")
+        if not (added or removed or changed):
+            print("No instruction changes")
 
     def map_extension(self, instr_name: str, instr_info: dict) -> Optional[tuple[Extension, Xlen]]:
         """
@@ -201,15 +303,15 @@ class GenerateInstructions:
         for ext in extension_list:
             if "64" in ext:
                 ext_str = ext.replace("rv64_", "")
-                xlen = "Xlen.XLEN64"
+                xlen = Xlen.XLEN64
                 xlens.append(xlen)
             elif "32" in ext:
                 ext_str = ext.replace("rv32_", "")
-                xlen = "Xlen.XLEN32"
+                xlen = Xlen.XLEN32
                 xlens.append(xlen)
             else:
                 ext_str = ext.replace("rv_", "")
-                xlen = "Xlen.XLEN32"
+                xlen = Xlen.XLEN32
                 xlens.append(xlen)
 
             # edge cases
@@ -267,18 +369,15 @@ class GenerateInstructions:
 
         dest = None
         src = []
-        src_str = ""
         formatter = instr_name.replace("_", ".")
         for field in variable_fields:
             if field.endswith("d"):
-                dest = f'OperandSlot(name="{field}", type=OperandType.GPR)'
+                dest = OperandSlot(name=field, type=OperandType.GPR)
             else:
-                src.append(f'OperandSlot(name="{field}", type=OperandType.GPR)')
+                src.append(OperandSlot(name=field, type=OperandType.GPR))
             formatter += " {" + field + "}"
-        for s in src:
-            src_str += f"{s}, "
 
-        return dest, f"[{src_str}]", formatter
+        return dest, src, formatter
 
     def classify(self, instr_name: str):
         "Crude classification of instructions based on mnemonic"
@@ -1,12 +1,14 @@
 # SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Union
+from typing import Sequence, Union
 from dataclasses import dataclass, field
+from functools import cached_property
 
 from .step import TestStep
-from .step_ir import StepIR, build_step_ir
+from .step_ir import StepIR, build_step_ir, build_step_ir_table
 from .env import TestEnvCfg
+from .fingerprint import scenario_fingerprint
 
 
 class IrBuilderCtx:
@@ -47,16 +49,34 @@ class TestScenario:
     description: str
     env: TestEnvCfg
     id: str = ""  # FIXME: Make this required in future
-    steps: list[StepIR] = field(default_factory=list)
+    steps: Sequence[StepIR] = field(default_factory=list)  # list, or StepIRList for compact scenarios
 
     @classmethod
-    def from_steps(cls, steps: list[TestStep], **kwargs) -> "TestScenario":
+    def from_steps(cls, steps: list[TestStep], compact: bool = False, **kwargs) -> "TestScenario":
         """
         Create a test scenario from a list of test steps.
+
+        :param compact: store the ``StepIR`` graph in a ``StepIRTable``, creating ``StepIR`` objects on access. For large generated scenarios
         """
-        step_ir = build_step_ir(steps)
+        step_ir = build_step_ir_table(steps) if compact else build_step_ir(steps)
         return cls(steps=step_ir, **kwargs)
 
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        128-bit fingerprint of the scenario's steps and env, as 32 hex digits (see ``coretp.fingerprint``). Computed once per scenario.
+
+        Scenarios with the same fingerprint differ only in name, id and description. Use it as a dict or cache key instead of the scenario,
+        which can't be hashed and is slow to compare.
+        """
+        return scenario_fingerprint(self.steps, self.env)
+
+    def __getstate__(self) -> dict:
+        "Pickle without the cached ``fingerprint``, it's recomputed on access so pickled scenarios don't keep a fingerprint from older code"
+        state = self.__dict__.copy()
+        state.pop("fingerprint", None)
+        return state
+
 
 @dataclass(frozen=True)
 class TestPlan:
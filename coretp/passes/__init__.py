@@ -0,0 +1,12 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Analysis and transformation passes over a scenario's ``StepIR``.
+"""
+
+from .graph import StepGraph, LiveRange
+from .regalloc import RegisterAllocator, RegisterAllocation, Spill, allocate_registers
+from .cse import CseResult, eliminate_common_subexpressions
+
+__all__ = ["StepGraph", "LiveRange", "RegisterAllocator", "RegisterAllocation", "Spill", "allocate_registers", "CseResult", "eliminate_common_subexpressions"]
@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+
+from coretp.isa.instructions import find_instruction
+from coretp.step import TestStep, Arithmetic, LoadImmediateStep, LoadAddressStep
+from coretp.step_ir import StepIR, StepIRTable, StepIRList, INPUT_REF, INPUT_INT, value_fields
+from .effects import pure_op
+from .graph import StepGraph
+
+"""
+Common subexpression elimination over a scenario's ``StepIR``.
+
+Structurally equal steps without side effects are hash-consed: the first one in a block is kept, later ones are removed and their users read
+the kept step instead. Steps are equal when they have the same class, the same non-dependency fields (``op``, ``imm``, ...) and the same inputs,
+after inputs are rewritten to the kept steps. Candidates are
+
+- ``LoadImmediateStep`` with a concrete ``imm``. Without one the value is random, so equal looking steps differ
+- ``Arithmetic`` whose ``op`` is pure (see ``coretp.passes.effects``) and with all its sources given. PC relative ops like ``auipc`` are never merged
+
+CSR reads and writes, loads, stores and everything else are left alone, as are steps in different blocks.
+
+Only ``StepIR`` inputs are rewritten, the ``step`` of a ``StepIR`` still points to the original ``TestStep``.
+
+.. code-block:: python
+
+    result = eliminate_common_subexpressions(scenario.steps)
+    result.removed  # 12
+    scenario = dataclasses.replace(scenario, steps=result.steps)
+"""
+
+
+def is_candidate(step: Optional[TestStep], sources: int) -> bool:
+    """
+    Step can be merged with structurally equal steps, see module docs
+
+    :param sources: number of the step's ``StepIR`` inputs
+    """
+    if type(step) is LoadImmediateStep:
+        return step.imm is not None
+    if not isinstance(step, Arithmetic) or isinstance(step, (LoadImmediateStep, LoadAddressStep)) or not pure_op(step.op):
+        return False
+    return sources >= _source_count(step.op)
+
+
+@lru_cache(maxsize=None)
+def _source_count(op: str) -> int:
+    return len(find_instruction(op).source)
+
+
+@dataclass(frozen=True)
+class CseResult:
+    """
+    Result of ``eliminate_common_subexpressions``
+
+    :param steps: rewritten ``StepIR`` of the scenario, a ``StepIRList`` when the input was compact
+    :param replaced: id of the step that now provides the value of each removed step, by removed step id
+    """
+
+    steps: Sequence[StepIR]
+    replaced: dict[str, str]
+
+    @property
+    def removed(self) -> int:
+        "Number of removed steps"
+        return len(self.replaced)
+
+
+def eliminate_common_subexpressions(steps: Union[StepIRTable, Sequence[StepIR]]) -> CseResult:
+    """
+    Remove structurally equal steps without side effects, see module docs
+
+    :param steps: ``StepIRTable`` or ``StepIR`` list of the scenario, e.g. ``scenario.steps``
+    """
+    table = steps if isinstance(steps, StepIRTable) else StepGraph.table_of(steps)
+    compact = not isinstance(steps, list)
+    n = len(table)
+    offsets, kinds, values = table.input_offsets, table.input_kinds, table.input_values
+
+    kept = list(range(n))  # row providing each row's value
+    first_of: dict[tuple, int] = {}
+    for row in range(n):
+        step = table.steps[row]
+        start, stop = offsets[row], offsets[row + 1]
+        if not is_candidate(step, stop - start):
+            continue
+        inputs = []
+        for i in range(start, stop):
+            kind = kinds[i]
+            if kind == INPUT_REF:
+                inputs.append((kind, kept[values[i]]))
+            elif kind == INPUT_INT:
+                inputs.append((kind, values[i]))
+            else:
+                break
+        else:
+            step_type = type(step)
+            key = (table.parent[row], step_type, value_fields(step_type)(step), tuple(inputs))
+            try:
+                kept[row] = first_of.setdefault(key, row)
+            except TypeError:
+                # Unhashable field value, step can't be compared structurally
+                pass
+
+    replaced = {table.id(row): table.id(first) for row, first in enumerate(kept) if first != row}
+    if not replaced:
+        return CseResult(steps=steps if not isinstance(steps, StepIRTable) else StepIRList(steps), replaced={})
+
+    # Rebuild the StepIR without the removed rows. Removed steps are arithmetic, which has no nested code
+    top_level: list[StepIR] = []
+    code_of: dict[int, list[StepIR]] = {-1: top_level}
+    for row in range(n):
+        if kept[row] != row:
+            continue
+        inputs = table.inputs(row)
+        for j, i in enumerate(range(offsets[row], offsets[row + 1])):
+            if kinds[i] == INPUT_REF and kept[values[i]] != values[i]:
+                inputs[j] = table.id(kept[values[i]])
+        code_of[row] = []
+        code_of[table.parent[row]].append(StepIR(id=table.id(row), inputs=inputs, code=code_of[row], step=table.steps[row]))
+    return CseResult(steps=StepIRList(StepIRTable.from_step_ir(top_level)) if compact else top_level, replaced=replaced)
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+from functools import lru_cache
+from typing import Optional
+
+from coretp.isa.instructions import find_instruction
+from coretp.rv_enums import Category, OperandType
+from coretp.step import TestStep, Arithmetic, LoadImmediateStep, LoadAddressStep, Memory
+
+"""
+Side effects of step ops, shared by the passes.
+
+An op is pure when it's a known integer instruction computing its destination from its operands only: it has no clobbers, doesn't use floating
+point or vector state and reads nothing that isn't one of its operands, like the PC (``auipc``) or ``sp`` (``c.addi4spn``).
+Two steps with the same pure op and the same inputs compute the same value wherever they run.
+
+A step is reorderable when it has no side effects and its result doesn't depend on when it runs: memory declarations, load immediate / address
+steps and ``Arithmetic`` steps with a pure op. ``Arithmetic`` steps without an op can become any instruction, they aren't reorderable.
+"""
+
+# Instruction categories that compute a value from their sources only
+PURE_CATEGORIES = Category.ARITHMETIC | Category.LOGIC | Category.SHIFT | Category.CMP | Category.CAST | Category.ENCRYPTION | Category.COMPRESEED
+
+# Operand types of pure instructions. Floating point and vector instructions also depend on CSR state (rounding mode, vtype)
+PURE_OPERAND_TYPES = (OperandType.GPR, OperandType.IMM)
+
+# Step types that can be reordered whatever their op
+UNORDERED_STEP_TYPES: tuple[type, ...] = (Memory, LoadImmediateStep, LoadAddressStep)
+
+# Instructions in PURE_CATEGORIES with inputs that aren't operands: the PC or a register fixed by the encoding
+IMPLICIT_INPUT_OPS = frozenset({"auipc", "c.addi4spn", "c.addi16sp"})
+
+
+@lru_cache(maxsize=None)
+def pure_op(op: Optional[str]) -> bool:
+    "``op`` is a known integer instruction computing a value from its operands only"
+    instr = find_instruction(op) if op and op not in IMPLICIT_INPUT_OPS else None
+    return (
+        instr is not None
+        and instr.destination is not None
+        and not instr.clobbers
+        and (instr.category | PURE_CATEGORIES) == PURE_CATEGORIES
+        and all(operand.type in PURE_OPERAND_TYPES for operand in [instr.destination, *instr.source])
+    )
+
+
+def reorderable(step: Optional[TestStep]) -> bool:
+    "Step can be moved anywhere its data dependencies allow, see module docs"
+    if isinstance(step, UNORDERED_STEP_TYPES):
+        return True
+    return isinstance(step, Arithmetic) and pure_op(step.op)
@@ -0,0 +1,280 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import heapq
+from bisect import bisect_right, insort
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from coretp.models import TestScenario
+from coretp.step_ir import StepIR, StepIRTable, StepIRList, INPUT_REF
+from .effects import reorderable
+
+"""
+Dependency graph over a scenario's ``StepIR``.
+
+Nodes are the rows of the scenario's ``StepIRTable``, nested ``code`` included. A row depends on
+
+- the rows its inputs refer to (data edges)
+- the previous ordered step of the same block (order edges). Steps with side effects, or whose result depends on when they run
+  (CSR accesses, loads and stores, asserts, calls, ...), keep their relative program order. Memory declarations, load immediates and
+  arithmetic with a pure op are unordered, see ``coretp.passes.effects``. Arithmetic reading the PC or clobbering registers stays ordered
+
+Schedules only reorder steps within a block, a step with nested code is placed together with its code.
+
+.. code-block:: python
+
+    graph = StepGraph.from_scenario(scenario)
+    graph.critical_path()  # (length, rows)
+    graph.independent_chains()  # groups of rows that share no values
+    graph.register_pressure(graph.interleaved_order())
+"""
+
+
+@dataclass(frozen=True)
+class LiveRange:
+    """
+    Positions in a schedule where a step's value is live
+
+    :param row: row of the step defining the value
+    :param start: position of the defining step
+    :param end: position of the last step using the value
+    """
+
+    row: int
+    start: int
+    end: int
+
+
+class StepGraph:
+    """
+    Dependency DAG of a scenario's ``StepIR``, see module docs.
+
+    :param table: ``StepIRTable`` of the scenario
+    """
+
+    def __init__(self, table: StepIRTable):
+        self.table = table
+        n = len(table)
+        self.ordered = [not reorderable(step) for step in table.steps]
+        offsets, kinds, values = table.input_offsets, table.input_kinds, table.input_values
+        self.data_preds: list[list[int]] = [[values[i] for i in range(offsets[row], offsets[row + 1]) if kinds[i] == INPUT_REF] for row in range(n)]
+        self.preds: list[list[int]] = [list(preds) for preds in self.data_preds]
+
+        # Order edges between consecutive ordered steps of each block
+        last_ordered: dict[int, int] = {}
+        for row in range(n):
+            if self.ordered[row]:
+                parent = table.parent[row]
+                previous = last_ordered.get(parent)
+                if previous is not None:
+                    self.preds[row].append(previous)
+                last_ordered[parent] = row
+
+        self.succs: list[list[int]] = [[] for _ in range(n)]
+        for row, preds in enumerate(self.preds):
+            for pred in preds:
+                self.succs[pred].append(row)
+
+    @classmethod
+    def from_scenario(cls, scenario: TestScenario) -> "StepGraph":
+        "Graph of a scenario, reusing its table if it's compact"
+        return cls(cls.table_of(scenario.steps))
+
+    @staticmethod
+    def table_of(steps: list[StepIR]) -> StepIRTable:
+        "``StepIRTable`` of a scenario's steps"
+        if isinstance(steps, StepIRList):
+            return steps.table
+        return StepIRTable.from_step_ir(steps)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    # Schedules
+    def program_order(self) -> list[int]:
+        "Rows in their original order"
+        return list(range(len(self.table)))
+
+    def topological_order(self) -> list[int]:
+        """
+        Schedule where every step comes after its dependencies. Steps keep their program order whenever the dependencies allow it.
+
+        :raises ValueError: if dependencies form a cycle
+        """
+        return self._schedule([0] * len(self.table))
+
+    def interleaved_order(self) -> list[int]:
+        """
+        Schedule alternating between independent chains (see ``independent_chains``) when more than one is ready, so independent work is interleaved
+        instead of running one chain at a time. Ordered steps keep their relative order.
+        """
+        return self._schedule(self.chain_index())
+
+    def _schedule(self, chain_of: list[int]) -> list[int]:
+        """
+        List-schedule each block, then place steps with nested code together with their code.
+        Among ready steps, the next chain after the last scheduled one is picked, and the lowest row within that chain
+        """
+        table = self.table
+        blocks: dict[int, list[int]] = {-1: table.top_level()}
+        for row in range(len(table)):
+            if table.end[row] > row + 1:
+                blocks[row] = table.children(row)
+        scheduled = {parent: self._schedule_block(block, chain_of) for parent, block in blocks.items()}
+
+        order: list[int] = []
+        stack = list(reversed(scheduled[-1]))
+        while stack:
+            row = stack.pop()
+            order.append(row)
+            if row in scheduled:
+                stack.extend(reversed(scheduled[row]))
+        return order
+
+    def _schedule_block(self, block: list[int], chain_of: list[int]) -> list[int]:
+        table = self.table
+        in_block = set(block)
+
+        def block_member(row: int) -> Optional[int]:
+            "Row of ``block`` containing ``row``, None if it's outside the block"
+            while row != -1 and row not in in_block:
+                row = table.parent[row]
+            return row if row != -1 else None
+
+        # Dependencies between the block's rows, from any step nested in them
+        remaining: dict[int, int] = {}
+        users: dict[int, list[int]] = {row: [] for row in block}
+        for row in block:
+            deps = set()
+            for nested in range(row, table.end[row]):
+                for pred in self.preds[nested]:
+                    member = block_member(pred)
+                    if member is not None and member != row:
+                        deps.add(member)
+            remaining[row] = len(deps)
+            for dep in deps:
+                users[dep].append(row)
+
+        # Ready rows per chain, and the sorted chains with ready rows
+        ready: dict[int, list[int]] = {}
+        ready_chains: list[int] = []
+
+        def make_ready(row: int):
+            chain = chain_of[row]
+            if chain not in ready:
+                ready[chain] = []
+                insort(ready_chains, chain)
+            heapq.heappush(ready[chain], row)
+
+        for row in block:
+            if remaining[row] == 0:
+                make_ready(row)
+
+        scheduled: list[int] = []
+        last_chain = -1
+        while ready_chains:
+            i = bisect_right(ready_chains, last_chain)
+            chain = ready_chains[i if i < len(ready_chains) else 0]
+            row = heapq.heappop(ready[chain])
+            if not ready[chain]:
+                del ready[chain]
+                ready_chains.remove(chain)
+            scheduled.append(row)
+            last_chain = chain
+            for user in users[row]:
+                remaining[user] -= 1
+                if remaining[user] == 0:
+                    make_ready(user)
+        if len(scheduled) != len(block):
+            raise ValueError(f"Dependency cycle between steps {[table.id(row) for row in block if remaining[row]]}")
+        return scheduled
+
+    # Analysis
+    def critical_path(self, latency: Optional[Callable[[int], int]] = None) -> tuple[int, list[int]]:
+        """
+        Longest chain of dependent steps
+
+        :param latency: latency of a row, defaults to 1 per step
+        :return: total latency of the path and its rows, in order
+        """
+        n = len(self.table)
+        if n == 0:
+            return 0, []
+        length = [0] * n
+        via = [-1] * n
+        for row in self.topological_order():
+            best = 0
+            for pred in self.preds[row]:
+                if length[pred] > best:
+                    best, via[row] = length[pred], pred
+            length[row] = best + (latency(row) if latency is not None else 1)
+        row = max(range(n), key=length.__getitem__)
+        path = []
+        while row != -1:
+            path.append(row)
+            row = via[row]
+        return length[path[0]], path[::-1]
+
+    def live_ranges(self, order: Optional[list[int]] = None) -> list[LiveRange]:
+        """
+        Live range of every value used by another step, sorted by start
+
+        :param order: schedule the positions refer to, defaults to program order
+        """
+        if order is None:
+            order = self.program_order()
+        position = [0] * len(self.table)
+        for pos, row in enumerate(order):
+            position[row] = pos
+        last_use: dict[int, int] = {}
+        for row, preds in enumerate(self.data_preds):
+            for pred in preds:
+                if position[row] > last_use.get(pred, -1):
+                    last_use[pred] = position[row]
+        return sorted((LiveRange(row, position[row], end) for row, end in last_use.items()), key=lambda r: (r.start, r.row))
+
+    def register_pressure(self, order: Optional[list[int]] = None) -> int:
+        """
+        Maximum number of values live at the same time in a schedule, defaults to program order
+        """
+        events: list[tuple[int, int]] = []
+        for live in self.live_ranges(order):
+            events.append((live.start, 1))
+            events.append((live.end, -1))
+        pressure = peak = 0
+        # Values whose last use is at a position are freed before values defined there
+        for _, delta in sorted(events):
+            pressure += delta
+            peak = max(peak, pressure)
+        return peak
+
+    def independent_chains(self) -> list[list[int]]:
+        """
+        Groups of rows connected by data dependencies. Rows of different chains share no values and can be interleaved, subject to order edges.
+        Chains are sorted by their first row
+        """
+        chain_of = self.chain_index()
+        chains: dict[int, list[int]] = {}
+        for row, chain in enumerate(chain_of):
+            chains.setdefault(chain, []).append(row)
+        return list(chains.values())
+
+    def chain_index(self) -> list[int]:
+        "Index of each row's chain in ``independent_chains``"
+        n = len(self.table)
+        root = list(range(n))
+
+        def find(row: int) -> int:
+            while root[row] != row:
+                root[row] = root[root[row]]
+                row = root[row]
+            return row
+
+        for row, preds in enumerate(self.data_preds):
+            for pred in preds:
+                a, b = find(row), find(pred)
+                if a != b:
+                    root[max(a, b)] = min(a, b)
+        index: dict[int, int] = {}
+        return [index.setdefault(find(row), len(index)) for row in range(n)]
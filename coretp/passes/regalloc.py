@@ -0,0 +1,261 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import heapq
+from bisect import bisect_right, insort
+from dataclasses import dataclass, field
+from itertools import chain, compress, islice, repeat
+from typing import Iterable, Optional, Union
+
+from coretp.isa.instructions import find_instruction
+from coretp.isa.registers import Register, RISCV_REGISTERS
+from coretp.rv_enums import OperandType
+from coretp.rv_enums.register import RegisterClass
+from coretp.step import TestStep, Arithmetic, Call, CsrRead, Load, ReadLeafPTE
+from coretp.step_ir import StepIR, StepIRTable, INPUT_REF
+from .graph import StepGraph
+
+"""
+Linear-scan register allocation over a scenario's ``StepIR``.
+
+Every step producing a value (arithmetic, load immediate / address, CSR reads, loads, ...) is given a register of its instruction's
+destination type: GPR, FPR or vector. Values are live from their step to their last use, in program order or in a schedule from ``StepGraph``.
+A value live across a step that clobbers registers (a ``Call`` clobbers the registers of ``jalr_ra``, instructions list theirs in
+``InstructionDef.clobbers``) isn't given any of those registers.
+
+When more values are live than registers are available, the value whose range ends last is spilled, and reported in ``RegisterAllocation.spills``.
+
+.. code-block:: python
+
+    allocation = RegisterAllocator().allocate(scenario.steps)
+    allocation.register("v3")  # t0
+    allocation.spills  # [Spill(step_id="v7", reg_type=OperandType.GPR, start=7, end=93), ...]
+"""
+
+# Registers never allocated: special purpose GPRs and the vector mask register
+DEFAULT_RESERVED: tuple[str, ...] = tuple(r.name for r in RISCV_REGISTERS if r.reg_class == RegisterClass.special) + ("v0",)
+
+# Allocation preference. Temporaries are tried first so values live across calls find saved registers free
+_CLASS_PREFERENCE = (RegisterClass.temp, RegisterClass.args, RegisterClass.saved)
+
+# Step types producing a value in a GPR when they have no op to take the destination type from
+_GPR_VALUE_TYPES: tuple[type, ...] = (Arithmetic, CsrRead, Load, ReadLeafPTE)
+
+_REGISTER_TYPES = (OperandType.GPR, OperandType.FPR, OperandType.VEC)
+
+
+def call_clobbers() -> list[str]:
+    "Registers clobbered by a ``Call``, the clobbers of ``jalr_ra``"
+    from coretp.isa.instructions.pseudo import jalr_ra
+
+    return jalr_ra.clobbers
+
+
+def step_clobbers(step: Optional[TestStep]) -> list[str]:
+    "Registers a step clobbers, empty if it doesn't clobber any"
+    if isinstance(step, Call):
+        return call_clobbers()
+    op = getattr(step, "op", None)
+    if op:
+        instr = find_instruction(op)
+        if instr is not None:
+            return instr.clobbers
+    return []
+
+
+def value_register_type(step: Optional[TestStep]) -> Optional[OperandType]:
+    """
+    Type of register holding a step's value, None if the step doesn't produce a value in a register.
+
+    Taken from the destination of the step's op when it's a known instruction, GPR for value steps without one (e.g. ``LoadImmediateStep``)
+    """
+    op = getattr(step, "op", None)
+    if op:
+        instr = find_instruction(op)
+        if instr is not None:
+            if instr.destination is None or instr.destination.type not in _REGISTER_TYPES:
+                return None
+            return instr.destination.type
+    return OperandType.GPR if isinstance(step, _GPR_VALUE_TYPES) else None
+
+
+@dataclass(frozen=True)
+class Spill:
+    """
+    Value that didn't fit in a register
+
+    :param step_id: id of the step defining the value
+    :param reg_type: type of register the value needed
+    :param start: position of the defining step
+    :param end: position of the value's last use
+    """
+
+    step_id: str
+    reg_type: OperandType
+    start: int
+    end: int
+
+
+@dataclass
+class RegisterAllocation:
+    """
+    Result of ``RegisterAllocator.allocate``
+
+    :param registers: register of each allocated value, by step id
+    :param spills: values that were spilled, in order of their start
+    :param max_live: maximum number of registers in use at once, per register type
+    """
+
+    registers: dict[str, Register] = field(default_factory=dict)
+    spills: list[Spill] = field(default_factory=list)
+    max_live: dict[OperandType, int] = field(default_factory=dict)
+
+    def register(self, step_id: str) -> Optional[Register]:
+        "Register of a step's value, None if the value was spilled or the step has no value"
+        return self.registers.get(step_id)
+
+    def summary(self) -> str:
+        "One line summary, e.g. ``120 values in registers, 3 spilled (GPR: 3)``"
+        spilled: dict[str, int] = {}
+        for spill in self.spills:
+            spilled[spill.reg_type.name] = spilled.get(spill.reg_type.name, 0) + 1
+        details = ", ".join(f"{name}: {count}" for name, count in spilled.items())
+        return f"{len(self.registers)} values in registers, {len(self.spills)} spilled" + (f" ({details})" if details else "")
+
+
+class RegisterAllocator:
+    """
+    Linear-scan register allocator, see module docs.
+
+    :param reserved: names of registers that are never allocated
+    """
+
+    def __init__(self, reserved: Iterable[str] = DEFAULT_RESERVED):
+        reserved = set(reserved)
+        preference = {reg_class: i for i, reg_class in enumerate(_CLASS_PREFERENCE)}
+        self.pools: dict[OperandType, list[Register]] = {
+            reg_type: sorted(
+                (r for r in RISCV_REGISTERS if r.reg_type == reg_type and r.name not in reserved and r.reg_class in preference),
+                key=lambda r: (preference[r.reg_class], r.num),
+            )
+            for reg_type in _REGISTER_TYPES
+        }
+
+    def allocate(self, steps: Union[StepIRTable, list[StepIR]], order: Optional[list[int]] = None) -> RegisterAllocation:
+        """
+        Allocate registers for the values of a scenario's steps
+
+        :param steps: ``StepIRTable`` or ``StepIR`` list of the scenario, e.g. ``scenario.steps``
+        :param order: schedule of the table's rows (see ``StepGraph``), defaults to program order
+        """
+        table = steps if isinstance(steps, StepIRTable) else StepGraph.table_of(steps)
+        n = len(table)
+        in_program_order = order is None
+        if in_program_order:
+            order = list(range(n))
+        position = [0] * n
+        for pos, row in enumerate(order):
+            position[row] = pos
+
+        # Register type (index into _REGISTER_TYPES, -1 without a value) and clobbers per (step type, op), most steps share a handful of them
+        slot_of = [-1] * n
+        clobber_positions: dict[str, list[int]] = {}
+        kinds_cache: dict[tuple[int, Optional[str]], tuple[int, list[str]]] = {}
+        steps_column, type_index = table.steps, table.type_index
+        for row in range(n):
+            step = steps_column[row]
+            key = (type_index[row], getattr(step, "op", None))
+            kind = kinds_cache.get(key)
+            if kind is None:
+                reg_type = value_register_type(step)
+                kind = kinds_cache[key] = (_REGISTER_TYPES.index(reg_type) if reg_type is not None else -1, step_clobbers(step))
+            slot_of[row] = kind[0]
+            for name in kind[1]:
+                clobber_positions.setdefault(name, []).append(position[row])
+        for positions in clobber_positions.values():
+            positions.sort()
+
+        # Live ranges, values without users are live at their step only. Inputs are scanned as flat arrays, with the row using each one
+        offsets, kinds = table.input_offsets, table.input_kinds
+        users = list(chain.from_iterable(map(repeat, range(n), (b - a for a, b in zip(offsets, islice(offsets, 1, None))))))
+        is_ref = [kind == INPUT_REF for kind in kinds]
+        refs = zip(compress(table.input_values, is_ref), compress(users, is_ref))
+        if in_program_order:
+            # Users come in increasing position, the last one wins
+            last_use = dict(refs)
+        else:
+            last_use = {}
+            for value, user in refs:
+                if position[user] > last_use.get(value, -1):
+                    last_use[value] = position[user]
+        end = position[:]
+        for value, pos in last_use.items():
+            if pos > end[value]:
+                end[value] = pos
+        intervals = sorted((position[row], row) for row in range(n) if slot_of[row] != -1)
+
+        # Registers are referred to by their index in the pool of their type, free lists are kept sorted so the preferred register comes first
+        pools = [self.pools[reg_type] for reg_type in _REGISTER_TYPES]
+        pool_clobbers = [[clobber_positions.get(reg.name) for reg in pool] for pool in pools]
+        clobbered_slots = [any(positions is not None for positions in slot_clobbers) for slot_clobbers in pool_clobbers]
+
+        def crosses_clobber(slot: int, reg: int, start: int, stop: int) -> bool:
+            positions = pool_clobbers[slot][reg]
+            if positions is None:
+                return False
+            i = bisect_right(positions, start)
+            return i < len(positions) and positions[i] < stop
+
+        assigned: dict[int, int] = {}
+        spilled: list[int] = []
+        free = [list(range(len(pool))) for pool in pools]
+        active: list[dict[int, int]] = [{} for _ in pools]  # row -> register of values holding a register
+        max_live = [0] * len(pools)
+        expiring: list[tuple[int, int]] = []  # (end, row) of active values, entries of spilled values are skipped
+
+        for start, row in intervals:
+            # Values whose last use is at or before this step free their registers, an instruction can write a register it reads
+            while expiring and expiring[0][0] <= start:
+                _, done = heapq.heappop(expiring)
+                done_active = active[slot_of[done]]
+                if done in done_active:
+                    insort(free[slot_of[done]], done_active.pop(done))
+
+            slot = slot_of[row]
+            stop = end[row]
+            slot_free = free[slot]
+            slot_active = active[slot]
+            if stop - start < 2 or not clobbered_slots[slot]:
+                # No clobbering step can run while the value is live
+                reg = slot_free.pop(0) if slot_free else None
+            else:
+                reg = next((r for r in slot_free if not crosses_clobber(slot, r, start, stop)), None)
+                if reg is not None:
+                    slot_free.remove(reg)
+            if reg is None:
+                # Spill the active value ending last, if it ends after this one and its register can hold this value
+                candidates = [(end[other], other) for other, r in slot_active.items() if not crosses_clobber(slot, r, start, stop)]
+                victim = max(candidates, default=None)
+                if victim is None or victim[0] <= stop:
+                    spilled.append(row)
+                    continue
+                reg = slot_active.pop(victim[1])
+                del assigned[victim[1]]
+                spilled.append(victim[1])
+
+            assigned[row] = reg
+            slot_active[row] = reg
+            heapq.heappush(expiring, (stop, row))
+            if len(slot_active) > max_live[slot]:
+                max_live[slot] = len(slot_active)
+
+        return RegisterAllocation(
+            registers={table.id(row): pools[slot_of[row]][reg] for row, reg in sorted(assigned.items())},
+            spills=[Spill(table.id(row), _REGISTER_TYPES[slot_of[row]], position[row], end[row]) for row in sorted(spilled, key=position.__getitem__)],
+            max_live={reg_type: count for reg_type, count in zip(_REGISTER_TYPES, max_live) if count},
+        )
+
+
+def allocate_registers(steps: Union[StepIRTable, list[StepIR]], order: Optional[list[int]] = None, **kwargs) -> RegisterAllocation:
+    "Allocate registers with a ``RegisterAllocator`` created with ``kwargs``, see ``RegisterAllocator.allocate``"
+    return RegisterAllocator(**kwargs).allocate(steps, order)
@@ -2,19 +2,41 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
-from .test_plan_registry import new_test_plan, get_plan, list_plans, query_plans
+from .test_plan_registry import new_test_plan, get_plan, get_scenario, stream_plan, list_plans, query_plans, build_plans, set_plan_cache, add_plan_module, plan_source_key
+from .scenario_index import Q, ScenarioIndex, query_scenarios, find_duplicate_scenarios
 
+# Plan packages only register plan metadata, so importing them is cheap and lets list_plans / query_plans answer without loading scenarios.
+from . import paging, sstc, svadu, zicond, zkt, zimop_zcmop, zifencei, zicbom_zicboz_zicbop, zicntr_zihpm_sscounterenw, sscofpmf
 
-# Have to import all plans here to ensure they are registered. Need to include the module itself to ensure it's registered.
-from .paging import page_table_walks
-from .sstc import sstc_scenarios
-from .svadu import svadu_scenarios
-from .zicond import zicond_scenarios
-from .zkt import zkt_scenarios
-from .zimop_zcmop import zimop_zcmop_scenarios
-from .zifencei import zifencei_scenarios
-from .zicbom_zicboz_zicbop import zicbom_zicboz_zicbop_scenarios
-from .zicntr_zihpm_sscounterenw import zicntr_zihpm_sscounterenw_scenarios
-from .sscofpmf import sscofpmf_scenarios
+# Scenario module of each plan, imported the first time the plan is built. New plans need an entry here.
+PLAN_MODULES = {
+    "paging": f"{__name__}.paging.page_table_walks",
+    "sstc": f"{__name__}.sstc.sstc_scenarios",
+    "svadu": f"{__name__}.svadu.svadu_scenarios",
+    "zicond": f"{__name__}.zicond.zicond_scenarios",
+    "zkt": f"{__name__}.zkt.zkt_scenarios",
+    "zimop_zcmop": f"{__name__}.zimop_zcmop.zimop_zcmop_scenarios",
+    "zifencei": f"{__name__}.zifencei.zifencei_scenarios",
+    "zicbom_zicboz_zicbop": f"{__name__}.zicbom_zicboz_zicbop.zicbom_zicboz_zicbop_scenarios",
+    "zicntr_zihpm_sscounterenw": f"{__name__}.zicntr_zihpm_sscounterenw.zicntr_zihpm_sscounterenw_scenarios",
+    "sscofpmf": f"{__name__}.sscofpmf.sscofpmf_scenarios",
+}
+for _plan_name, _module in PLAN_MODULES.items():
+    add_plan_module(_plan_name, _module)
 
-__all__ = ["new_test_plan", "get_plan", "list_plans", "query_plans"]
+__all__ = [
+    "new_test_plan",
+    "get_plan",
+    "get_scenario",
+    "stream_plan",
+    "list_plans",
+    "query_plans",
+    "build_plans",
+    "set_plan_cache",
+    "add_plan_module",
+    "plan_source_key",
+    "Q",
+    "ScenarioIndex",
+    "query_scenarios",
+    "find_duplicate_scenarios",
+]
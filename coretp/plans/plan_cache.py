@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import importlib.util
+import os
+import pickle
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Optional
+
+from coretp import TestPlan
+
+"""
+On-disk cache of built test plans.
+
+Built ``TestPlan`` objects (with their scenarios and ``StepIR`` graphs) are pickled to ``<directory>/<plan name>-<key>.pickle``.
+The key hashes the coretp version, the source of every module defining one of the plan's scenario functions,
+the source of the modules that define the pickled step and IR classes, and every module of ``coretp.plans``.
+Editing a scenario, a plan helper module or the step library invalidates the entry, a stale or unreadable entry is rebuilt.
+
+Scenarios that draw random values without a fixed seed will keep the values from the build that populated the cache.
+
+Enable with ``CORETP_PLAN_CACHE=<directory>`` or ``set_plan_cache(directory)`` in ``coretp.plans``.
+"""
+
+PLAN_CACHE_ENV = "CORETP_PLAN_CACHE"
+
+# Packages and modules hashed into every key, relative to the coretp package: those whose classes end up in the pickled plans,
+# and the whole plans package, so edits to helper modules imported by scenario modules invalidate the plans using them
+_LIBRARY_SOURCES = ("__init__.py", "models.py", "step_ir.py", "step", "env", "rv_enums", "plans")
+
+
+@lru_cache(maxsize=1)
+def coretp_version() -> str:
+    "Installed coretp version, or 'unknown' when running from a source tree"
+    try:
+        return metadata.version("coretp")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+@lru_cache(maxsize=1)
+def _library_digest() -> str:
+    "Hash of the coretp modules in ``_LIBRARY_SOURCES``"
+    root = Path(__file__).parent.parent
+    digest = hashlib.sha256()
+    for source in _LIBRARY_SOURCES:
+        path = root / source
+        for file in sorted(path.rglob("*.py")) if path.is_dir() else [path]:
+            digest.update(str(file.relative_to(root)).encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def source_key(name: str, modules: list[str]) -> str:
+    """
+    Hash of everything a built plan depends on: the coretp version, the step library, the plans package and the source of the plan's scenario modules.
+    Sources are read from disk, so the modules don't need to be imported.
+
+    :param name: name of the test plan
+    :param modules: modules defining the plan's scenario functions
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{coretp_version()}\0{_library_digest()}\0{name}".encode())
+    for module in modules:
+        digest.update(module.encode())
+        digest.update(Path(importlib.util.find_spec(module).origin).read_bytes())
+    return digest.hexdigest()[:32]
+
+
+class PlanCache:
+    """
+    Directory of pickled test plans.
+
+    :param directory: cache directory, created on first write
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    @classmethod
+    def from_env(cls) -> Optional["PlanCache"]:
+        """
+        Cache in the directory named by ``CORETP_PLAN_CACHE``, None if it isn't set
+        """
+        directory = os.environ.get(PLAN_CACHE_ENV)
+        return cls(Path(directory)) if directory else None
+
+    def key(self, name: str, modules: list[str]) -> str:
+        """
+        Cache key for a plan, see ``source_key``
+
+        :param name: name of the test plan
+        :param modules: modules defining the plan's scenario functions
+        """
+        return source_key(name, modules)
+
+    def path(self, name: str, key: str) -> Path:
+        return self.directory / f"{name}-{key}.pickle"
+
+    def load(self, name: str, modules: list[str]) -> Optional[TestPlan]:
+        """
+        Get a cached plan, None if there is no up to date entry
+        """
+        path = self.path(name, self.key(name, modules))
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                plan = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        return plan if isinstance(plan, TestPlan) else None
+
+    def store(self, plan: TestPlan, modules: list[str]):
+        """
+        Write a built plan to the cache, replacing older entries for the same plan
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(plan.name, self.key(plan.name, modules))
+        for stale in self.directory.glob(f"{plan.name}-*.pickle"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        # Write to a temporary file first so concurrent exports never read a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(plan, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """
+        Remove every cached plan
+        """
+        for path in self.directory.glob("*.pickle"):
+            path.unlink(missing_ok=True)
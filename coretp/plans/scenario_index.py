@@ -0,0 +1,272 @@
+# SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Hashable, Iterable, Optional
+
+from coretp import TestScenario, StepIR
+from .test_plan_registry import get_plan, list_plans, _registry
+
+"""
+Scenario Index
+
+Inverted index over built scenarios, for finding scenarios by what they contain rather than by plan metadata.
+Each scenario is indexed under its plan, tags, name, id and fingerprint, the class of every step, the CSRs and instruction ops its steps use,
+and every value in its ``TestEnvCfg``. Lookups are set intersections and unions over precomputed scenario positions.
+
+.. code-block:: python
+
+    from coretp.plans import Q, query_scenarios
+    from coretp.rv_enums import PagingMode, PrivilegeMode
+
+    # Scenarios that use ModifyPte and can run under SV48 in S-mode
+    query_scenarios(Q(step="ModifyPte", paging=PagingMode.SV48, priv=PrivilegeMode.S))
+
+    # AND / OR / NOT compose, a list of values for one field matches any of them
+    query_scenarios((Q(csr="satp") | Q(op=["sfence.vma", "hfence.vvma"])) & ~Q(plan="paging"))
+
+    # Scenarios with the same steps and env, across plans
+    find_duplicate_scenarios()  # [[IndexedScenario("zkt", <SID_ZKT_04>), IndexedScenario("zkt", <SID_ZKT_06>)]]
+
+Terms in a single ``Q`` are ANDed together.
+
+.. list-table:: Query fields
+   :header-rows: 1
+
+   * - Field
+     - Matches
+   * - ``plan``, ``tag``
+     - plan name and tags
+   * - ``name``, ``id``
+     - scenario name and id (SID)
+   * - ``fingerprint``
+     - ``TestScenario.fingerprint``, scenarios with the same steps and env
+   * - ``step``
+     - class of any step, as a class or class name
+   * - ``csr``, ``op``
+     - CSR name or instruction op used by any step, case insensitive
+   * - ``priv``, ``paging``, ``page_size``, ``reg_width``, ``hypervisor``, ``virtualized``, ``deleg_excp_to``
+     - any of the values allowed by the scenario's ``TestEnvCfg``
+"""
+
+# TestEnvCfg list fields and the query field they're indexed under
+_ENV_FIELDS = {
+    "priv_modes": "priv",
+    "paging_modes": "paging",
+    "page_sizes": "page_size",
+    "reg_widths": "reg_width",
+    "hypervisor": "hypervisor",
+    "virtualized": "virtualized",
+    "deleg_excp_to": "deleg_excp_to",
+}
+QUERY_FIELDS = ("plan", "tag", "name", "id", "fingerprint", "step", "csr", "op", *_ENV_FIELDS.values())
+
+
+def _normalize(field_name: str, value: Any) -> Hashable:
+    "Key a query value the same way the index keys scenario values"
+    if field_name == "step" and isinstance(value, type):
+        return value.__name__
+    if field_name in ("csr", "op") and isinstance(value, str):
+        return value.lower()
+    return value
+
+
+@dataclass(frozen=True)
+class IndexedScenario:
+    """
+    Scenario returned by a ``ScenarioIndex`` query
+
+    :param plan: name of the test plan containing the scenario
+    :param scenario: the built scenario
+    """
+
+    plan: str
+    scenario: TestScenario
+
+
+class ScenarioQuery(ABC):
+    """
+    Base class for scenario index predicates. Combine with ``&``, ``|`` and ``~``.
+    """
+
+    @abstractmethod
+    def evaluate(self, index: "ScenarioIndex") -> frozenset[int]:
+        "Positions of matching scenarios in ``index``"
+
+    def __and__(self, other: "ScenarioQuery") -> "ScenarioQuery":
+        return _And((self, other))
+
+    def __or__(self, other: "ScenarioQuery") -> "ScenarioQuery":
+        return _Or((self, other))
+
+    def __invert__(self) -> "ScenarioQuery":
+        return _Not(self)
+
+
+class Q(ScenarioQuery):
+    """
+    Match scenarios on index fields, see ``QUERY_FIELDS``. All terms must match.
+    A list, tuple or set of values for a field matches scenarios with any of them.
+
+    :raises ValueError: for unknown fields
+    """
+
+    def __init__(self, **terms: Any):
+        unknown = [f for f in terms if f not in QUERY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown scenario query fields {unknown}. Expected one of {QUERY_FIELDS}")
+        self.terms = {f: [_normalize(f, v) for v in (values if isinstance(values, (list, tuple, set, frozenset)) else [values])] for f, values in terms.items()}
+
+    def evaluate(self, index: "ScenarioIndex") -> frozenset[int]:
+        matched = index.all
+        for field_name, values in self.terms.items():
+            table = index.tables[field_name]
+            field_matches: set[int] = set()
+            for value in values:
+                field_matches |= table.get(value, set())
+            matched = matched.intersection(field_matches)
+            if not matched:
+                break
+        return matched
+
+    def __repr__(self) -> str:
+        return f"Q({', '.join(f'{k}={v!r}' for k, v in self.terms.items())})"
+
+
+class _And(ScenarioQuery):
+    def __init__(self, queries: tuple[ScenarioQuery, ...]):
+        self.queries = queries
+
+    def evaluate(self, index: "ScenarioIndex") -> frozenset[int]:
+        matched = index.all
+        for query in self.queries:
+            matched = matched.intersection(query.evaluate(index))
+        return matched
+
+
+class _Or(ScenarioQuery):
+    def __init__(self, queries: tuple[ScenarioQuery, ...]):
+        self.queries = queries
+
+    def evaluate(self, index: "ScenarioIndex") -> frozenset[int]:
+        return frozenset().union(*(query.evaluate(index) for query in self.queries))
+
+
+class _Not(ScenarioQuery):
+    def __init__(self, query: ScenarioQuery):
+        self.query = query
+
+    def evaluate(self, index: "ScenarioIndex") -> frozenset[int]:
+        return index.all - self.query.evaluate(index)
+
+
+class ScenarioIndex:
+    """
+    Inverted index from query field values to scenario positions.
+
+    :param plans: names of the test plans to index. Defaults to every registered plan. Plans are built if needed
+    """
+
+    def __init__(self, plans: Optional[Iterable[str]] = None):
+        self.scenarios: list[IndexedScenario] = []
+        self.tables: dict[str, dict[Hashable, set[int]]] = {f: defaultdict(set) for f in QUERY_FIELDS}
+        for plan_name in plans if plans is not None else list_plans():
+            plan_info = _registry.get_plan_info(plan_name)
+            for scenario in get_plan(plan_name).scenarios:
+                self._add(plan_name, plan_info.tags, scenario)
+        self.all = frozenset(range(len(self.scenarios)))
+
+    def _add(self, plan_name: str, tags: list[str], scenario: TestScenario):
+        pos = len(self.scenarios)
+        self.scenarios.append(IndexedScenario(plan_name, scenario))
+        self.tables["plan"][plan_name].add(pos)
+        for tag in tags:
+            self.tables["tag"][tag].add(pos)
+        self.tables["name"][scenario.name].add(pos)
+        if scenario.id:
+            self.tables["id"][scenario.id].add(pos)
+        self.tables["fingerprint"][scenario.fingerprint].add(pos)
+        for cfg_field, query_field in _ENV_FIELDS.items():
+            for value in getattr(scenario.env, cfg_field):
+                self.tables[query_field][value].add(pos)
+
+        stack: list[StepIR] = list(scenario.steps)
+        while stack:
+            step_ir = stack.pop()
+            stack.extend(step_ir.code)
+            step = step_ir.step
+            if step is None:
+                continue
+            self.tables["step"][type(step).__name__].add(pos)
+            csr_name = getattr(step, "csr_name", None)
+            if csr_name:
+                self.tables["csr"][csr_name.lower()].add(pos)
+            op = getattr(step, "op", None)
+            if op:
+                self.tables["op"][op.lower()].add(pos)
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    def search(self, query: ScenarioQuery) -> list[IndexedScenario]:
+        """
+        Scenarios matching ``query``, in plan and registration order
+        """
+        return [self.scenarios[pos] for pos in sorted(query.evaluate(self))]
+
+    def values(self, field_name: str) -> list[Hashable]:
+        """
+        Distinct indexed values of a query field, e.g. every CSR name used by some scenario
+        """
+        values = list(self.tables[field_name])
+        return sorted(values, key=lambda v: (v.name if isinstance(v, Enum) else str(v)))
+
+    def duplicates(self) -> list[list[IndexedScenario]]:
+        """
+        Groups of scenarios with the same fingerprint, each group in plan and registration order. Groups are ordered by their first scenario
+        """
+        groups = [sorted(positions) for positions in self.tables["fingerprint"].values() if len(positions) > 1]
+        return [[self.scenarios[pos] for pos in group] for group in sorted(groups)]
+
+
+_default_index: Optional[ScenarioIndex] = None
+
+
+def scenario_index() -> ScenarioIndex:
+    """
+    Process-wide index over every registered plan, built on first use. Building it builds every plan.
+    """
+    global _default_index
+    if _default_index is None:
+        _default_index = ScenarioIndex()
+    return _default_index
+
+
+def query_scenarios(query: Optional[ScenarioQuery] = None, **terms: Any) -> list[IndexedScenario]:
+    """
+    Find scenarios across all registered plans.
+
+    :param query: predicate built from ``Q`` objects
+    :param terms: shorthand for ``Q(**terms)``, ANDed with ``query``
+
+    :return: matching scenarios with their plan name, in plan and registration order
+    """
+    if terms:
+        query = Q(**terms) if query is None else query & Q(**terms)
+    if query is None:
+        raise ValueError("No scenario query given")
+    return scenario_index().search(query)
+
+
+def find_duplicate_scenarios(plans: Optional[Iterable[str]] = None) -> list[list[IndexedScenario]]:
+    """
+    Find scenarios with the same steps and env (``TestScenario.fingerprint``), within and across plans
+
+    :param plans: names of the test plans to search, defaults to every registered plan using the process-wide index
+    :return: groups of duplicate scenarios with their plan name, see ``ScenarioIndex.duplicates``
+    """
+    index = scenario_index() if plans is None else ScenarioIndex(plans)
+    return index.duplicates()
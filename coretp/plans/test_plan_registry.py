@@ -1,13 +1,18 @@
 # SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Callable, Optional
+from typing import Callable, Optional, Sequence, Union
 from pathlib import Path
+import importlib
 import inspect
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from functools import wraps
 from dataclasses import dataclass, field
 
 from coretp import TestPlan, TestScenario
+from .plan_cache import PlanCache, source_key
 
 """
 Test Plan Registry
@@ -26,21 +31,95 @@ Register scenarios using the decorator:
     def my_scenario():
         return TestScenario(...)
 
+Scenario functions can live in a separate module that is only imported when the plan is built.
+Plan metadata stays available to ``list_plans`` and ``query_plans`` without importing it:
+
+.. code-block:: python
+
+    add_plan_module("my_plan", "my_package.my_plan_scenarios")
+
 Retrieve built plans:
 
 .. code-block:: python
 
     plan = get_plan("my_plan")  # Returns immutable TestPlan
 
+Build only the scenarios you need:
+
+.. code-block:: python
+
+    scenario = get_scenario("my_plan", "my_scenario")  # Builds a single scenario, looked up by name or id
+    plan = get_plan("my_plan", lazy=True)  # Scenarios are built on first access
+
 .. note::
    The registry ensures that:
 
-   - Same TestPlan object is returned for repeated calls (safe for dict keys)
-   - Scenarios cannot be added after first plan retrieval
-   - Plans are built only once and cached
+   - Same TestPlan object is returned for repeated calls (safe for dict keys), lazy or not. A lazy plan is filled in with the built scenarios when the full plan is built
+   - Scenarios cannot be added after first plan or scenario retrieval
+   - Plans and scenarios are built only once and cached. Lazy plans, single scenarios and full builds share the same scenario objects
+   - With a plan cache configured (``CORETP_PLAN_CACHE`` or ``set_plan_cache``), plans whose scenario sources are unchanged are loaded from disk instead of rebuilt
+
+Build several plans at once, running scenario functions in a process pool:
+
+.. code-block:: python
+
+    reports = build_plans(list_plans(), jobs=8)
+    for report in reports.values():
+        print(report.name, report.duration, [r.function for r in report.failures])
 """
 
 
+@dataclass(frozen=True)
+class ScenarioBuildResult:
+    """
+    Outcome of running a single scenario function.
+
+    :param function: qualified name of the scenario function
+    :param duration: time spent in the scenario function, in seconds
+    :param scenario: built scenario, None if the function raised
+    :param error: formatted traceback if the function raised
+    """
+
+    function: str
+    duration: float
+    scenario: Optional[TestScenario] = None
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PlanBuildReport:
+    """
+    Per-scenario results of building a test plan with ``build_plans``.
+
+    :param name: name of the test plan
+    :param plan: built plan, containing the scenarios that built successfully in registration order. None if every scenario failed
+    :param results: build result of every scenario function, in registration order
+    """
+
+    name: str
+    plan: Optional[TestPlan]
+    results: list[ScenarioBuildResult]
+
+    @property
+    def failures(self) -> list[ScenarioBuildResult]:
+        return [r for r in self.results if r.error is not None]
+
+    @property
+    def duration(self) -> float:
+        "Total time spent in scenario functions, in seconds"
+        return sum(r.duration for r in self.results)
+
+
+def _run_scenario_function(func: Callable[[], TestScenario]) -> ScenarioBuildResult:
+    "Run one scenario function, capturing its duration and any exception. Module-level so it can run in a worker process"
+    start = time.perf_counter()
+    try:
+        scenario = func()
+    except Exception:
+        return ScenarioBuildResult(func.__qualname__, time.perf_counter() - start, error=traceback.format_exc())
+    return ScenarioBuildResult(func.__qualname__, time.perf_counter() - start, scenario=scenario)
+
+
 @dataclass
 class _TestPlanInfo:
     """
@@ -51,6 +130,7 @@ class _TestPlanInfo:
     :param tags: Optional tags for the test plan, e.g. "security", "memory"
     :param features: Optional features for the test plan. unused for now, but can be used later to track dependencies or required features
     :param scenarios: scenarios of the test plan.
+    :param modules: modules registering scenarios for this plan, imported before the plan is built
 
     :raises RuntimeError: if scenarios are added to an already-built plan
     """
@@ -60,24 +140,166 @@ class _TestPlanInfo:
     tags: list[str] = field(default_factory=list)
     features: list[str] = field(default_factory=list)
     _scenarios: list[Callable[[], TestScenario]] = field(default_factory=list)
+    modules: list[str] = field(default_factory=list)
     _built_plan: Optional[TestPlan] = field(default=None, init=False)
+    _lazy_plan: Optional[TestPlan] = field(default=None, init=False)
+    _built_scenarios: dict[int, TestScenario] = field(default_factory=dict, init=False)
 
     def add_scenario(self, scenario_func: Callable[[], TestScenario]) -> None:
         """Add a scenario function to this plan"""
-        if self._built_plan is not None:
+        if self._built_plan is not None or self._lazy_plan is not None or self._built_scenarios:
             raise RuntimeError(f"Cannot add scenarios to already-built plan '{self.name}'")
         self._scenarios.append(scenario_func)
 
-    def build(self) -> TestPlan:
-        """Build and cache TestPlan"""
+    def load_scenarios(self) -> list[Callable[[], TestScenario]]:
+        """Import the plan's scenario modules, registering their scenarios. Modules already imported are skipped"""
+        for module in self.modules:
+            importlib.import_module(module)
+        return self._scenarios
+
+    def source_modules(self) -> list[str]:
+        """Modules defining the plan's scenarios, without importing them if they are listed in ``modules``"""
+        if self.modules:
+            return self.modules
+        return list(dict.fromkeys(func.__module__ for func in self._scenarios))
+
+    def source_key(self) -> str:
+        """Hash of the plan's scenario sources and the step library, changes whenever a rebuild could produce a different plan"""
+        return source_key(self.name, self.source_modules())
+
+    def build_scenario(self, index: int, cache: bool = True) -> TestScenario:
+        """
+        Build a single scenario, by registration index
+
+        :param cache: keep the scenario so later accesses return the same object. Scenarios already built are always reused
+        """
+        if self._built_plan is not None:
+            return self._built_plan.scenarios[index]
+        if index in self._built_scenarios:
+            return self._built_scenarios[index]
+        scenario = self.load_scenarios()[index]()
+        if cache:
+            self._built_scenarios[index] = scenario
+        return scenario
+
+    def find_scenario(self, name_or_id: str) -> TestScenario:
+        """
+        Build and cache the scenario with ``name_or_id`` as its name or id
+
+        Scenarios already built are checked first, then scenario functions named ``name_or_id``. Otherwise scenarios are built in order until one matches.
+
+        :raises ValueError: if no scenario in the plan matches
+        """
+        funcs = self.load_scenarios()
+        if self._built_plan is not None:
+            candidates: list[int] = []
+            scenarios = dict(enumerate(self._built_plan.scenarios))
+        else:
+            # Scenario functions are usually named after the scenario they return
+            hinted = [i for i, func in enumerate(funcs) if func.__name__ == name_or_id]
+            candidates = hinted + [i for i in range(len(funcs)) if i not in hinted and i not in self._built_scenarios]
+            scenarios = self._built_scenarios
+        for scenario in scenarios.values():
+            if name_or_id in (scenario.name, scenario.id):
+                return scenario
+        for i in candidates:
+            scenario = self.build_scenario(i)
+            if name_or_id in (scenario.name, scenario.id):
+                return scenario
+        raise ValueError(f"Scenario '{name_or_id}' not found in test plan '{self.name}'")
+
+    def stream_plan(self) -> TestPlan:
+        """TestPlan whose scenarios are rebuilt on every access and not kept. Returns the built plan if there is one"""
+        if self._built_plan is not None:
+            return self._built_plan
+        return TestPlan(name=self.name, description=self.description, scenarios=_LazyScenarios(self, len(self.load_scenarios()), cache=False))
+
+    def lazy_plan(self) -> TestPlan:
+        """TestPlan whose scenarios are built on first access. Returns the built plan if there is one"""
+        if self._built_plan is not None:
+            return self._built_plan
+        if self._lazy_plan is None:
+            self._lazy_plan = TestPlan(name=self.name, description=self.description, scenarios=_LazyScenarios(self, len(self.load_scenarios())))
+        return self._lazy_plan
+
+    def build(self, cache: Optional[PlanCache] = None) -> TestPlan:
+        """
+        Build and cache TestPlan
+
+        :param cache: optional on-disk cache to load the plan from, or store it in after building. Not used if some scenarios were already built individually
+        """
+        if self._built_plan is None and not self._built_scenarios:
+            self.load_cached(cache)
         if self._built_plan is None:
-            self._built_plan = TestPlan(
-                name=self.name,
-                description=self.description,
-                scenarios=[func() for func in self._scenarios],
-            )
+            self._keep_built_plan(TestPlan(name=self.name, description=self.description, scenarios=[self.build_scenario(i) for i in range(len(self.load_scenarios()))]))
+            if cache is not None:
+                cache.store(self._built_plan, self.source_modules())
         return self._built_plan
 
+    def load_cached(self, cache: Optional[PlanCache]) -> Optional[TestPlan]:
+        """Use the plan from ``cache`` if it has an up to date entry. Not used if some scenarios were already built individually"""
+        if self._built_plan is None and cache is not None and not self._built_scenarios:
+            plan = cache.load(self.name, self.source_modules())
+            if plan is not None and plan.description == self.description:
+                self._keep_built_plan(plan)
+        return self._built_plan
+
+    def _keep_built_plan(self, plan: TestPlan) -> TestPlan:
+        """
+        Cache ``plan`` as the built plan. If a lazy plan was handed out, it is upgraded in place to hold the built scenarios and cached instead,
+        so lazy and full ``get_plan`` calls return the same object
+        """
+        if self._lazy_plan is not None:
+            # TestPlan is frozen, replace the lazy scenario sequence the same way dataclasses do in __init__
+            object.__setattr__(self._lazy_plan, "scenarios", list(plan.scenarios))
+            plan = self._lazy_plan
+        self._built_plan = plan
+        return plan
+
+    def build_from_results(self, results: list[ScenarioBuildResult], cache: Optional[PlanCache] = None) -> PlanBuildReport:
+        """
+        Assemble the plan from scenario results collected by ``build_plans``.
+        The plan is only cached (in memory and in ``cache``) if every scenario built, so a later ``build()`` still raises for failing scenarios.
+        """
+        # Keep scenarios that were already built individually, so every access returns the same objects
+        scenarios = [self._built_scenarios.get(i, r.scenario) for i, r in enumerate(results) if r.scenario is not None]
+        if len(scenarios) < len(results):
+            plan = TestPlan(name=self.name, description=self.description, scenarios=scenarios) if scenarios else None
+            return PlanBuildReport(self.name, plan, results)
+        if self._built_plan is None:
+            self._keep_built_plan(TestPlan(name=self.name, description=self.description, scenarios=scenarios))
+            if cache is not None:
+                cache.store(self._built_plan, self.source_modules())
+        return PlanBuildReport(self.name, self._built_plan, results)
+
+
+class _LazyScenarios(Sequence[TestScenario]):
+    """
+    Scenarios of a lazy ``TestPlan``. Each scenario is built by its plan's registry entry the first time it is accessed.
+
+    :param cache: keep built scenarios in the registry. Otherwise every access builds a new scenario, so a single pass holds one scenario at a time
+    """
+
+    def __init__(self, plan_info: _TestPlanInfo, length: int, cache: bool = True):
+        self._plan_info = plan_info
+        self._length = length
+        self._cache = cache
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TestScenario, list[TestScenario]]:
+        if isinstance(index, slice):
+            return [self._plan_info.build_scenario(i, self._cache) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("scenario index out of range")
+        return self._plan_info.build_scenario(index, self._cache)
+
+    def __repr__(self) -> str:
+        return f"<{self._length} lazily built scenarios of {self._plan_info.name}>"
+
 
 class _TestPlanRegistry:
     """
@@ -89,6 +311,7 @@ class _TestPlanRegistry:
 
     def __init__(self):
         self._plans: dict[str, _TestPlanInfo] = {}
+        self.cache: Optional[PlanCache] = PlanCache.from_env()
 
     def register_plan(self, name: str, description: str = "", tags: Optional[list[str]] = None, features: Optional[list[str]] = None) -> None:
         """Register a new test plan"""
@@ -100,12 +323,58 @@ class _TestPlanRegistry:
         if plan_name in self._plans:
             self._plans[plan_name].add_scenario(scenario_func)
 
-    def get_plan(self, name: str) -> TestPlan:
-        """Get built TestPlan"""
+    def add_plan_module(self, plan_name: str, module: str) -> None:
+        """Add a module to import before building a plan"""
+        if plan_name not in self._plans:
+            raise ValueError(f"Test plan '{plan_name}' not found")
+        self._plans[plan_name].modules.append(module)
+
+    def get_plan_info(self, name: str) -> _TestPlanInfo:
         plan_info = self._plans.get(name)
         if plan_info is None:
             raise ValueError(f"Test plan '{name}' not found")
-        return plan_info.build()
+        return plan_info
+
+    def get_plan(self, name: str, lazy: bool = False) -> TestPlan:
+        """Get built TestPlan, or a plan that builds scenarios on access if ``lazy``"""
+        plan_info = self.get_plan_info(name)
+        if lazy:
+            return plan_info.lazy_plan()
+        return plan_info.build(self.cache)
+
+    def stream_plan(self, name: str) -> TestPlan:
+        """Get a TestPlan that builds scenarios on access without keeping them"""
+        return self.get_plan_info(name).stream_plan()
+
+    def get_scenario(self, plan_name: str, name_or_id: str) -> TestScenario:
+        """Get a single built scenario"""
+        return self.get_plan_info(plan_name).find_scenario(name_or_id)
+
+    def build_plans(self, names: list[str], jobs: Optional[int] = None) -> dict[str, PlanBuildReport]:
+        """
+        Build plans, running their scenario functions in a process pool. Plans that were already built are reported from the cache.
+
+        :param names: names of the test plans to build
+        :param jobs: number of worker processes. Defaults to the number of CPUs
+        """
+        plan_infos = [self.get_plan_info(name) for name in names]
+
+        reports: dict[str, PlanBuildReport] = {}
+        pending = []
+        for plan_info in plan_infos:
+            if plan_info.load_cached(self.cache) is not None:
+                reports[plan_info.name] = PlanBuildReport(plan_info.name, plan_info._built_plan, [])
+            else:
+                pending.append(plan_info)
+
+        # Scenarios from all plans share one pool so short plans don't leave workers idle. map() keeps registration order
+        functions = [func for plan_info in pending for func in plan_info.load_scenarios()]
+        if functions:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = iter(list(executor.map(_run_scenario_function, functions)))
+            for plan_info in pending:
+                reports[plan_info.name] = plan_info.build_from_results([next(results) for _ in plan_info._scenarios], self.cache)
+        return {name: reports[name] for name in names}
 
     def list_names(self) -> list[str]:
         """List all available test plan names"""
@@ -164,13 +433,81 @@ def new_test_plan(
     return scenario_decorator
 
 
-def get_plan(name: str) -> TestPlan:
+def add_plan_module(plan_name: str, module: str) -> None:
+    """
+    Register the module containing a plan's scenario functions. The module is imported the first time the plan is built,
+    so listing and querying plans doesn't import scenario bodies.
+
+    :param plan_name: name of a registered test plan
+    :param module: absolute module name
+    """
+    _registry.add_plan_module(plan_name, module)
+
+
+def get_plan(name: str, lazy: bool = False) -> TestPlan:
     """
     Get a test plan by name. If the plan has already been built, returns the cached plan
 
+    :param name: name of the test plan
+    :param lazy: return a plan whose scenarios are built on first access instead of building every scenario up front
+    """
+    return _registry.get_plan(name, lazy)
+
+
+def stream_plan(name: str) -> TestPlan:
+    """
+    Get a test plan for a single pass over its scenarios, e.g. by a streaming exporter.
+    Scenarios are built on access and not kept by the registry, so iterating holds one scenario at a time. If the plan is already built, returns the built plan
+
+    :param name: name of the test plan
+    """
+    return _registry.stream_plan(name)
+
+
+def get_scenario(plan: str, name_or_id: str) -> TestScenario:
+    """
+    Get a single scenario of a test plan, building only what's needed to find it. Built scenarios are cached and shared with the full plan.
+
+    :param plan: name of the test plan
+    :param name_or_id: scenario name or id
+    :raises ValueError: if the plan or scenario doesn't exist
+    """
+    return _registry.get_scenario(plan, name_or_id)
+
+
+def build_plans(names: Optional[list[str]] = None, jobs: Optional[int] = None) -> dict[str, PlanBuildReport]:
+    """
+    Build test plans in parallel, running scenario functions across a process pool.
+
+    Unlike ``get_plan``, a failing scenario doesn't abort the build. Its traceback is recorded in the plan's report and the remaining scenarios are kept.
+    Plans where every scenario built are cached, so later ``get_plan`` calls return the same object.
+
+    :param names: names of the test plans to build. Defaults to all plans
+    :param jobs: number of worker processes. Defaults to the number of CPUs
+
+    :return: build report per plan name, in the order of ``names``
+    """
+    return _registry.build_plans(names if names is not None else _registry.list_names(), jobs)
+
+
+def set_plan_cache(directory: Optional[Path]) -> None:
+    """
+    Set the directory of the on-disk plan cache, or disable it with None. Defaults to ``CORETP_PLAN_CACHE`` if set.
+    Only affects plans that haven't been built in this process yet.
+
+    :param directory: cache directory
+    """
+    _registry.cache = PlanCache(directory) if directory is not None else None
+
+
+def plan_source_key(name: str) -> str:
+    """
+    Hash of the sources a test plan is built from, without building it or importing its scenario modules.
+    Plans built from sources with the same key are the same, unless their scenarios draw unseeded random values.
+
     :param name: name of the test plan
     """
-    return _registry.get_plan(name)
+    return _registry.get_plan_info(name).source_key()
 
 
 def list_plans() -> list[str]:
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from enum import Flag, Enum, auto, IntEnum
-
+from typing import Union
 
 """
 This Module to provide an enumerated list of valid ISA extensions supported by GCC.
@@ -11,6 +11,18 @@ This file contains a list of march string names for GCC, taken from: https://gcc
 """
 
 
+def mask_bits(mask: int) -> list[int]:
+    """
+    Split an integer bit mask into its set bits, lowest first. Used for fast set algebra on ``Flag`` values without building ``Flag`` objects
+    """
+    bits = []
+    while mask:
+        bit = mask & -mask
+        bits.append(bit)
+        mask ^= bit
+    return bits
+
+
 class Xlen(IntEnum):
     """
     Representation of XLEN for RISC-V architecture
@@ -239,3 +251,17 @@ class Extension(Flag):
         for item in items[1:]:
             extensions |= cls.from_str(item)
         return extensions
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "Extension":
+        """
+        Convert an integer bit mask (e.g. ``InstructionDef.extension_mask``) back to an Extension flag.
+        """
+        return cls(mask)
+
+    @staticmethod
+    def to_mask(extensions: Union["Extension", int]) -> int:
+        """
+        Convert an Extension flag to its integer bit mask. Integer masks are passed through unchanged.
+        """
+        return extensions if isinstance(extensions, int) else extensions.value
@@ -1,8 +1,11 @@
 # SPDX-FileCopyrightText: © 2025 Tenstorrent AI ULC
 # SPDX-License-Identifier: Apache-2.0
 
-from dataclasses import dataclass, field
-from typing import Optional, Union
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields, is_dataclass
+from operator import attrgetter
+from typing import Callable, Optional, Union
 
 from .step import TestStep, Memory
 
@@ -44,6 +47,66 @@ class StepIR:
         return f"StepIR(id={self.id}, inputs={self.inputs}, code={self.code}, step={self.step.__class__.__name__})"
 
 
+# ``TestStep`` fields that can hold dependencies, in the order their values become ``StepIR`` inputs
+# FIXME: hack until StepIR classes are implemented and mapped from TestStep classes
+DEPENDENCY_FIELDS = ("inputs", "src1", "src2", "offset", "memory", "cause", "value", "target")
+
+
+@dataclass(frozen=True)
+class _StepAccessors:
+    """
+    Field accessors of a ``TestStep`` class, computed once per class instead of probing every field on every step.
+
+    :param dependencies: returns the values of the class's ``DEPENDENCY_FIELDS``, in order
+    :param has_code: class has a ``code`` field with nested steps
+    :param is_memory: class is a ``Memory`` step, which gets a memory id
+    """
+
+    dependencies: Callable[[TestStep], tuple]
+    has_code: bool
+    is_memory: bool
+
+
+_step_accessors: dict[type, _StepAccessors] = {}
+
+
+def step_accessors(step_class: type) -> _StepAccessors:
+    """
+    Accessors of a ``TestStep`` class, registered the first time a step of the class is built
+    """
+    accessors = _step_accessors.get(step_class)
+    if accessors is None:
+        field_names = {f.name for f in fields(step_class)} if is_dataclass(step_class) else set()
+        present = [name for name in DEPENDENCY_FIELDS if name in field_names or hasattr(step_class, name)]
+        if len(present) == 1:
+            getter = attrgetter(present[0])
+            dependencies = lambda step: (getter(step),)  # noqa: E731
+        elif present:
+            dependencies = attrgetter(*present)
+        else:
+            dependencies = lambda step: ()  # noqa: E731
+        accessors = _step_accessors[step_class] = _StepAccessors(
+            dependencies=dependencies,
+            has_code="code" in field_names or hasattr(step_class, "code"),
+            is_memory=issubclass(step_class, Memory),
+        )
+    return accessors
+
+
+_value_fields: dict[type, Callable[[TestStep], tuple]] = {}
+
+
+def value_fields(step_class: type) -> Callable[[TestStep], tuple]:
+    """
+    Getter of a ``TestStep`` class's fields that aren't dependencies or nested code, e.g. ``op`` and ``imm``. Returns a tuple in field order
+    """
+    getter = _value_fields.get(step_class)
+    if getter is None:
+        names = [f.name for f in fields(step_class) if f.name not in DEPENDENCY_FIELDS and f.name != "code"] if is_dataclass(step_class) else []
+        getter = _value_fields[step_class] = attrgetter(*names) if len(names) > 1 else (lambda step: tuple(getattr(step, name) for name in names))
+    return getter
+
+
 class _IrBuilder:
     """
     Class used to build up ``StepIR`` objects from ``TestStep`` objects.
@@ -53,7 +116,7 @@ class _IrBuilder:
 
     def __init__(self, steps: list[TestStep]):
         self.steps = steps
-        self.step_ids = {}
+        self.step_ids: dict[int, str] = {}
         self.count = 0
         self.mem_count = 0
 
@@ -67,47 +130,55 @@ class _IrBuilder:
         self.mem_count += 1
         return count_str
 
-    def gather_inputs(self, step: TestStep) -> list[Union[str, int]]:
+    def gather_inputs(self, step: TestStep, accessors: Optional[_StepAccessors] = None) -> list[Union[str, int]]:
         """
         Gathers inputs for a ``TestStep``
         """
-        inputs = []
+        if accessors is None:
+            accessors = step_accessors(type(step))
+        inputs: list[Union[str, int]] = []
+        step_ids = self.step_ids
 
         # gather inputs from previously processed steps
-        # FIXME: hack until StepIR classes are implemented and mapped from TestStep classes
-        for fname in ["inputs", "src1", "src2", "offset", "memory", "cause", "value", "target"]:
-            val = getattr(step, fname, None)
-            if val is not None:
-                if isinstance(val, list):
-                    for x in val:
-                        if isinstance(x, TestStep) and id(x) not in self.step_ids:
-                            raise ValueError(f"Dependency {x} not in steps list; missing from StepIR input. Ensure step was added to steps list")
-                    inputs.extend([self.step_ids.get(id(x), x) for x in val])
-                else:
-                    if isinstance(val, TestStep) and not isinstance(val, Memory) and id(val) not in self.step_ids:
-                        raise ValueError(f"Dependency {val} not in steps list; missing from StepIR input. Ensure step was added to steps list")
-                    inputs.append(self.step_ids.get(id(val), val))
+        for val in accessors.dependencies(step):
+            if val is None:
+                continue
+            if isinstance(val, list):
+                for x in val:
+                    step_id = step_ids.get(id(x))
+                    if step_id is None and isinstance(x, TestStep):
+                        raise ValueError(f"Dependency {x} not in steps list; missing from StepIR input. Ensure step was added to steps list")
+                    inputs.append(x if step_id is None else step_id)
+            else:
+                step_id = step_ids.get(id(val))
+                if step_id is None and isinstance(val, TestStep) and not isinstance(val, Memory):
+                    raise ValueError(f"Dependency {val} not in steps list; missing from StepIR input. Ensure step was added to steps list")
+                inputs.append(val if step_id is None else step_id)
 
         return inputs
 
     def build_step_ir(self, step: TestStep) -> StepIR:
         """
-        Builds a ``StepIR`` object from a ``TestStep`` object.
+        Builds a ``StepIR`` object from a ``TestStep`` object, including the ``StepIR`` of its nested ``code``.
+
+        Steps are visited in pre-order with an explicit stack, so ids match the source order and deeply nested code doesn't hit the recursion limit.
         """
-        if isinstance(step, Memory):
-            step_id = self.next_mem_id()
-        else:
-            step_id = self.next_id()
-        self.step_ids[id(step)] = step_id
-        inputs = self.gather_inputs(step)
+        root: list[StepIR] = []
+        # (step, code list of the parent StepIR to append to)
+        stack: list[tuple[TestStep, list[StepIR]]] = [(step, root)]
+        while stack:
+            step, parent_code = stack.pop()
+            accessors = _step_accessors.get(type(step)) or step_accessors(type(step))
+            step_id = self.next_mem_id() if accessors.is_memory else self.next_id()
+            self.step_ids[id(step)] = step_id
+            inputs = self.gather_inputs(step, accessors)
 
-        code = []
-        has_code = getattr(step, "code", None)
-        if has_code is not None:
-            for c in has_code:
-                code.append(self.build_step_ir(c))
+            code: list[StepIR] = []
+            parent_code.append(StepIR(id=step_id, inputs=inputs, code=code, step=step))
+            if accessors.has_code and step.code is not None:
+                stack.extend((c, code) for c in reversed(step.code))
 
-        return StepIR(id=step_id, inputs=inputs, code=code, step=step)
+        return root[0]
 
 
 def build_step_ir(steps: list[TestStep]) -> list[StepIR]:
@@ -116,3 +187,236 @@ def build_step_ir(steps: list[TestStep]) -> list[StepIR]:
     """
     builder = _IrBuilder(steps)
     return [builder.build_step_ir(step) for step in steps]
+
+
+# ``StepIRTable`` input kinds
+INPUT_REF = 0  # row of another step
+INPUT_INT = 1  # immediate that fits in 64 bits
+INPUT_OBJECT = 2  # anything else, index into ``input_objects``
+
+# ``StepIRTable`` id kinds, the id prefixes ``_IrBuilder`` uses. Other ids are kept in ``other_ids``
+_ID_PREFIXES = ("v", "m")
+_ID_OTHER = len(_ID_PREFIXES)
+
+
+class StepIRTable:
+    """
+    Compact, array-backed storage of a scenario's ``StepIR`` graph.
+
+    Each ``StepIR`` (nested ``code`` included) is a row, in the pre-order ``_IrBuilder`` assigns ids in. Rows are stored column-wise:
+
+    - ids as an id kind and number, e.g. ``v12`` is kind 0 number 12. The row number is the integer id of the step
+    - ``parent`` row of the ``StepIR`` whose ``code`` contains the row, -1 at top level, and ``end`` row after the row's nested code
+    - inputs in CSR form, row ``r``'s inputs are ``input_offsets[r]:input_offsets[r + 1]`` of ``input_kinds`` / ``input_values``. References to other steps are row numbers
+    - step type as an index into the interned ``types`` list, and the ``TestStep`` itself
+
+    Graph passes can scan these arrays directly. ``StepIR`` objects are created on demand as views of the rows with ``step_ir`` and ``to_step_ir``.
+
+    .. code-block:: python
+
+        table = StepIRTable.from_steps(steps)
+        table.step_type(3), table.input_rows(3)  # Arithmetic, [1, 2]
+        table.step_ir(3)  # StepIR(id="v3", inputs=["v1", "v2"], ...)
+    """
+
+    def __init__(self):
+        self.id_kinds = array("b")
+        self.id_numbers = array("i")
+        self.other_ids: list[str] = []
+        self.parent = array("i")
+        self.end = array("i")
+        self.input_offsets = array("i", [0])
+        self.input_kinds = array("b")
+        self.input_values = array("q")
+        self.input_objects: list = []
+        self.types: list[type] = []
+        self.type_index = array("H")
+        self.steps: list[Optional[TestStep]] = []
+        self._type_lookup: dict[type, int] = {}
+        self._rows: Optional[dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_rows"] = None
+        return state
+
+    # Building
+    @classmethod
+    def from_steps(cls, steps: list[TestStep]) -> "StepIRTable":
+        """
+        Build the table directly from ``TestStep`` objects, with the same ids and inputs as ``build_step_ir`` but without creating ``StepIR`` objects
+        """
+        table = cls()
+        builder = _IrBuilder(steps)
+        row_of_id: dict[str, int] = {}
+        # (step, parent row), popped in pre-order
+        stack: list[tuple[TestStep, int]] = [(step, -1) for step in reversed(steps)]
+        while stack:
+            step, parent = stack.pop()
+            accessors = _step_accessors.get(type(step)) or step_accessors(type(step))
+            step_id = builder.next_mem_id() if accessors.is_memory else builder.next_id()
+            builder.step_ids[id(step)] = step_id
+            row = table._append(step_id, parent, builder.gather_inputs(step, accessors), step, row_of_id)
+            if accessors.has_code and step.code is not None:
+                stack.extend((c, row) for c in reversed(step.code))
+        table._set_ends()
+        return table
+
+    @classmethod
+    def from_step_ir(cls, steps: list[StepIR]) -> "StepIRTable":
+        """
+        Build the table from existing ``StepIR`` objects
+        """
+        table = cls()
+        row_of_id: dict[str, int] = {}
+        stack: list[tuple[StepIR, int]] = [(step_ir, -1) for step_ir in reversed(steps)]
+        while stack:
+            step_ir, parent = stack.pop()
+            row = table._append(step_ir.id, parent, step_ir.inputs, step_ir.step, row_of_id)
+            stack.extend((c, row) for c in reversed(step_ir.code))
+        table._set_ends()
+        return table
+
+    def _append(self, step_id: str, parent: int, inputs: list, step: Optional[TestStep], row_of_id: dict[str, int]) -> int:
+        row = len(self.parent)
+        prefix = step_id[:1]
+        if prefix in _ID_PREFIXES and step_id[1:].isdigit():
+            self.id_kinds.append(_ID_PREFIXES.index(prefix))
+            self.id_numbers.append(int(step_id[1:]))
+        else:
+            self.id_kinds.append(_ID_OTHER)
+            self.id_numbers.append(len(self.other_ids))
+            self.other_ids.append(step_id)
+        row_of_id[step_id] = row
+        self.parent.append(parent)
+
+        for value in inputs:
+            if isinstance(value, str) and value in row_of_id:
+                self.input_kinds.append(INPUT_REF)
+                self.input_values.append(row_of_id[value])
+            elif type(value) is int and -(1 << 63) <= value < (1 << 63):
+                self.input_kinds.append(INPUT_INT)
+                self.input_values.append(value)
+            else:
+                self.input_kinds.append(INPUT_OBJECT)
+                self.input_values.append(len(self.input_objects))
+                self.input_objects.append(value)
+        self.input_offsets.append(len(self.input_kinds))
+
+        step_type = type(step)
+        type_index = self._type_lookup.get(step_type)
+        if type_index is None:
+            type_index = self._type_lookup[step_type] = len(self.types)
+            self.types.append(step_type)
+        self.type_index.append(type_index)
+        self.steps.append(step)
+        return row
+
+    def _set_ends(self):
+        "Compute ``end`` from ``parent``. A row's nested code ends where the next row that isn't nested in it starts"
+        n = len(self.parent)
+        self.end = array("i", [n]) * n
+        open_rows: list[int] = []
+        for row in range(n):
+            parent = self.parent[row]
+            while open_rows and open_rows[-1] != parent:
+                self.end[open_rows.pop()] = row
+            open_rows.append(row)
+
+    # Row access
+    def id(self, row: int) -> str:
+        "String id of a row, e.g. ``v12``"
+        kind = self.id_kinds[row]
+        if kind == _ID_OTHER:
+            return self.other_ids[self.id_numbers[row]]
+        return f"{_ID_PREFIXES[kind]}{self.id_numbers[row]}"
+
+    def row(self, step_id: str) -> int:
+        "Row of a string id"
+        if self._rows is None:
+            self._rows = {self.id(row): row for row in range(len(self))}
+        return self._rows[step_id]
+
+    def step_type(self, row: int) -> type:
+        "Class of the row's ``TestStep``, ``NoneType`` for rows without one"
+        return self.types[self.type_index[row]]
+
+    def children(self, row: int) -> list[int]:
+        "Rows of the ``StepIR`` in the row's ``code``"
+        children = []
+        child = row + 1
+        while child < self.end[row]:
+            children.append(child)
+            child = self.end[child]
+        return children
+
+    def top_level(self) -> list[int]:
+        "Rows of the scenario's top level steps"
+        return [row for row in range(len(self)) if self.parent[row] == -1]
+
+    def input_rows(self, row: int) -> list[int]:
+        "Rows the row's inputs refer to, skipping immediates"
+        start, stop = self.input_offsets[row], self.input_offsets[row + 1]
+        return [self.input_values[i] for i in range(start, stop) if self.input_kinds[i] == INPUT_REF]
+
+    def inputs(self, row: int) -> list[Union[str, int]]:
+        "Inputs of the row as they appear in ``StepIR.inputs``"
+        inputs = []
+        for i in range(self.input_offsets[row], self.input_offsets[row + 1]):
+            kind = self.input_kinds[i]
+            if kind == INPUT_REF:
+                inputs.append(self.id(self.input_values[i]))
+            elif kind == INPUT_INT:
+                inputs.append(self.input_values[i])
+            else:
+                inputs.append(self.input_objects[self.input_values[i]])
+        return inputs
+
+    # StepIR views
+    def step_ir(self, row: int) -> StepIR:
+        """
+        ``StepIR`` of a row, with its nested code. Created on each call
+        """
+        root: list[StepIR] = []
+        stack: list[tuple[int, list[StepIR]]] = [(row, root)]
+        while stack:
+            row, parent_code = stack.pop()
+            code: list[StepIR] = []
+            parent_code.append(StepIR(id=self.id(row), inputs=self.inputs(row), code=code, step=self.steps[row]))
+            stack.extend((child, code) for child in reversed(self.children(row)))
+        return root[0]
+
+    def to_step_ir(self) -> list[StepIR]:
+        "``StepIR`` objects of the top level steps, as ``build_step_ir`` returns them"
+        return [self.step_ir(row) for row in self.top_level()]
+
+
+class StepIRList(Sequence):
+    """
+    Top level ``StepIR`` of a ``StepIRTable``, created on access. Used as ``TestScenario.steps`` of compact scenarios
+    """
+
+    def __init__(self, table: StepIRTable):
+        self.table = table
+        self.rows = array("i", table.top_level())
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[StepIR, list[StepIR]]:
+        if isinstance(index, slice):
+            return [self.table.step_ir(row) for row in self.rows[index]]
+        return self.table.step_ir(self.rows[index])
+
+    def __repr__(self) -> str:
+        return f"StepIRList({len(self)} steps, {len(self.table)} rows)"
+
+
+def build_step_ir_table(steps: list[TestStep]) -> StepIRList:
+    """
+    Takes list of ``TestSteps`` and returns their ``StepIR`` backed by a compact ``StepIRTable``
+    """
+    return StepIRList(StepIRTable.from_steps(steps))